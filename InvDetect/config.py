@@ -127,6 +127,7 @@ SCROLL_WAIT = 0.6      # Wait time after scroll
 # FILES
 OUTPUT_FILE = "detected_items.txt"
 LOG_FILE    = "scan_log.txt"
+PROGRESS_FILE = "scan_progress.json"  # live progress for GearCrate (/api/events)
 
 # YOUR DATABASE (Universal path - works on any PC)
 import os as _os
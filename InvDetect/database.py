@@ -6,6 +6,7 @@ Used by ocr_scanner.py for name correction
 
 import sqlite3
 import os
+from pathlib import Path
 from config import DB_PATH
 
 # Global list with all item names
@@ -30,7 +31,10 @@ def load_database():
         return []
 
     try:
-        conn = sqlite3.connect(DB_PATH)
+        # Read-only: never takes a write lock, so GearCrate can keep writing (WAL mode)
+        db_uri = Path(DB_PATH).as_uri() + '?mode=ro'
+        conn = sqlite3.connect(db_uri, uri=True, timeout=5)
+        conn.execute("PRAGMA query_only = ON")
         cur = conn.cursor()
 
         # Simply get all names – GearCrate always has a "name" column
@@ -14,6 +14,7 @@ import config
 import ocr_scanner
 import keyboard
 import os
+import json
 from collections import Counter 
 
 def log_print(*args, **kwargs):
@@ -554,6 +555,7 @@ class InventoryScanner:
                     if not getattr(config, 'FAST_DEBUG_MODE', False):
                         log_print(f"  → {text} (#{count})")
                     found += 1
+                    self.write_progress()
                     consecutive_empty_items = 0  # Reset on find
                 elif raw_ocr:
                     # OCR detected text but no DB match → continue anyway
@@ -679,6 +681,7 @@ class InventoryScanner:
                 count = self.detected_items[text]
                 log_print(f"  → {text} (#{count})")
                 found += 1
+                self.write_progress()
                 consecutive_empty_items = 0  # Reset on find
             elif raw_ocr:
                 # OCR detected text but no DB match → continue anyway
@@ -783,6 +786,27 @@ class InventoryScanner:
         except Exception as e:
             log_print(f"[ERROR] Could not write not_detected.md: {e}")
 
+    def write_progress(self, state='scanning'):
+        """Writes current scan position + counts for GearCrate (live progress in the UI)"""
+        progress = {
+            'state': state,
+            'page': self.current_page,
+            'row': self.current_row,
+            'col': self.current_col,
+            'items_found': sum(self.detected_items.values()),
+            'unique_items': len(self.detected_items),
+            'not_detected': len(self.not_detected_items),
+        }
+        try:
+            # Erst temporär schreiben, dann ersetzen: GearCrate liest nie eine halbe Datei
+            temp_file = config.PROGRESS_FILE + '.tmp'
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(progress, f)
+            os.replace(temp_file, config.PROGRESS_FILE)
+        except Exception:
+            # Fortschritt ist optional, der Scan läuft weiter
+            pass
+
     def write_results(self):
         """Writes final results in format: count, item_name"""
         if not self.detected_items:
@@ -905,6 +929,8 @@ class InventoryScanner:
 
         self.scan_active = True
         scan_iteration = 0  # Counter for scan iterations
+        final_state = 'failed'  # Progress state after the scan (complete / aborted / failed)
+        self.write_progress()
 
         try:
             self.reset_to_top()
@@ -921,6 +947,7 @@ class InventoryScanner:
             while self.scan_active:
                 scan_iteration += 1
                 self.current_page = scan_iteration  # Track current page for not_detected
+                self.write_progress()
                 log_print(f"\n{'='*80}")
                 log_print(f"PAGE #{scan_iteration}")
                 log_print(f"{'='*80}\n")
@@ -1039,14 +1066,16 @@ class InventoryScanner:
                     break
 
             log_print("\nScan finished!")
+            final_state = 'complete'
 
         except ScanAbortedException:
             # Normal handling for DELETE abort
-            pass
+            final_state = 'aborted'
 
         finally:
             self.scan_active = False
             pyautogui.moveTo(100, 100, duration=0)
             log_print("Mouse stopped")
 
-            self.write_results()
\ No newline at end of file
+            self.write_results()
+            self.write_progress(final_state)
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+asyncio Benchmark - viele Browser gleichzeitig
+
+Gleicher Aufbau wie bench_keepalive.py (temporäre Datenbank, Thumbnails,
+Grid-Kaltstart mit 6 Verbindungen pro Browser), aber BROWSERS Browser laden
+gleichzeitig, während OPEN_STREAMS /api/events-Verbindungen offen sind.
+Verglichen werden PooledHTTPServer (main_browser) und AsyncHTTPServer
+(main_async). Die Browser laufen in eigenen Prozessen.
+
+Aufruf: python bench_async.py
+"""
+import asyncio
+import contextlib
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import main_browser
+from main_browser import GearCrateAPIHandler
+from api.http_server import PooledHTTPServer, load_server_settings
+from api.async_server import AsyncHTTPServer
+from bench_keepalive import seed, cold_load
+
+BROWSERS = 8
+OPEN_STREAMS = 8
+REPEAT = 3
+
+
+def open_streams(port):
+    """OPEN_STREAMS offene Event-Streams (wie offene Tabs)"""
+    streams = []
+    for _ in range(OPEN_STREAMS):
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(b'GET /api/events HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        streams.append(sock)
+    return streams
+
+
+def concurrent_loads(port):
+    """BROWSERS gleichzeitige Kaltstarts; Dauer bis der letzte fertig ist (ms)"""
+    with ProcessPoolExecutor(BROWSERS) as browsers:
+        list(browsers.map(cold_load, [port] * BROWSERS))  # Aufwärmen
+        timings = []
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            list(browsers.map(cold_load, [port] * BROWSERS))
+            timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+def report(label, timings):
+    print(f"{label:<24} {timings[0]:8.1f} ms  (Median {timings[len(timings) // 2]:7.1f} ms)")
+
+
+def run_threaded(settings):
+    server = PooledHTTPServer(('127.0.0.1', 0), GearCrateAPIHandler, settings=settings)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    streams = open_streams(port)
+    try:
+        report('PooledHTTPServer', concurrent_loads(port))
+    finally:
+        for sock in streams:
+            sock.close()
+        server.shutdown()
+        server.server_close()
+
+
+def run_async(api, image_dir, settings):
+    server = AsyncHTTPServer(api, os.path.join(main_browser.project_root, 'web'), image_dir, settings=settings)
+    server.precompress_static()
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    async def serve():
+        await server.start('127.0.0.1', 0)
+        started.set()
+        # close() beendet serve_forever mit CancelledError
+        with contextlib.suppress(asyncio.CancelledError):
+            await server.serve_forever()
+
+    thread = threading.Thread(target=loop.run_until_complete, args=(serve(),), daemon=True)
+    thread.start()
+    started.wait()
+    streams = open_streams(server.port)
+    try:
+        report('AsyncHTTPServer', concurrent_loads(server.port))
+    finally:
+        for sock in streams:
+            sock.close()
+        loop.call_soon_threadsafe(server.close)
+        thread.join()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        image_dir = seed(tmp_dir)
+
+        # API() öffnet data/inventory.db relativ zum Arbeitsverzeichnis
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+        try:
+            api = main_browser.API()
+        finally:
+            os.chdir(cwd)
+        GearCrateAPIHandler.api = api
+        GearCrateAPIHandler.cache_dir = image_dir
+        GearCrateAPIHandler.precompress_static(os.path.join(main_browser.project_root, 'web'))
+
+        settings = load_server_settings(None)
+        print("=" * 60)
+        print(f"asyncio Benchmark ({BROWSERS} Browser gleichzeitig, {OPEN_STREAMS} Event-Streams, "
+              f"bestes von {REPEAT})")
+        print("=" * 60)
+        run_threaded(settings)
+        run_async(api, image_dir, settings)
+
+        api.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Dispatch Benchmark - Overhead der Request-Zuordnung im HTTP-Handler
+
+Vergleicht die frühere if/startswith-Kette von do_GET (und hasattr/getattr in
+do_POST) mit der vorkompilierten RouteTable inkl. Parameter-Konvertierung.
+Gemessen wird nur die Zuordnung (URL parsen, Route finden, Parameter
+aufbereiten), ohne Socket-I/O und Backend-Aufruf.
+
+Aufruf: python bench_dispatch.py
+"""
+import os
+import sys
+import timeit
+from urllib.parse import urlparse, parse_qs
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from api.routes import RouteTable, Param
+
+ROUNDS = 200_000
+
+# Typischer Mix: Grid-Thumbnails überwiegen, dazu Inventar, Sets und statische Dateien
+GET_PATHS = [
+    '/images/Torso/abc123_thumb.png',
+    '/images/Helmet/def456_thumb.png',
+    '/images/Legs/0a1b2c_medium.png',
+    '/api/get_inventory_items?sort_by=date&sort_order=desc&category=Torso&limit=50&offset=100',
+    '/api/search_items_local?query=',
+    '/api/get_gear_set_details?set_name=Morozov&variant=Black',
+    '/api/bulk-import/armor/torso',
+    '/app.js',
+]
+
+POST_METHODS = ['toggle_favorite', 'update_item_count', 'get_stats', 'inventory']
+
+
+def legacy_get(path):
+    """do_GET vor der Route-Tabelle: Prüfungen in Code-Reihenfolge"""
+    parsed_url = urlparse(path)
+    path = parsed_url.path
+    query_params = parse_qs(parsed_url.query)
+
+    if path.startswith('/images/'):
+        return path[8:].replace('/', os.sep)
+    if path == '/api/get_inventory_items':
+        sort_by = query_params.get('sort_by', ['name'])[0]
+        sort_order = query_params.get('sort_order', ['asc'])[0]
+        category = query_params.get('category', [None])[0]
+        if not category:
+            category = query_params.get('category_filter', [None])[0]
+        is_favorite = query_params.get('is_favorite', [None])[0]
+        limit = query_params.get('limit', [None])[0]
+        limit = int(limit) if limit else None
+        offset = int(query_params.get('offset', ['0'])[0] or 0)
+        return sort_by, sort_order, category, is_favorite, limit, offset
+    if path == '/api/search_items_local':
+        return query_params.get('query', [''])[0]
+    if path == '/api/get_all_gear_sets':
+        return None
+    if path == '/api/get_gear_set_details':
+        return query_params.get('set_name', [''])[0], query_params.get('variant', [''])[0]
+    if path == '/api/get_gear_set_variants':
+        return query_params.get('set_name', [''])[0]
+    if path.startswith('/api/bulk-import/'):
+        return path.split('/api/bulk-import/')[1]
+    if path == '/api/get_scan_results':
+        return None
+    return 'static'
+
+
+def build_routes():
+    """Gleiche Routen wie GearCrateAPIHandler._build_get_routes (Handler = Dummy)"""
+    def handler(*args, **kwargs):
+        return None
+
+    routes = RouteTable()
+    routes.add_prefix('/images/', handler)
+    routes.add('/api/get_inventory_items', handler, [
+        Param('sort_by', default='name'),
+        Param('sort_order', default='asc'),
+        Param('category', aliases=('category_filter',)),
+        Param('is_favorite'),
+        Param('limit', int),
+        Param('offset', int, 0),
+    ])
+    routes.add('/api/search_items_local', handler, [Param('query', default='')])
+    routes.add('/api/get_all_gear_sets', handler)
+    routes.add('/api/get_gear_set_details', handler, [Param('set_name', default=''), Param('variant', default='')])
+    routes.add('/api/get_gear_set_variants', handler, [Param('set_name', default='')])
+    routes.add_prefix('/api/bulk-import/', handler)
+    routes.add('/api/get_scan_results', handler)
+    return routes
+
+
+def routed_get(routes, path):
+    """do_GET mit Route-Tabelle"""
+    path, _, query = path.partition('?')
+    route, remainder = routes.resolve(path)
+    if route is None:
+        return 'static'
+    return remainder, route.coerce(query) if route.params else {}
+
+
+class FakeAPI:
+    """Stellvertreter mit so vielen Methoden wie die echte API-Klasse"""
+
+
+for _i in range(60):
+    setattr(FakeAPI, f'method_{_i}', lambda self: None)
+for _name in POST_METHODS:
+    setattr(FakeAPI, _name, lambda self: None)
+
+
+def main():
+    routes = build_routes()
+    api = FakeAPI()
+    table = {name: getattr(api, name) for name in dir(api) if not name.startswith('_')}
+
+    # Beide Varianten müssen dasselbe liefern
+    for path in GET_PATHS:
+        old, new = legacy_get(path), routed_get(routes, path)
+        assert (old == 'static') == (new == 'static'), path
+
+    def per_request(stmt):
+        seconds = min(timeit.repeat(stmt, number=ROUNDS // 10, repeat=5))
+        return seconds / (ROUNDS // 10) * 1e9
+
+    cases = [
+        ('GET  if-Kette', lambda: [legacy_get(p) for p in GET_PATHS], len(GET_PATHS)),
+        ('GET  RouteTable', lambda: [routed_get(routes, p) for p in GET_PATHS], len(GET_PATHS)),
+        ('POST hasattr/getattr', lambda: [getattr(api, m) for m in POST_METHODS if hasattr(api, m)], len(POST_METHODS)),
+        ('POST dict', lambda: [table.get(m) for m in POST_METHODS], len(POST_METHODS)),
+    ]
+
+    print("=" * 60)
+    print(f"Dispatch Benchmark ({sys.version.split()[0]})")
+    print("=" * 60)
+    for label, stmt, batch in cases:
+        print(f"{label:<24} {per_request(stmt) / batch:8.0f} ns/Request")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Image URL Benchmark - icon_url für große Antworten
+
+Legt eine temporäre Datenbank mit ITEM_COUNT Items an, deren image_path in
+einen temporären Bild-Cache zeigt (ein Viertel der Dateien fehlt), und
+misst den kompletten Katalog wie search_items_local(''):
+
+  stat pro Item   os.path.exists + Musterersetzung pro Item und Request
+  Memo            memoisiertes _path_to_url, Existenz aus dem Cache-Manifest
+  Spalten         full_url/thumb_url beim Schreiben berechnet (search_items_local)
+
+Aufruf: python bench_image_urls.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from api.backend import API
+from cache.image_cache import ImageCache
+from cache.image_urls import absolute_image_path, path_to_url
+from database.models import Database
+from database.operations import ItemOperations
+
+ITEM_COUNT = 10000
+REPEAT = 5
+
+
+def resolve_uncached(path):
+    """Verhalten vor dem Memo: stat() und Musterersetzung pro Aufruf"""
+    if not os.path.exists(absolute_image_path(path)):
+        return None
+    return path_to_url(path)
+
+
+def seed(tmp_dir):
+    """Items mit image_path; jede vierte Datei fehlt (Platzhalter im Frontend)"""
+    image_dir = os.path.join(tmp_dir, 'data', 'images')
+    os.makedirs(os.path.join(image_dir, 'Torso'))
+    items = []
+    for i in range(ITEM_COUNT):
+        path = os.path.join(image_dir, 'Torso', f"{i:05d}.png")
+        if i % 4:
+            with open(path, 'wb') as f:
+                f.write(b'png')
+        items.append({'name': f"Item {i:05d}", 'item_type': 'Torso', 'image_path': path, 'initial_count': 1})
+
+    db = Database(os.path.join(tmp_dir, 'data', 'inventory.db'))
+    ItemOperations(db).add_items_bulk(items)
+    db.close()
+    return image_dir
+
+
+def best_of(func):
+    best, result = None, None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        image_dir = seed(tmp_dir)
+
+        # API() öffnet data/inventory.db relativ zum Arbeitsverzeichnis
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+        try:
+            api = API()
+        finally:
+            os.chdir(cwd)
+        api.cache = ImageCache(image_dir)
+        api._image_urls = (api.cache.generation, {})
+
+        def read_time(resolve):
+            items = api.operations.get_all_items(include_zero_count=True)
+            for item in items:
+                item['icon_url'] = resolve(item['image_path']) if item.get('image_path') else item.get('image_url')
+            return items
+
+        cases = [
+            ('stat pro Item (read time)', lambda: read_time(resolve_uncached)),
+            ('Memo + Manifest (read time)', lambda: read_time(api._path_to_url)),
+            ('Spalten (write time)', lambda: api.search_items_local('')),
+        ]
+
+        print("=" * 60)
+        print(f"Image URL Benchmark ({ITEM_COUNT} Items, bestes von {REPEAT})")
+        print("=" * 60)
+
+        reference = None
+        for label, func in cases:
+            elapsed, items = best_of(func)
+            urls = [item['icon_url'] for item in items]
+            if reference is None:
+                reference = urls
+            status = '✅' if urls == reference else '❌ abweichend'
+            print(f"{label:<30} {elapsed:8.1f} ms  {status}")
+
+        missing = sum(url is None for url in reference)
+        print(f"({missing} Items ohne Bilddatei -> Platzhalter)")
+
+        api.close()
+
+
+if __name__ == '__main__':
+    main()
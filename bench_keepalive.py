@@ -0,0 +1,225 @@
+"""
+Keep-Alive Benchmark - Kaltstart des Inventar-Grids über HTTP
+
+Startet den echten Handler (GearCrateAPIHandler auf PooledHTTPServer) mit
+einer temporären Datenbank und einem Bild-Cache voller Thumbnails und lädt,
+wie ein Browser mit 6 Verbindungen pro Host, einmal komplett:
+
+  index.html + JS/CSS, /api/get_inventory_items, alle Grid-Thumbnails
+
+Verglichen werden HTTP/1.0 (neue TCP-Verbindung pro Request), HTTP/1.1
+mit persistenten Verbindungen und zum Vergleich HTTP/1.1 auf dem einfachen
+ThreadingHTTPServer (ein Thread pro Verbindung, ohne Obergrenze und ohne
+Spuren). Gezählt werden auch die TCP-Verbindungen, die der Server annehmen
+musste. Der "Browser" läuft in einem eigenen Prozess, damit Client und
+Server nicht um den GIL konkurrieren.
+
+Der zweite Durchlauf lädt, während so viele ungenutzte Verbindungen anderer
+Tabs offen sind wie der Pool Worker hat: ohne Parken belegt jede davon ihren
+Worker, bis das Timeout sie schließt.
+
+Aufruf: python bench_keepalive.py
+"""
+import http.client
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http.server import ThreadingHTTPServer
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import main_browser
+from main_browser import GearCrateAPIHandler
+from api.http_server import PooledHTTPServer
+from database.models import Database
+from database.operations import ItemOperations
+
+ITEM_COUNT = 300
+IMAGE_BYTES = 6 * 1024
+BROWSER_CONNECTIONS = 6
+REPEAT = 5
+WORKERS = 8
+# Offene, ungenutzte Verbindungen anderer Tabs (so viele wie Worker) und wie
+# lange eine ungenutzte Verbindung offen bleiben darf (Keep-Alive- bzw. Socket-Timeout)
+IDLE_CONNECTIONS = WORKERS
+IDLE_TIMEOUT = 2
+
+STATIC_FILES = ['/index.html', '/styles.css', '/api-adapter.js', '/app.js']
+
+
+class HTTP10Handler(GearCrateAPIHandler):
+    """Verhalten vor Keep-Alive: jede Antwort schließt die Verbindung"""
+    protocol_version = 'HTTP/1.0'
+
+
+class IdleTimeoutHandler(GearCrateAPIHandler):
+    """Ungenutzte Verbindungen schließen nach IDLE_TIMEOUT statt SOCKET_TIMEOUT"""
+    timeout = IDLE_TIMEOUT
+
+
+class ConnectionCounter:
+    """Zählt angenommene TCP-Verbindungen"""
+    accepted = 0
+
+    def process_request(self, request, client_address):
+        ConnectionCounter.accepted += 1
+        super().process_request(request, client_address)
+
+
+class CountingServer(ConnectionCounter, PooledHTTPServer):
+    pass
+
+
+class NonParkingServer(CountingServer):
+    """Pool ohne Parken: eine offene Verbindung belegt ihren Worker bis zum Timeout"""
+    parks_idle_connections = False
+
+
+class CountingThreadingServer(ConnectionCounter, ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, **settings):
+        super().__init__(server_address, handler_class)
+
+
+def seed(tmp_dir):
+    """Datenbank mit ITEM_COUNT Inventar-Items und passenden Thumbnails"""
+    os.makedirs(os.path.join(tmp_dir, 'data'))
+    db = Database(os.path.join(tmp_dir, 'data', 'inventory.db'))
+    ItemOperations(db).add_items_bulk(
+        {'name': f"Item {i:04d}", 'item_type': 'Torso', 'initial_count': 1}
+        for i in range(ITEM_COUNT)
+    )
+    db.close()
+
+    image_dir = os.path.join(tmp_dir, 'images', 'Torso')
+    os.makedirs(image_dir)
+    payload = os.urandom(IMAGE_BYTES)
+    for i in range(ITEM_COUNT):
+        with open(os.path.join(image_dir, f"item{i:04d}_thumb.png"), 'wb') as f:
+            f.write(payload)
+    return os.path.join(tmp_dir, 'images')
+
+
+def cold_load(port):
+    """Ein Grid-Kaltstart; liefert die Dauer in ms"""
+    urls = queue.Queue()
+    for path in STATIC_FILES:
+        urls.put(path)
+    errors = []
+
+    def browser_connection():
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        try:
+            while True:
+                try:
+                    path = urls.get_nowait()
+                except queue.Empty:
+                    return
+                conn.request('GET', path, headers={'Accept-Encoding': 'gzip'})
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors.append((path, response.status))
+                if path.startswith('/api/get_inventory_items'):
+                    # Erst die Liste, dann die Thumbnails (wie das Grid)
+                    for i in range(ITEM_COUNT):
+                        urls.put(f"/images/Torso/item{i:04d}_thumb.png")
+        finally:
+            conn.close()
+
+    start = time.perf_counter()
+    urls.put('/api/get_inventory_items?sort_by=name&sort_order=asc')
+    threads = [threading.Thread(target=browser_connection) for _ in range(BROWSER_CONNECTIONS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Nachzügler (Thumbnails, die nach dem Ende eines Threads eingereiht wurden)
+    if not urls.empty():
+        browser_connection()
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if errors:
+        raise RuntimeError(f"Failed requests: {errors[:5]}")
+    return elapsed
+
+
+def load_with_idle_connections(port):
+    """Kaltstart, während IDLE_CONNECTIONS Verbindungen anderer Tabs offen und ungenutzt sind"""
+    idle = []
+    for _ in range(IDLE_CONNECTIONS):
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        conn.request('GET', STATIC_FILES[0])
+        conn.getresponse().read()
+        idle.append(conn)
+    try:
+        return cold_load(port)
+    finally:
+        for conn in idle:
+            conn.close()
+
+
+def run(handler_class, label, server_class=CountingServer, load=cold_load):
+    server = server_class(('127.0.0.1', 0), handler_class, workers=WORKERS, long_running_workers=2, max_pending=64,
+                          keep_alive_timeout=IDLE_TIMEOUT)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_address[1]
+    try:
+        with ProcessPoolExecutor(1) as browser:
+            browser.submit(cold_load, port).result()  # Aufwärmen (Dateisystem-Cache)
+            ConnectionCounter.accepted = 0
+            timings = sorted(browser.submit(load, port).result() for _ in range(REPEAT))
+        connections = ConnectionCounter.accepted // REPEAT
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"{label:<30} {timings[0]:8.1f} ms  (Median {timings[len(timings) // 2]:7.1f} ms)  "
+          f"{connections:4d} TCP-Verbindungen")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        image_dir = seed(tmp_dir)
+
+        # API() öffnet data/inventory.db relativ zum Arbeitsverzeichnis
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+        try:
+            GearCrateAPIHandler.api = main_browser.API()
+        finally:
+            os.chdir(cwd)
+        GearCrateAPIHandler.cache_dir = image_dir
+        GearCrateAPIHandler.precompress_static(os.path.join(main_browser.project_root, 'web'))
+
+        print("=" * 60)
+        print(f"Keep-Alive Benchmark (Grid-Kaltstart, {ITEM_COUNT} Thumbnails, "
+              f"{BROWSER_CONNECTIONS} Verbindungen, bestes von {REPEAT})")
+        print("=" * 60)
+        run(HTTP10Handler, 'HTTP/1.0 (vorher)')
+        run(GearCrateAPIHandler, 'HTTP/1.1 (nachher)')
+        run(GearCrateAPIHandler, 'HTTP/1.1 ThreadingHTTPServer', CountingThreadingServer)
+
+        print()
+        print(f"Kaltstart neben {IDLE_CONNECTIONS} ungenutzten Verbindungen "
+              f"({WORKERS} Worker, Timeout {IDLE_TIMEOUT} s)")
+        print("-" * 60)
+        for label, server_class in [
+            ('HTTP/1.1 (nachher)', CountingServer),
+            ('HTTP/1.1 Pool ohne Parken', NonParkingServer),
+            ('HTTP/1.1 ThreadingHTTPServer', CountingThreadingServer),
+        ]:
+            run(IdleTimeoutHandler, label, server_class, load_with_idle_connections)
+
+        GearCrateAPIHandler.api.db.close()
+
+
+if __name__ == '__main__':
+    main()
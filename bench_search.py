@@ -0,0 +1,97 @@
+"""
+Search Benchmark - Such-Tab über den ganzen Katalog
+
+Legt eine temporäre Datenbank mit ITEM_COUNT Items an (Hersteller + Teil +
+Farbe) und vergleicht pro Query:
+
+  search_items_local   FTS5/LIKE-Teilstring, alle Treffer (vorher Fallback des Such-Tabs)
+  /api/search          In-Memory Trigram/Token-Index, gerankt, LIMIT Treffer
+
+Zusätzlich die Größe des kompletten Katalogs, den der Browser vorher für
+die Token-Suche geladen hat.
+
+Aufruf: python bench_search.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from api.backend import API
+from api.serialization import dumps
+from database.models import Database
+from database.operations import ItemOperations
+
+ITEM_COUNT = 20000
+LIMIT = 25
+REPEAT = 5
+
+MAKERS = ['Pembroke', 'Adiva', 'Morozov', 'Overlord', 'Citadel', 'Aril', 'Corbel', 'Lynx', 'Venture', 'Calico']
+PARTS = ['Helmet', 'Arms', 'Core', 'Legs', 'Jacket', 'Pants', 'Gloves', 'Backpack']
+COLORS = ['Black', 'Blue', 'Red', 'Tan', 'Aqua', 'Woodland', 'Crimson', 'Ivory', 'Sunburst', 'Patina']
+
+QUERIES = ['helmet', 'pembroke helmet', 'helmet pembroke', 'pembrok hemlet', 'adiva jacket blak', 'ar']
+
+
+def seed(tmp_dir):
+    items = []
+    for i in range(ITEM_COUNT):
+        maker = MAKERS[i % len(MAKERS)]
+        part = PARTS[i // len(MAKERS) % len(PARTS)]
+        color = COLORS[i // (len(MAKERS) * len(PARTS)) % len(COLORS)]
+        items.append({'name': f"{maker} {part} {color} {i:05d}", 'item_type': part, 'initial_count': i % 3})
+
+    db = Database(os.path.join(tmp_dir, 'data', 'inventory.db'))
+    ItemOperations(db).add_items_bulk(items)
+    db.close()
+
+
+def best_of(func):
+    best, result = None, None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        seed(tmp_dir)
+
+        # API() öffnet data/inventory.db relativ zum Arbeitsverzeichnis
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+        try:
+            start = time.perf_counter()
+            api = API()
+            build_ms = (time.perf_counter() - start) * 1000
+        finally:
+            os.chdir(cwd)
+
+        print("=" * 78)
+        print(f"Search Benchmark ({ITEM_COUNT} Items, limit {LIMIT}, bestes von {REPEAT})")
+        print("=" * 78)
+        print(f"API() inkl. Index-Aufbau: {build_ms:.0f} ms ({len(api.search_index)} Items)")
+        catalog = dumps(api.search_items_local(''))
+        print(f"Kompletter Katalog (Browser-Token-Suche): {len(catalog) / 1024:.0f} KiB")
+        print()
+        print(f"{'Query':<20} {'search_items_local':>28} {'/api/search':>28}")
+
+        for query in QUERIES:
+            local_ms, local = best_of(lambda: dumps(api.search_items_local(query)))
+            index_ms, result = best_of(lambda: api.search(query, LIMIT))
+            payload = dumps(result)
+            local_hits = len(api.search_items_local(query))
+            print(f"{query:<20} {local_ms:7.1f} ms {local_hits:6} hits {len(local) / 1024:6.0f} KiB"
+                  f" {index_ms:7.1f} ms {result['total']:6} hits {len(payload) / 1024:6.0f} KiB")
+
+        api.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Serialization Benchmark - JSON-Ausgabe großer Inventar-/Suchantworten
+
+Legt eine temporäre Datenbank mit 20.000 synthetischen Items an und misst
+Zeilen holen + JSON kodieren für den kompletten Katalog (wie
+search_items_local?query=):
+
+  vorher      dict(sqlite3.Row) + json.dumps().encode()
+  nachher     zip-Dicts (ItemOperations) + api.serialization.dumps
+  Fallback    zip-Dicts + kompakter json-Encoder (ohne orjson)
+
+Aufruf: python bench_serialization.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from database.models import Database
+from database.operations import ItemOperations, _PROJECTION_SQL
+from api import serialization
+
+ITEM_COUNT = 20000
+ITEM_TYPES = ['Torso', 'Arms', 'Legs', 'Helmet', 'Backpack', 'Undersuit']
+REPEAT = 5
+
+# Gleiche Spalten wie get_all_items() ('full' = items.* + berechnetes icon_url),
+# sonst schlägt der Vergleich der Ergebnisse fehl
+CATALOG_SQL = f"SELECT {_PROJECTION_SQL['full']} FROM items ORDER BY name COLLATE NOCASE"
+
+
+def seed(operations):
+    """Füllt die Datenbank mit synthetischen Items (inkl. properties_json wie vom Scraper)"""
+    operations.add_items_bulk(
+        {
+            'name': f"Item {i:05d} {ITEM_TYPES[i % len(ITEM_TYPES)]}",
+            'item_type': ITEM_TYPES[i % len(ITEM_TYPES)],
+            'image_url': f"https://cstone.space/uifimages/{i}.png",
+            'notes': 'Imported from InvDetect scan',
+            'initial_count': i % 3,
+            'properties_json': json.dumps({'Damage Reduction': '30%', 'Temp. Rating': [-30, 60]}),
+        }
+        for i in range(ITEM_COUNT)
+    )
+
+
+def best_of(func):
+    """Beste Laufzeit in ms und Ergebnis"""
+    best, result = None, None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'inventory.db'))
+        operations = ItemOperations(db)
+        seed(operations)
+        conn = db.reader()
+
+        def before():
+            return json.dumps([dict(row) for row in conn.execute(CATALOG_SQL).fetchall()]).encode()
+
+        def after():
+            return serialization.dumps(operations.get_all_items(include_zero_count=True))
+
+        def fallback():
+            return serialization._json_encoder.encode(operations.get_all_items(include_zero_count=True)).encode()
+
+        cases = [
+            ('vorher (dict(Row) + json)', before),
+            (f'nachher ({serialization.SERIALIZER})', after),
+            ('Fallback (json)', fallback),
+        ]
+
+        print("=" * 60)
+        print(f"Serialization Benchmark ({ITEM_COUNT} Items, bestes von {REPEAT})")
+        print("=" * 60)
+
+        reference = None
+        for label, func in cases:
+            elapsed, body = best_of(func)
+            decoded = json.loads(body)
+            if reference is None:
+                reference = decoded
+            status = '✅' if decoded == reference else '❌ abweichend'
+            print(f"{label:<30} {elapsed:8.1f} ms  {len(body) / 1024 / 1024:6.2f} MB  {status}")
+
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Events Check - Reader-Verbindungen der Event-Pumpe
+
+Jeder erste Client nach einer Pause startet einen neuen Pump-Thread, der
+die Datenbank über einen eigenen Reader abfragt. Der Check simuliert
+SUBSCRIBE_CYCLES Reloads der Seite (subscribe/unsubscribe) und prüft, dass
+danach keine Reader-Verbindung mehr offen ist - auch nicht die eines
+kurzlebigen Worker-Threads.
+
+Exit-Code 1, wenn eine Prüfung fehlschlägt.
+
+Aufruf: python check_events.py
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from api.events import EventBus, DatabaseChangeSource
+from database.models import Database
+from database.operations import ItemOperations
+
+SUBSCRIBE_CYCLES = 20
+POLL_INTERVAL = 0.01
+
+
+def open_readers(db):
+    return len(db.pool._readers)
+
+
+def check_pump_cycles(db):
+    bus = EventBus(poll_interval=POLL_INTERVAL)
+    bus.add_source(DatabaseChangeSource(db))
+    operations = ItemOperations(db)
+
+    for i in range(SUBSCRIBE_CYCLES):
+        bus.subscribe()
+        pump = bus._pump
+        # Pumpe muss mindestens einmal die Datenbank gelesen haben
+        operations.add_item(f"Cycle Item {i}", 'Helmet', initial_count=1)
+        deadline = time.monotonic() + 2
+        while bus.last_id <= i and time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+        bus.unsubscribe()
+        pump.join(2)
+
+    bus.close()
+    failures = []
+    if bus.last_id < SUBSCRIBE_CYCLES:
+        failures.append(f"nur {bus.last_id} von {SUBSCRIBE_CYCLES} 'db'-Events")
+    if open_readers(db):
+        failures.append(f"{open_readers(db)} Reader nach {SUBSCRIBE_CYCLES} Zyklen noch offen")
+    return failures
+
+
+def check_worker_threads(db):
+    def read():
+        db.reader().execute('SELECT COUNT(*) FROM items').fetchone()
+
+    for _ in range(SUBSCRIBE_CYCLES):
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+    if open_readers(db):
+        return [f"{open_readers(db)} Reader beendeter Threads noch offen"]
+    return []
+
+
+def main():
+    print("=" * 60)
+    print("Events Check")
+    print("=" * 60)
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'inventory.db'))
+        for label, check in [
+            (f'Event-Pumpe: {SUBSCRIBE_CYCLES} Reloads ohne offene Reader', check_pump_cycles),
+            ('Beendete Threads geben ihren Reader frei', check_worker_threads),
+        ]:
+            failures = check(db)
+            print(f"{'✅' if not failures else '❌'} {label}")
+            for failure in failures:
+                print(f"   {failure}")
+            failed = failed or bool(failures)
+        db.close()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
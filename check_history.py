@@ -0,0 +1,104 @@
+"""
+History Check - Zeitpunkte mit Zeitzone bei Restore/counts_as_of
+
+Die Event-Zeitstempel stehen in lokaler Zeit in der Datenbank. Zeitpunkte
+mit Offset oder 'Z' (z.B. aus toISOString() im Browser) müssen erst in
+lokale Zeit umgerechnet werden, nicht nur den Offset verlieren. Der Check
+setzt die lokale Zeitzone des Prozesses auf UTC und prüft:
+
+  - Normalisierung von '+02:00', 'Z', naiven Strings und datetime-Objekten
+  - counts_as_of mit einem '+02:00'-Zeitpunkt kurz vor bzw. nach einer Änderung
+
+Exit-Code 1, wenn eine Prüfung fehlschlägt.
+
+Aufruf: python check_history.py
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+# Lokale Zeit = UTC, damit die erwarteten Werte feststehen
+os.environ['TZ'] = 'UTC'
+time.tzset()
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from database.history import InventoryHistory, _normalize_timestamp
+from database.models import Database
+from database.operations import ItemOperations
+
+PLUS_TWO = timezone(timedelta(hours=2))
+
+
+def check_normalize():
+    failures = []
+    for value, expected in [
+        ('2026-03-01T12:00:00+02:00', '2026-03-01 10:00:00.000'),
+        ('2026-03-01T12:00:00.250Z', '2026-03-01 12:00:00.250'),
+        ('2026-03-01 12:00:00', '2026-03-01 12:00:00.000'),
+        (datetime(2026, 3, 1, 12, 0, tzinfo=PLUS_TWO), '2026-03-01 10:00:00.000'),
+        (datetime(2026, 3, 1, 12, 0), '2026-03-01 12:00:00.000'),
+    ]:
+        result = _normalize_timestamp(value)
+        if result != expected:
+            failures.append(f"{value!r} -> {result!r} statt {expected!r}")
+    return failures
+
+
+def check_counts_as_of(tmp_dir):
+    db = Database(os.path.join(tmp_dir, 'inventory.db'))
+    operations = ItemOperations(db)
+    history = InventoryHistory(db)
+    failures = []
+    try:
+        operations.add_items_bulk([{'name': 'Offset Helmet', 'item_type': 'Helmet', 'initial_count': 1}])
+        history.create_snapshot()
+        item_id = db.reader().execute("SELECT id FROM items WHERE name = 'Offset Helmet'").fetchone()[0]
+
+        # Zeitpunkt zwischen Snapshot und Änderung, als lokale Zeit und mit +02:00
+        time.sleep(0.05)
+        before_change = datetime.now()
+        time.sleep(0.05)
+        operations.update_item_count('Offset Helmet', 5)
+        offset_before = before_change.astimezone(PLUS_TWO).isoformat()
+        offset_after = (datetime.now() + timedelta(seconds=1)).astimezone(PLUS_TWO).isoformat()
+
+        for label, timestamp, expected in [
+            ('lokal vor der Änderung', before_change.isoformat(), 1),
+            ('+02:00 vor der Änderung', offset_before, 1),
+            ('+02:00 nach der Änderung', offset_after, 5),
+        ]:
+            count = history.counts_as_of(timestamp).get(item_id, 0)
+            if count != expected:
+                failures.append(f"{label} ({timestamp}): Anzahl {count} statt {expected}")
+    finally:
+        db.close()
+    return failures
+
+
+def main():
+    print("=" * 60)
+    print("History Check")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        checks = [
+            ('Zeitstempel-Normalisierung', check_normalize),
+            ('counts_as_of mit +02:00', lambda: check_counts_as_of(tmp_dir)),
+        ]
+        failed = False
+        for label, check in checks:
+            failures = check()
+            print(f"{'✅' if not failures else '❌'} {label}")
+            for failure in failures:
+                print(f"   {failure}")
+            failed = failed or bool(failures)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
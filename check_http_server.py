@@ -0,0 +1,317 @@
+"""
+HTTP Server Check - Spuren und Keep-Alive von PooledHTTPServer
+
+Startet PooledHTTPServer mit einem Test-Handler, der pro Request den Namen
+des bearbeitenden Threads zurückgibt, und prüft über persistente Verbindungen:
+
+  - ein per Pipelining nachgeschobenes /api/events bekommt einen Stream-Thread
+    (kein regulärer Worker bleibt hängen, max_event_streams zählt ihn)
+  - ein nachgeschobener langsamer API-Aufruf läuft auf der Long-Running-Spur
+  - /api/batch mit einer langsamen Methode ebenfalls (neue und wiederverwendete
+    Verbindung), ein Batch nur mit schnellen Methoden auf der regulären Spur
+  - ein Batch mit transaction=True lehnt Methoden mit Netzwerkzugriff ab
+  - der ETag einer versionierten Route hängt nicht an späteren Antworten
+    derselben Verbindung (echter GearCrateAPIHandler, temporäre Datenbank)
+  - eine geparkte Verbindung, deren Request-Zeile in Stücken kommt, hält die
+    übrigen geparkten Verbindungen nicht auf
+
+Exit-Code 1, wenn eine Prüfung fehlschlägt.
+
+Aufruf: python check_http_server.py
+"""
+import http.client
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+import main_browser
+from main_browser import GearCrateAPIHandler
+from api.http_server import PooledHTTPServer, KeepAliveMixin
+
+TIMEOUT = 5
+# Antwortzeit einer Verbindung, während eine andere ihre Request-Zeile trödelt
+SLOW_REQUEST_LIMIT = 0.3
+
+
+class ThreadNameHandler(KeepAliveMixin, BaseHTTPRequestHandler):
+    """Antwortet mit dem Thread-Namen; /api/events bleibt offen wie ein SSE-Stream"""
+
+    def _reply(self, body):
+        body = body.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith('/api/events'):
+            self.close_connection = True
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.end_headers()
+            self.wfile.write(f"data: {threading.current_thread().name}\n\n".encode())
+            self.wfile.flush()
+            # Stream läuft, bis der Client trennt
+            while self.rfile.read(1):
+                pass
+            return
+        self._reply(threading.current_thread().name)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._reply(threading.current_thread().name)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def read_response(sock_file):
+    """Status und Body einer Antwort mit Content-Length"""
+    status = sock_file.readline().split(b' ')[1]
+    length = 0
+    while True:
+        line = sock_file.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return int(status), sock_file.read(length).decode()
+
+
+def get(port, path):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=TIMEOUT)
+    conn.request('GET', path)
+    response = conn.getresponse()
+    body = response.read().decode()
+    conn.close()
+    return response.status, body
+
+
+def check_pipelined_event_stream(port):
+    """GET + /api/events in einem Paket: der Stream darf den einzigen Worker nicht belegen"""
+    sock = socket.create_connection(('127.0.0.1', port), timeout=TIMEOUT)
+    sock.sendall(b'GET /api/get_scan_results HTTP/1.1\r\nHost: x\r\n\r\n'
+                 b'GET /api/events HTTP/1.1\r\nHost: x\r\n\r\n')
+    sock_file = sock.makefile('rb')
+    status, first = read_response(sock_file)
+    stream_head = sock_file.readline()
+    while sock_file.readline() not in (b'\r\n', b''):
+        pass
+    stream_thread = sock_file.readline().decode().strip()
+
+    failures = []
+    if status != 200 or not first.startswith('http_'):
+        failures.append(f"erster Request auf {first!r} statt regulärem Worker")
+    if b'200' not in stream_head or stream_thread != 'data: http-events':
+        failures.append(f"Stream lief auf {stream_thread!r} statt eigenem Thread")
+
+    # Einziger Worker muss frei sein, der einzige Stream-Slot belegt
+    try:
+        status, body = get(port, '/api/get_stats')
+        if status != 200:
+            failures.append(f"regulärer Request nach Stream: Status {status}")
+    except OSError as e:
+        failures.append(f"regulärer Request nach Stream: {e}")
+    try:
+        status, _ = get(port, '/api/events')
+        if status != 503:
+            failures.append(f"zweiter Stream trotz max_event_streams=1: Status {status}")
+    except OSError as e:
+        failures.append(f"zweiter Stream: {e}")
+
+    sock_file.close()
+    sock.close()
+    return failures
+
+
+def check_pipelined_long_running(port):
+    """Regulärer Request, danach langsamer POST auf derselben Verbindung"""
+    body = b'{"query": "helmet"}'
+    sock = socket.create_connection(('127.0.0.1', port), timeout=TIMEOUT)
+    sock.sendall(b'GET /api/get_stats HTTP/1.1\r\nHost: x\r\n\r\n'
+                 b'POST /api/search_items_cstone HTTP/1.1\r\nHost: x\r\n'
+                 b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body +
+                 b'GET /api/get_stats HTTP/1.1\r\nHost: x\r\n\r\n')
+    sock_file = sock.makefile('rb')
+    threads = [read_response(sock_file)[1] for _ in range(3)]
+    sock_file.close()
+    sock.close()
+
+    failures = []
+    if not threads[0].startswith('http_'):
+        failures.append(f"GET lief auf {threads[0]!r}")
+    if not threads[1].startswith('http-long'):
+        failures.append(f"langsamer POST lief auf {threads[1]!r} statt der Long-Running-Spur")
+    return failures
+
+
+def post_request(path, payload):
+    body = json.dumps(payload).encode()
+    return (f'POST {path} HTTP/1.1\r\nHost: x\r\nContent-Type: application/json\r\n'
+            f'Content-Length: {len(body)}\r\n\r\n').encode() + body
+
+
+def check_batch_lanes(port):
+    """Batches werden nach ihren Methoden eingeordnet, auch per Pipelining"""
+    slow_batch = post_request('/api/batch', {'calls': [
+        {'method': 'get_stats'}, {'method': 'add_item', 'args': {'name': 'x'}}]})
+    fast_batch = post_request('/api/batch', [{'method': 'get_stats'}, {'method': 'update_count'}])
+    failures = []
+
+    for label, requests, expected in [
+        ('neue Verbindung', [slow_batch], ['http-long']),
+        ('Pipelining', [b'GET /api/get_stats HTTP/1.1\r\nHost: x\r\n\r\n', slow_batch, fast_batch],
+         ['http_', 'http-long', 'http_']),
+    ]:
+        sock = socket.create_connection(('127.0.0.1', port), timeout=TIMEOUT)
+        sock.sendall(b''.join(requests))
+        sock_file = sock.makefile('rb')
+        threads = [read_response(sock_file)[1] for _ in requests]
+        sock_file.close()
+        sock.close()
+        for thread, prefix in zip(threads, expected):
+            if not thread.startswith(prefix):
+                failures.append(f"{label}: Batch lief auf {thread!r} statt {prefix}*")
+    return failures
+
+
+def check_transaction_rejects_network(port):
+    """add_item (Scraping + Download) darf nicht unter der Schreibsperre laufen"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=TIMEOUT)
+    conn.request('POST', '/api/batch', body=json.dumps({'transaction': True, 'calls': [
+        {'method': 'update_count', 'args': {'name': 'x', 'count': 1}},
+        {'method': 'add_item', 'args': {'name': 'Scraped Item'}},
+    ]}), headers={'Content-Type': 'application/json'})
+    result = json.loads(conn.getresponse().read())
+    conn.close()
+    if result.get('success') is not False or 'add_item' not in result.get('error', '') or result.get('results'):
+        return [f"Transaktion mit add_item nicht abgelehnt: {result}"]
+    return []
+
+
+def check_slow_request_line(port):
+    """Halbe Request-Zeile auf einer geparkten Verbindung darf andere geparkte nicht aufhalten"""
+    request = b'GET /api/get_scan_results HTTP/1.1\r\nHost: x\r\n\r\n'
+    slow = socket.create_connection(('127.0.0.1', port), timeout=TIMEOUT)
+    other = socket.create_connection(('127.0.0.1', port), timeout=TIMEOUT)
+    slow_file, other_file = slow.makefile('rb'), other.makefile('rb')
+    for sock, sock_file in [(slow, slow_file), (other, other_file)]:
+        sock.sendall(request)
+        read_response(sock_file)
+    # Beide Verbindungen geparkt
+    time.sleep(0.1)
+
+    slow.sendall(request[:10])
+    time.sleep(0.05)
+    start = time.monotonic()
+    other.sendall(request)
+    status, _ = read_response(other_file)
+    elapsed = time.monotonic() - start
+    slow.sendall(request[10:])
+    slow_status, _ = read_response(slow_file)
+
+    for sock_file, sock in [(slow_file, slow), (other_file, other)]:
+        sock_file.close()
+        sock.close()
+    failures = []
+    if status != 200 or slow_status != 200:
+        failures.append(f"Status {status}/{slow_status} statt 200")
+    if elapsed > SLOW_REQUEST_LIMIT:
+        failures.append(f"zweite Verbindung wartete {elapsed * 1000:.0f} ms auf die erste")
+    return failures
+
+
+def check_etag_per_request(port):
+    """Versionierte Route, danach unversionierte Routen auf derselben Verbindung"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=TIMEOUT)
+    failures = []
+
+    conn.request('GET', '/api/get_inventory_items')
+    response = conn.getresponse()
+    response.read()
+    if not response.getheader('ETag'):
+        failures.append("/api/get_inventory_items ohne ETag")
+
+    for method, path, body in [
+        ('GET', '/api/get_scan_results', None),
+        ('GET', '/api/get_gear_set_details?set_name=ADP', None),
+        ('POST', '/api/get_stats', b'{}'),
+    ]:
+        conn.request(method, path, body=body, headers={'Content-Type': 'application/json'} if body else {})
+        response = conn.getresponse()
+        response.read()
+        if response.getheader('ETag') or response.getheader('Cache-Control'):
+            failures.append(f"{method} {path}: veralteter ETag {response.getheader('ETag')}")
+
+    conn.close()
+    return failures
+
+
+def start_api_server(tmp_dir):
+    """GearCrateAPIHandler mit leerer Datenbank in tmp_dir"""
+    # API() öffnet data/inventory.db relativ zum Arbeitsverzeichnis
+    cwd = os.getcwd()
+    os.chdir(tmp_dir)
+    try:
+        GearCrateAPIHandler.api = main_browser.API()
+    finally:
+        os.chdir(cwd)
+    GearCrateAPIHandler.cache_dir = os.path.join(tmp_dir, 'images')
+    server = PooledHTTPServer(('127.0.0.1', 0), GearCrateAPIHandler, workers=2)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    server = PooledHTTPServer(('127.0.0.1', 0), ThreadNameHandler,
+                              workers=1, long_running_workers=1, max_event_streams=1)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    api_server = start_api_server(tmp_dir.name)
+    api_port = api_server.server_address[1]
+
+    checks = [
+        ('Pipelining: /api/events nach GET', check_pipelined_event_stream, port),
+        ('Pipelining: langsamer POST nach GET', check_pipelined_long_running, port),
+        ('Batch nach enthaltenen Methoden', check_batch_lanes, port),
+        ('Batch-Transaktion ohne Netzwerk-Methoden', check_transaction_rejects_network, api_port),
+        ('Keep-Alive: ETag nur für versionierte Routen', check_etag_per_request, api_port),
+        ('Keep-Alive: trödelnde Request-Zeile hält andere nicht auf', check_slow_request_line, api_port),
+    ]
+
+    print("=" * 60)
+    print("HTTP Server Check")
+    print("=" * 60)
+
+    failed = False
+    for label, check, check_port in checks:
+        failures = check(check_port)
+        print(f"{'✅' if not failures else '❌'} {label}")
+        for failure in failures:
+            print(f"   {failure}")
+        failed = failed or bool(failures)
+
+    for running in (server, api_server):
+        running.shutdown()
+        running.server_close()
+    GearCrateAPIHandler.api.close()
+    # Handler wechseln ins web-Verzeichnis; vor dem Aufräumen zurück
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    tmp_dir.cleanup()
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Query Plan Check - prüft, dass keine ItemOperations-Abfrage die items-Tabelle voll scannt
+
+Legt eine temporäre Datenbank mit synthetischen Items an, ruft die Lese-Methoden
+von ItemOperations auf, zeichnet die ausgeführten SELECTs auf und lässt für jedes
+EXPLAIN QUERY PLAN laufen. Exit-Code 1, wenn ein Plan 'SCAN items' ohne Index enthält
+oder ein Index auf items von keiner Abfrage benutzt wird (jeder Index kostet bei
+jedem Bulk-Upsert).
+
+Aufruf: python check_query_plans.py
+"""
+import os
+import re
+import sys
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from database.models import Database
+from database.operations import ItemOperations
+from cache.gear_sets import GearSetsManager
+
+ITEM_COUNT = 5000
+ITEM_TYPES = ['Torso', 'Arms', 'Legs', 'Helmet', 'Backpack', 'Undersuit']
+
+# Tabellen-Scan ohne Index (SCAN items USING [COVERING] INDEX ... ist ok)
+FULL_SCAN = re.compile(r'^SCAN items( |$)(?!USING)')
+USED_INDEX = re.compile(r'USING (?:COVERING )?INDEX (\w+)')
+
+
+def seed(operations):
+    """Füllt die Datenbank mit synthetischen Items"""
+    result = operations.add_items_bulk(
+        {
+            'name': f"Item {i:05d} {ITEM_TYPES[i % len(ITEM_TYPES)]}",
+            'item_type': ITEM_TYPES[i % len(ITEM_TYPES)],
+            'initial_count': i % 3
+        }
+        for i in range(ITEM_COUNT)
+    )
+    if not result['success']:
+        print(f"⚠️  {result['failed']} Items konnten nicht angelegt werden: {result['results'][0].get('error')}")
+    for i in range(0, ITEM_COUNT, 7):
+        operations.toggle_favorite_status(f"Item {i:05d} {ITEM_TYPES[i % len(ITEM_TYPES)]}", 1)
+
+
+def run_queries(db, operations):
+    """Ruft alle Lese-Pfade auf"""
+    operations.get_item_by_name('Item 00042 Legs')
+    operations.get_existing_names(['Item 00001 Arms', 'Missing'])
+    operations.get_all_items()
+    operations.get_all_items(include_zero_count=True)
+    operations.get_all_items(is_favorite=1)
+    operations.search_items('Item 0004')
+    operations.search_items('Item 0004', include_zero_count=False)
+    operations.get_category_stats()
+    operations.get_inventory_totals()
+    for sort_by in ('name', 'date', 'count', 'item_type'):
+        for sort_order in ('asc', 'desc'):
+            operations.get_inventory_page(sort_by=sort_by, sort_order=sort_order, limit=50)
+            operations.get_inventory_page(category='Torso', sort_by=sort_by, sort_order=sort_order, limit=50)
+    operations.get_inventory_page(category='Torso', limit=50)
+    operations.get_inventory_page(category='Favorites', limit=50)
+    operations.get_inventory_page(query='Item 001', limit=50)
+    changes = operations.get_changes()
+    operations.get_changes(changes['version'] - 10, changes['sync_id'])
+
+    gear_sets = GearSetsManager()
+    for set_name in list(gear_sets.set_definitions)[:3]:
+        gear_sets.get_set_variants(db.reader(), set_name)
+
+
+def main():
+    failures = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'inventory.db'))
+        operations = ItemOperations(db)
+        seed(operations)
+        db.conn.execute('ANALYZE')
+
+        statements = []
+        db.reader().set_trace_callback(statements.append)
+        run_queries(db, operations)
+        db.reader().set_trace_callback(None)
+
+        selects = [sql for sql in dict.fromkeys(statements) if sql.lstrip().upper().startswith('SELECT')]
+
+        print("=" * 60)
+        print(f"Query Plan Check ({len(selects)} Abfragen, {ITEM_COUNT} Items)")
+        print("=" * 60)
+
+        used_indexes = set()
+        for sql in selects:
+            plan = [row[3] for row in db.reader().execute('EXPLAIN QUERY PLAN ' + sql)]
+            scans = [step for step in plan if FULL_SCAN.match(step)]
+            status = '❌' if scans else '✅'
+            print(f"{status} {' '.join(sql.split())[:100]}")
+            for step in plan:
+                print(f"      {step}")
+            if scans:
+                failures.append(sql)
+            used_indexes.update(USED_INDEX.findall(' '.join(plan)))
+
+        item_indexes = [row[0] for row in db.reader().execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'items' ORDER BY name"
+        )]
+        unused = [name for name in item_indexes if name not in used_indexes]
+        db.close()
+
+    print()
+    for name in unused:
+        print(f"❌ Index {name} wird von keiner Abfrage benutzt")
+    if failures:
+        print(f"❌ {len(failures)} Abfrage(n) mit Full Table Scan")
+    if failures or unused:
+        sys.exit(1)
+    print(f"✅ Keine Full Table Scans, alle {len(item_indexes)} Indizes auf items benutzt")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Search Check - limit von /api/search
+
+Legt eine temporäre Datenbank mit mehr Treffern als SEARCH_MAX_LIMIT an und
+prüft, dass API.search und ItemSearchIndex.search den limit-Parameter auf
+1..SEARCH_MAX_LIMIT begrenzen (0/negativ liefern nicht mehr leere Seiten,
+riesige Werte nicht den ganzen Katalog) und ungültige Werte ablehnen.
+
+Exit-Code 1, wenn eine Prüfung fehlschlägt.
+
+Aufruf: python check_search.py
+"""
+import os
+import sys
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from api.backend import API
+from database.models import Database
+from database.operations import ItemOperations
+from database.search_index import SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT
+
+ITEM_COUNT = SEARCH_MAX_LIMIT + 50
+
+
+def seed(tmp_dir):
+    db = Database(os.path.join(tmp_dir, 'data', 'inventory.db'))
+    ItemOperations(db).add_items_bulk(
+        {'name': f"Pembroke Helmet {i:04d}", 'item_type': 'Helmet', 'initial_count': 1}
+        for i in range(ITEM_COUNT)
+    )
+    db.close()
+
+
+def check_api_limit(api):
+    failures = []
+    for limit, expected in [
+        (0, 1),
+        (-5, 1),
+        (3, 3),
+        ('7', 7),
+        (None, SEARCH_DEFAULT_LIMIT),
+        (SEARCH_MAX_LIMIT * 100, SEARCH_MAX_LIMIT),
+    ]:
+        result = api.search('helmet', limit)
+        if not result['success'] or len(result['items']) != expected or result['limit'] != expected:
+            failures.append(f"limit={limit!r}: {len(result.get('items', []))} Items, "
+                            f"limit {result.get('limit')} statt {expected}")
+        elif result['total'] != ITEM_COUNT:
+            failures.append(f"limit={limit!r}: total {result['total']} statt {ITEM_COUNT}")
+
+    result = api.search('helmet', 'abc')
+    if result['success']:
+        failures.append("limit='abc' nicht abgelehnt")
+    return failures
+
+
+def check_index_limit(api):
+    failures = []
+    for limit, expected in [(0, 1), (-1, 1), (10 ** 6, SEARCH_MAX_LIMIT), (None, ITEM_COUNT)]:
+        items, _ = api.search_index.search('pembroke', limit)
+        if len(items) != expected:
+            failures.append(f"Index limit={limit!r}: {len(items)} Items statt {expected}")
+    return failures
+
+
+def main():
+    print("=" * 60)
+    print("Search Check")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        seed(tmp_dir)
+        # API() öffnet data/inventory.db relativ zum Arbeitsverzeichnis
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+        try:
+            api = API()
+        finally:
+            os.chdir(cwd)
+
+        failed = False
+        for label, check in [
+            ('API.search: limit begrenzt', check_api_limit),
+            ('ItemSearchIndex.search: limit begrenzt', check_index_limit),
+        ]:
+            failures = check(api)
+            print(f"{'✅' if not failures else '❌'} {label}")
+            for failure in failures:
+                print(f"   {failure}")
+            failed = failed or bool(failures)
+
+        api.close()
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
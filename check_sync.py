@@ -0,0 +1,77 @@
+"""
+Sync Check - Tombstones des Katalog-Delta-Syncs
+
+Gelöschte Items hinterlassen Tombstones, damit get_changes(since) sie als
+'deleted' melden kann. Der Check legt eine temporäre Datenbank an, datiert
+einen Tombstone über TOMBSTONE_RETENTION_DAYS zurück und prüft:
+
+  - der nächste Delete räumt alte Tombstones ab, neue bleiben
+  - ein Client, dessen since vor dem abgeräumten Tombstone liegt, bekommt
+    den ganzen Katalog (full=True) und damit das gelöschte Item nicht mehr
+  - ein Client mit neuerem Stand bekommt weiter nur das Delta
+
+Exit-Code 1, wenn eine Prüfung fehlschlägt.
+
+Aufruf: python check_sync.py
+"""
+import os
+import sys
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from database.models import Database
+from database.operations import ItemOperations, TOMBSTONE_RETENTION_DAYS
+
+
+def check_tombstone_retention(db):
+    operations = ItemOperations(db)
+    operations.add_items_bulk(
+        {'name': f"Sync Helmet {i}", 'item_type': 'Helmet', 'initial_count': 1} for i in range(4)
+    )
+    stale = operations.get_changes()
+
+    operations.delete_item('Sync Helmet 0')
+    with db.writer() as conn:
+        conn.execute("UPDATE item_tombstones SET created_at = datetime('now', ?)",
+                     (f'-{TOMBSTONE_RETENTION_DAYS + 1} days',))
+    current = operations.get_changes(stale['version'], stale['sync_id'])
+    operations.delete_item('Sync Helmet 1')
+
+    failures = []
+    tombstones = [row[0] for row in db.reader().execute('SELECT name FROM item_tombstones')]
+    if tombstones != ['Sync Helmet 1']:
+        failures.append(f"Tombstones nach dem Abräumen: {tombstones}")
+
+    changes = operations.get_changes(stale['version'], stale['sync_id'])
+    names = sorted(item['name'] for item in changes['items'])
+    if not changes['full'] or names != ['Sync Helmet 2', 'Sync Helmet 3']:
+        failures.append(f"since vor dem abgeräumten Tombstone: full={changes['full']}, Items {names}")
+
+    changes = operations.get_changes(current['version'], current['sync_id'])
+    if changes['full'] or changes['deleted'] != ['Sync Helmet 1'] or changes['items']:
+        failures.append(f"since nach dem abgeräumten Tombstone: full={changes['full']}, "
+                        f"deleted {changes['deleted']}, {len(changes['items'])} Items")
+    return failures
+
+
+def main():
+    print("=" * 60)
+    print("Sync Check")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, 'inventory.db'))
+        failures = check_tombstone_retention(db)
+        db.close()
+
+    print(f"{'✅' if not failures else '❌'} Tombstones nach {TOMBSTONE_RETENTION_DAYS} Tagen abgeräumt, "
+          f"ältere Stände laden neu")
+    for failure in failures:
+        print(f"   {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
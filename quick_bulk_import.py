@@ -136,12 +136,10 @@ def main():
                             except:
                                 pass
 
-                            # Update DB mit Bildpfad
-                            api.db.conn.execute(
-                                "UPDATE items SET image_url = ?, image_path = ? WHERE name = ?",
-                                (item['image_url'], image_path, item['name'])
-                            )
-                            api.db.conn.commit()
+                            # Update DB mit Bildpfad (und den Bild-URLs fürs Grid)
+                            update = api.operations.update_item_image(item['name'], item['image_url'], image_path)
+                            if not update['success']:
+                                raise RuntimeError(update['error'])
                             print(f"  [{i}/{len(items)}] ✅ {item['name']} (Bild aktualisiert)")
                             total_imported += 1
                     except Exception as e:
@@ -277,14 +277,13 @@ def import_item_to_database(api, item_data, image_temp_path):
 
         # Füge Item zur Datenbank hinzu oder aktualisiere es
         if existing:
-            # Update existierendes Item
-            api.db.conn.execute(
-                """UPDATE items
-                   SET item_type = ?, image_url = ?, image_path = ?
-                   WHERE name = ?""",
-                (item_data['item_type'], item_data['image_url'], image_path, item_data['name'])
+            # Update existierendes Item (Bild-URLs werden mitgeschrieben)
+            result = api.operations.update_item_image(
+                item_data['name'], item_data['image_url'], image_path, item_data['item_type']
             )
-            api.db.conn.commit()
+            if not result['success']:
+                print(f"\n❌ Fehler beim Aktualisieren: {result['error']}")
+                return False
             print(f"\n✅ Item '{item_data['name']}' wurde aktualisiert!")
         else:
             # Neues Item hinzufügen
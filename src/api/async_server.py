@@ -0,0 +1,681 @@
+"""
+asyncio HTTP server for the browser mode
+
+Alternative to PooledHTTPServer + GearCrateAPIHandler (main_browser.py) with
+the same routes, headers and API results, so the web UI works unchanged.
+One event loop owns every socket: an idle keep-alive connection or an open
+/api/events stream costs a coroutine instead of a thread, which matters
+with many tabs or a slow client. Static files and images are answered on
+the loop (precompressed cache / loop.sendfile); API calls never run on it:
+
+  db        'workers' threads - SQLite reads and writes (the Database pool
+            is thread-based and sqlite3 has no async API)
+  network   'long_running_workers' threads - LONG_RUNNING_API_METHODS
+            (CStone scrapes, imports, cache cleanup), so a slow fetch
+            never waits behind database calls or holds up thumbnails
+
+The CStone scraper is built on requests.Session (pooling, retries); it runs
+unchanged on the network executor instead of a second async HTTP client.
+Serialization and compression of a result happen in the same executor job.
+"""
+import asyncio
+import functools
+import html
+import json
+import mimetypes
+import os
+import posixpath
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from http import HTTPStatus
+from http.server import DEFAULT_ERROR_MESSAGE, DEFAULT_ERROR_CONTENT_TYPE
+from urllib.parse import unquote
+
+from api.backend import NON_API_METHODS
+from api.compression import StaticAssetCache, choose_encoding, compress, COMPRESSION_MIN_BYTES
+from api.events import format_event, SSE_KEEPALIVE, SSE_KEEPALIVE_SECONDS, SSE_CLIENT_CHECK_SECONDS, SSE_RETRY_MS
+from api.http_server import (load_server_settings, is_long_running_path, is_long_running_batch, parse_byte_range,
+                             etag_matches, is_fresh, LONG_RUNNING_API_METHODS, KEEP_ALIVE_ERRORS,
+                             IMAGE_CONTENT_TYPES, SOCKET_TIMEOUT)
+from api.routes import build_get_routes
+from api import serialization
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+SERVER_VERSION = f"GearCrate-asyncio Python/{sys.version.split()[0]}"
+
+
+class _BadRequest(Exception):
+    """Request that cannot be parsed; answered with `code` and the connection closed"""
+
+    def __init__(self, code, message=None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class _Request:
+    """One parsed request (header names lower-cased)"""
+    __slots__ = ('method', 'target', 'path', 'query', 'headers', 'body', 'close')
+
+    def __init__(self, method, target, version, headers, body):
+        self.method = method
+        self.target = target
+        self.path, _, self.query = target.partition('?')
+        self.headers = headers
+        self.body = body
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.0':
+            self.close = 'keep-alive' not in connection
+        else:
+            self.close = 'close' in connection
+
+
+class AsyncHTTPServer:
+    """
+    HTTP/1.1 server on asyncio with the routes of the threaded browser-mode server.
+
+    Settings are the "server" section of user_config.json (see
+    load_server_settings); max_idle_connections does not apply, idle
+    connections hold no thread here.
+    """
+
+    def __init__(self, api, web_dir, cache_dir, settings=None):
+        settings = settings if settings is not None else load_server_settings()
+        self.api = api
+        self.web_dir = os.path.abspath(web_dir)
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.workers = settings['workers']
+        self.long_running_workers = settings['long_running_workers']
+        self.max_pending = settings['max_pending']
+        self.max_event_streams = settings['max_event_streams']
+        self.keep_alive_timeout = settings['keep_alive_timeout']
+
+        self.static_assets = StaticAssetCache(self.web_dir)
+        self.get_routes = build_get_routes(self)
+        self._post_methods = {
+            name: getattr(api, name) for name in dir(api)
+            if not name.startswith('_') and name not in NON_API_METHODS and callable(getattr(api, name, None))
+        }
+        # ETag-Präfix pro Serverstart: die Datenversion beginnt bei jedem Start neu
+        self._etag_prefix = os.urandom(4).hex()
+
+        self._db_executor = ThreadPoolExecutor(self.workers, thread_name_prefix='async-db')
+        self._network_executor = ThreadPoolExecutor(self.long_running_workers, thread_name_prefix='async-net')
+
+        self._loop = None
+        self._server = None
+        self._connections = set()
+
+        # Event-Streams: ein Thread wartet auf dem EventBus und weckt die
+        # wartenden Streams (Futures) auf dem Loop
+        self._streams = 0
+        self._stream_waiters = set()
+        self._bridge = None
+        self._bridge_lock = threading.Lock()
+
+    def precompress_static(self):
+        """Compress the JS/CSS/HTML under web_dir once, before serving"""
+        self.static_assets.precompress()
+
+    async def start(self, host='', port=8080):
+        """Bind and start accepting connections"""
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_connection, host or None, port,
+                                                  backlog=self.max_pending)
+        return self._server
+
+    @property
+    def port(self):
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Serve until the task is cancelled (start() must have been awaited)"""
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            # Offene Verbindungen (Keep-Alive, Event-Streams) mit beenden
+            for task in self._connections:
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+
+    def close(self):
+        """Stop the executors (running API calls finish in the background)"""
+        if self._server is not None:
+            self._server.close()
+        self._db_executor.shutdown(wait=False, cancel_futures=True)
+        self._network_executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------------------------------------------------------
+    # GET-Routen (Tabelle: api.routes.build_get_routes); synchrone Handler
+    # laufen im Executor und liefern das API-Ergebnis
+    # ---------------------------------------------------------
+
+    def _get_inventory_items(self, _, sort_by, sort_order, category, is_favorite, limit, offset, projection):
+        return self.api.inventory(
+            sort_by=sort_by,
+            sort_order=sort_order,
+            category=category,
+            is_favorite=is_favorite,
+            limit=limit,
+            offset=offset,
+            projection=projection
+        )
+
+    def _get_search_items_local(self, _, query, projection):
+        return self.api.search_items_local(query, projection)
+
+    def _get_search(self, _, q, limit):
+        return self.api.search(q, limit)
+
+    def _get_item_changes(self, _, since, sync_id, projection):
+        return self.api.get_item_changes(since, sync_id, projection)
+
+    def _get_all_gear_sets(self, _):
+        return self.api.get_all_gear_sets()
+
+    def _get_gear_set_details(self, _, set_name, variant):
+        return self.api.get_gear_set_details(set_name, variant)
+
+    def _get_gear_set_variants(self, _, set_name):
+        return self.api.get_gear_set_variants(set_name)
+
+    def _get_bulk_import(self, category_url):
+        return self.api.get_category_items(category_url)
+
+    def _get_scan_results(self, _):
+        return self.api.get_scan_results()
+
+    # ---------------------------------------------------------
+    # Verbindung / Request-Parser
+    # ---------------------------------------------------------
+
+    async def _handle_connection(self, reader, writer):
+        """Serve requests on one connection until it closes or stays idle for keep_alive_timeout"""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        timeout = SOCKET_TIMEOUT
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader, timeout)
+                except _BadRequest as e:
+                    request = _Request('GET', '/', 'HTTP/1.1', {}, b'')
+                    request.close = True
+                    await self._send_error(writer, request, e.code, e.message)
+                    return
+                if request is None:
+                    return
+
+                await self._respond(request, reader, writer)
+                if request.close:
+                    return
+                timeout = self.keep_alive_timeout
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            # Client weg / hängt
+            pass
+        except asyncio.CancelledError:
+            # Server wird beendet (serve_forever); Verbindungs-Tasks enden ohne Fehler
+            pass
+        except Exception as e:
+            logger.error(f"Connection error: {e}", exc_info=True, extra={'emoji': '❌'})
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _read_request(self, reader, timeout):
+        """Next request on the connection, or None when the client closed it"""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout)
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise _BadRequest(431)
+
+        lines = head[:-4].decode('iso-8859-1').split('\r\n')
+        words = lines[0].split()
+        if len(words) != 3 or not words[2].startswith('HTTP/'):
+            raise _BadRequest(400, f"Bad request syntax ({lines[0]!r})")
+        method, target, version = words
+
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(':')
+            if not sep:
+                raise _BadRequest(400, f"Bad header line ({line!r})")
+            headers[name.strip().lower()] = value.strip()
+
+        body = b''
+        if 'transfer-encoding' in headers:
+            raise _BadRequest(501, "Chunked request bodies are not supported")
+        if headers.get('content-length'):
+            try:
+                length = int(headers['content-length'])
+                if length < 0:
+                    raise ValueError(length)
+            except ValueError:
+                raise _BadRequest(400, "Bad Content-Length")
+            body = await asyncio.wait_for(reader.readexactly(length), SOCKET_TIMEOUT)
+
+        return _Request(method, target, version, headers, body)
+
+    async def _send(self, writer, request, status, headers=(), body=b''):
+        """Write status line, headers and body (no body for HEAD)"""
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+                 f"Server: {SERVER_VERSION}",
+                 f"Date: {formatdate(usegmt=True)}"]
+        lines.extend(f"{name}: {value}" for name, value in headers)
+        if request.close:
+            lines.append('Connection: close')
+        data = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1', 'replace')
+        if body and request.method != 'HEAD':
+            data += body
+        writer.write(data)
+        await writer.drain()
+
+    async def _send_error(self, writer, request, code, message=None):
+        """
+        HTML error page as BaseHTTPRequestHandler.send_error writes it.
+        The connection stays open for a completely read GET/HEAD (see KEEP_ALIVE_ERRORS).
+        """
+        if code not in KEEP_ALIVE_ERRORS or request.method not in ('GET', 'HEAD'):
+            request.close = True
+        status = HTTPStatus(code)
+        body = (DEFAULT_ERROR_MESSAGE % {
+            'code': code,
+            'message': html.escape(message or status.phrase, quote=False),
+            'explain': html.escape(status.description, quote=False),
+        }).encode('UTF-8', 'replace')
+        await self._send(writer, request, code, [
+            ('Content-Type', DEFAULT_ERROR_CONTENT_TYPE),
+            ('Content-Length', len(body)),
+        ], body)
+
+    async def _respond(self, request, reader, writer):
+        if request.method == 'GET':
+            await self._do_get(request, reader, writer)
+        elif request.method == 'HEAD':
+            # Wie SimpleHTTPRequestHandler: HEAD nur für Dateien unter web/
+            await self._send_static(writer, request, request.path)
+        elif request.method == 'POST':
+            await self._do_post(request, writer)
+        else:
+            await self._send_error(writer, request, 501, f"Unsupported method ({request.method!r})")
+
+    # ---------------------------------------------------------
+    # GET
+    # ---------------------------------------------------------
+
+    async def _do_get(self, request, reader, writer):
+        route, remainder = self.get_routes.resolve(request.path)
+        if route is None:
+            await self._send_static(writer, request, request.path)
+            return
+
+        try:
+            kwargs = route.coerce(request.query) if route.params else {}
+        except ValueError as e:
+            await self._send_error(writer, request, 400, str(e))
+            return
+
+        if asyncio.iscoroutinefunction(route.handler):
+            await route.handler(request, reader, writer, remainder, **kwargs)
+            return
+
+        call = functools.partial(route.handler, remainder, **kwargs)
+        executor = self._network_executor if is_long_running_path(request.path) else self._db_executor
+        await self._send_api_result(writer, request, route.name, call, executor, route.versioned)
+
+    def _render(self, call, encoding, versioned, if_none_match):
+        """
+        Executor job: (etag, body, content_encoding) for an API call;
+        body is None if the client's copy (If-None-Match) is current.
+        The data version is read before the call, so a write during the
+        call only causes a refetch.
+        """
+        etag = None
+        if versioned:
+            # Pro Kodierung ein eigener Tag (starke ETags gelten für genau diese Bytes)
+            version = self.api.db.data_version()
+            etag = f'"{self._etag_prefix}-{version}-{encoding}"' if encoding else f'"{self._etag_prefix}-{version}"'
+            if etag_matches(if_none_match, etag):
+                return etag, None, None
+
+        body = serialization.dumps(call())
+        if encoding and len(body) >= COMPRESSION_MIN_BYTES:
+            return etag, compress(body, encoding), encoding
+        return etag, body, None
+
+    async def _send_api_result(self, writer, request, name, call, executor, versioned=False):
+        """Run an API call on `executor` and send its result as JSON"""
+        encoding = choose_encoding(request.headers.get('accept-encoding'))
+        try:
+            etag, body, content_encoding = await self._loop.run_in_executor(
+                executor, self._render, call, encoding, versioned, request.headers.get('if-none-match'))
+        except Exception as e:
+            logger.error(f"Error in {name}: {e}", exc_info=True, extra={'emoji': '❌'})
+            await self._send_error(writer, request, 500, str(e))
+            return
+
+        if body is None:
+            await self._send(writer, request, 304, [
+                ('ETag', etag),
+                ('Cache-Control', 'no-cache'),
+                ('Access-Control-Allow-Origin', '*'),
+            ])
+            return
+
+        headers = [
+            ('Content-type', 'application/json'),
+            ('Access-Control-Allow-Origin', '*'),
+            ('Vary', 'Accept-Encoding'),
+        ]
+        if content_encoding:
+            headers.append(('Content-Encoding', content_encoding))
+        headers.append(('Content-Length', len(body)))
+        if etag:
+            # no-cache: Browser darf cachen, muss aber per If-None-Match nachfragen
+            headers.append(('ETag', etag))
+            headers.append(('Cache-Control', 'no-cache'))
+        await self._send(writer, request, 200, headers, body)
+
+    def _translate_path(self, path):
+        """URL path -> file below web_dir (same rules as SimpleHTTPRequestHandler.translate_path)"""
+        path = path.split('#', 1)[0]
+        trailing_slash = path.rstrip().endswith('/')
+        path = posixpath.normpath(unquote(path, errors='surrogatepass'))
+        result = self.web_dir
+        for word in filter(None, path.split('/')):
+            if os.path.dirname(word) or word in (os.curdir, os.pardir):
+                continue
+            result = os.path.join(result, word)
+        if trailing_slash:
+            result += '/'
+        return result
+
+    async def _send_static(self, writer, request, path):
+        """Files under web/: precompressed from memory, otherwise via sendfile"""
+        file_path = self._translate_path(path)
+        if os.path.isdir(file_path):
+            if not path.endswith('/'):
+                location = path + '/' + (f'?{request.query}' if request.query else '')
+                await self._send(writer, request, 301, [('Location', location), ('Content-Length', 0)])
+                return
+            file_path = os.path.join(file_path, 'index.html')
+
+        encoding = choose_encoding(request.headers.get('accept-encoding'))
+        cached = self.static_assets.get(file_path, encoding)
+        if cached is not None:
+            asset, body = cached
+            if is_fresh(request.headers.get('if-none-match'), request.headers.get('if-modified-since'),
+                        None, asset.mtime):
+                await self._send(writer, request, 304, [
+                    ('Last-Modified', asset.last_modified),
+                    ('Vary', 'Accept-Encoding'),
+                ])
+                return
+            await self._send(writer, request, 200, [
+                ('Content-type', asset.content_type),
+                ('Content-Encoding', encoding),
+                ('Content-Length', len(body)),
+                ('Last-Modified', asset.last_modified),
+                ('Vary', 'Accept-Encoding'),
+            ], body)
+            return
+
+        try:
+            f = open(file_path, 'rb')
+        except OSError:
+            await self._send_error(writer, request, 404, "File not found")
+            return
+
+        with f:
+            stat = os.fstat(f.fileno())
+            if is_fresh(request.headers.get('if-none-match'), request.headers.get('if-modified-since'),
+                        None, stat.st_mtime):
+                await self._send(writer, request, 304)
+                return
+            await self._send(writer, request, 200, [
+                ('Content-type', mimetypes.guess_type(file_path)[0] or 'application/octet-stream'),
+                ('Content-Length', stat.st_size),
+                ('Last-Modified', formatdate(stat.st_mtime, usegmt=True)),
+            ])
+            if request.method != 'HEAD' and stat.st_size:
+                await self._loop.sendfile(writer.transport, f, 0, stat.st_size)
+
+    async def _get_image(self, request, reader, writer, cache_rel_path):
+        """Cached item images with validators and Range support (see GearCrateAPIHandler._get_image)"""
+        cache_rel_path = cache_rel_path.replace('/', os.sep)
+        image_path = os.path.abspath(os.path.join(self.cache_dir, cache_rel_path))
+        if not image_path.startswith(self.cache_dir):
+            await self._send_error(writer, request, 403, "Access denied")
+            return
+
+        try:
+            f = open(image_path, 'rb')
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            await self._send_error(writer, request, 404, f"Image not found: {cache_rel_path}")
+            return
+
+        with f:
+            # Validatoren aus stat(), ohne die Datei zu lesen
+            stat = os.fstat(f.fileno())
+            size = stat.st_size
+            etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+            last_modified = formatdate(stat.st_mtime, usegmt=True)
+
+            if is_fresh(request.headers.get('if-none-match'), request.headers.get('if-modified-since'),
+                        etag, stat.st_mtime):
+                await self._send(writer, request, 304, [
+                    ('ETag', etag),
+                    ('Last-Modified', last_modified),
+                    ('Cache-Control', 'public, max-age=31536000'),
+                    ('Access-Control-Allow-Origin', '*'),
+                ])
+                return
+
+            # Range nur, wenn If-Range (falls gesendet) noch zur Datei passt
+            byte_range = None
+            range_header = request.headers.get('range')
+            if_range = request.headers.get('if-range')
+            if range_header and (not if_range or if_range.strip() in (etag, last_modified)):
+                byte_range = parse_byte_range(range_header, size)
+                if byte_range == 'unsatisfiable':
+                    await self._send(writer, request, 416, [
+                        ('Content-Range', f'bytes */{size}'),
+                        ('Content-Length', 0),
+                    ])
+                    return
+
+            content_type = IMAGE_CONTENT_TYPES.get(os.path.splitext(image_path)[1].lower(), 'image/png')
+            if byte_range:
+                start, end = byte_range
+                status = 206
+                headers = [('Content-Range', f'bytes {start}-{end}/{size}')]
+            else:
+                start, end = 0, size - 1
+                status = 200
+                headers = []
+            count = end - start + 1
+
+            headers += [
+                ('Content-type', content_type),
+                ('Content-Length', count),
+                ('Accept-Ranges', 'bytes'),
+                ('ETag', etag),
+                ('Last-Modified', last_modified),
+                ('Cache-Control', 'public, max-age=31536000'),
+                ('Access-Control-Allow-Origin', '*'),
+            ]
+            await self._send(writer, request, status, headers)
+            # os.sendfile, wenn der Transport es kann (sonst Lese-/Schreibschleife)
+            if count > 0:
+                await self._loop.sendfile(writer.transport, f, start, count)
+
+    # ---------------------------------------------------------
+    # Server-Sent Events
+    # ---------------------------------------------------------
+
+    async def _get_events(self, request, reader, writer, _):
+        """
+        /api/events as in GearCrateAPIHandler._get_events: 'hello', then
+        'scan', 'import', 'db' and 'reset' until the client disconnects.
+        """
+        request.close = True
+        events = self.api.events
+        # Reconnect: EventSource schickt die zuletzt empfangene ID mit
+        last_id, reset = events.resume_point(request.headers.get('last-event-id'))
+
+        # Prüfen und zählen vor dem ersten await: sonst kommen gleichzeitige Streams am Limit vorbei
+        if not self._open_stream(last_id):
+            logger.warning(f"Event stream limit ({self.max_event_streams}) reached", extra={'emoji': '⚠️'})
+            body = b'Too many event streams\r\n'
+            await self._send(writer, request, 503, [
+                ('Content-Type', 'text/plain'),
+                ('Content-Length', len(body)),
+            ], body)
+            return
+
+        try:
+            await self._stream_events(request, reader, writer, last_id, reset)
+        finally:
+            with self._bridge_lock:
+                self._streams -= 1
+
+    async def _stream_events(self, request, reader, writer, last_id, reset):
+        """Body of _get_events once the stream slot is taken"""
+        events = self.api.events
+        version = await self._loop.run_in_executor(self._db_executor, self.api.db.data_version)
+
+        # Kein Content-Length: der Stream endet mit der Verbindung
+        await self._send(writer, request, 200, [
+            ('Content-Type', 'text/event-stream; charset=utf-8'),
+            ('Cache-Control', 'no-cache'),
+            ('Access-Control-Allow-Origin', '*'),
+        ])
+        chunks = [f"retry: {SSE_RETRY_MS}\n", format_event('hello', {'version': version})]
+        if reset:
+            chunks.append(format_event('reset', {}))
+
+        events.subscribe()
+        # Der Client schickt nach dem Request nichts mehr: fertig heißt getrennt
+        disconnected = asyncio.ensure_future(reader.read(1))
+        try:
+            while True:
+                if chunks:
+                    writer.write(''.join(chunks).encode('utf-8'))
+                    await writer.drain()
+                    chunks = []
+
+                # Erst registrieren, dann nachsehen: kein Event fällt dazwischen durch
+                waiter = self._loop.create_future()
+                self._stream_waiters.add(waiter)
+                result = events.wait(last_id, 0)
+                if result is None:
+                    # Server wird beendet
+                    return
+                batch, missed = result
+                if missed:
+                    chunks.append(format_event('reset', {}))
+                for event_id, name, data in batch:
+                    chunks.append(format_event(name, data, event_id))
+                    last_id = event_id
+                if chunks:
+                    self._stream_waiters.discard(waiter)
+                    continue
+
+                try:
+                    done, _ = await asyncio.wait({waiter, disconnected}, timeout=SSE_KEEPALIVE_SECONDS,
+                                                 return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    self._stream_waiters.discard(waiter)
+                if disconnected in done:
+                    return
+                if not done:
+                    chunks.append(SSE_KEEPALIVE)
+        finally:
+            disconnected.cancel()
+            events.unsubscribe()
+
+    def _open_stream(self, last_id):
+        """
+        Count a stream and make sure the bridge thread runs.
+
+        Returns:
+            False if max_event_streams streams are already open (nothing counted)
+        """
+        with self._bridge_lock:
+            if self._streams >= self.max_event_streams:
+                return False
+            self._streams += 1
+            if self._bridge is None:
+                self._bridge = threading.Thread(target=self._run_bridge, args=(last_id,),
+                                                name='async-events', daemon=True)
+                self._bridge.start()
+        return True
+
+    def _run_bridge(self, last_id):
+        """Wait on the EventBus (blocking) and wake the streams on the loop"""
+        events = self.api.events
+        while True:
+            with self._bridge_lock:
+                if self._streams <= 0:
+                    self._bridge = None
+                    return
+            result = events.wait(last_id, SSE_CLIENT_CHECK_SECONDS)
+            closed = result is None
+            if not closed and not result[0]:
+                continue
+            if not closed:
+                last_id = result[0][-1][0]
+            try:
+                self._loop.call_soon_threadsafe(self._wake_streams)
+            except RuntimeError:
+                # Loop bereits beendet
+                closed = True
+            if closed:
+                # Bus geschlossen: die Streams sehen das beim nächsten wait()
+                with self._bridge_lock:
+                    self._bridge = None
+                return
+
+    def _wake_streams(self):
+        waiters, self._stream_waiters = self._stream_waiters, set()
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    # ---------------------------------------------------------
+    # POST: API-Methoden
+    # ---------------------------------------------------------
+
+    async def _do_post(self, request, writer):
+        if not request.path.startswith('/api/'):
+            await self._send_error(writer, request, 404)
+            return
+
+        method = request.path[len('/api/'):]
+        try:
+            data = json.loads(request.body.decode('utf-8'))
+            # /api/batch akzeptiert auch ein nacktes Array von {method, args}
+            if method == 'batch' and isinstance(data, list):
+                data = {'calls': data}
+            api_method = self._post_methods.get(method)
+            if api_method is None:
+                logger.warning(f"API method not found: {method}", extra={'emoji': '❌'})
+                await self._send_error(writer, request, 404, f"API method {method} not found")
+                return
+            call = functools.partial(api_method, **data)
+        except Exception as e:
+            logger.error(f"API POST Error: {e}", exc_info=True, extra={'emoji': '❌'})
+            await self._send_error(writer, request, 500, str(e))
+            return
+
+        # Ein Batch mit Scraping/Import gehört ebenfalls auf den Netzwerk-Executor
+        long_running = method in LONG_RUNNING_API_METHODS or (method == 'batch' and is_long_running_batch(data))
+        executor = self._network_executor if long_running else self._db_executor
+        await self._send_api_result(writer, request, method, call, executor)
@@ -18,8 +18,12 @@ if src_dir not in sys.path:
 
 from database.models import Database
 from database.operations import ItemOperations
+from database.history import InventoryHistory
+from database.search_index import ItemSearchIndex, clamp_limit, SEARCH_DEFAULT_LIMIT
+from api.events import EventBus, DatabaseChangeSource, ScanProgressSource
 from scraper.cstone import CStoneScraper
 from cache.image_cache import ImageCache
+from cache.image_urls import absolute_image_path, path_to_url
 from cache.gear_sets import GearSetsManager
 from utils.logger import setup_logger
 from utils.exceptions import DatabaseError, ConfigError, CacheError, ScraperError
@@ -28,6 +32,27 @@ from utils.exceptions import DatabaseError, ConfigError, CacheError, ScraperErro
 logger = setup_logger(__name__)
 #
 
+# Max. Anzahl Aufrufe pro batch()-Request
+MAX_BATCH_CALLS = 1000
+
+# Öffentliche Methoden, die nicht per HTTP / batch aufgerufen werden dürfen
+NON_API_METHODS = frozenset({'close'})
+
+# Methoden mit Netzwerkzugriff (CStone-Scraping, Bild-Download): nicht in einem
+# Batch mit transaction=True, der sonst während der Requests die Schreibsperre hält
+NETWORK_API_METHODS = frozenset({'add_item', 'import_scanned_items', 'search_items_cstone', 'get_category_items'})
+
+# InvDetect-Scanner (eigener Prozess, kommuniziert über Dateien)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+INVDETECT_PATH = os.path.join(PROJECT_ROOT, 'InvDetect')
+SCAN_PROGRESS_FILE = os.path.join(INVDETECT_PATH, 'scan_progress.json')
+
+
+class _BatchRollback(Exception):
+    """Aborts the shared transaction of a batch after a failed call"""
+    pass
+
+
 class API:
     # Class-level variable to store webview window reference
     _webview_window = None
@@ -36,13 +61,29 @@ class API:
         """Initialize API with database, scraper, and cache"""
         self.db = Database()
         self.operations = ItemOperations(self.db)
+        self.history = InventoryHistory(self.db)
+        # Fuzzy-Suche (/api/search): Index beim Start aufbauen, danach nur Deltas
+        self.search_index = ItemSearchIndex(self.operations)
+        self.search_index.refresh()
         self.config_file = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'user_config.json')
         self.scraper = CStoneScraper()
         self.cache = ImageCache()
+        # image_path -> URL, gültig solange sich cache.generation nicht ändert
+        self._image_urls = (self.cache.generation, {})
         self.gear_sets = GearSetsManager()
         self.current_scan_mode = 1  # Default to 1x1
         self.current_scan_resolution = "1920x1080" # Default resolution
 
+        # Live-Updates für /api/events (Scan, Import, DB-Änderungen)
+        self.events = EventBus()
+        self.events.add_source(DatabaseChangeSource(self.db))
+        self.events.add_source(ScanProgressSource(SCAN_PROGRESS_FILE))
+
+    def close(self):
+        """End open event streams and close the database connections"""
+        self.events.close()
+        self.db.close()
+
     @classmethod
     def set_webview_window(cls, window):
         """Store reference to webview window for DevTools access"""
@@ -106,76 +147,96 @@ class API:
         Converts an absolute cache path (containing category subfolders)
         to a relative URL path usable by the browser server (starting with /images/).
         Returns None if the file doesn't exist (so frontend can show placeholder).
+        
+        Memoized per image_path; the memo is dropped whenever the image cache
+        writes or removes files (ImageCache.generation).
         """
         if not path:
             return None
 
-        # 1. Normalisieren des Pfadtrenners für URL
-        normalized_path = path.replace('\\', '/')
-
-        # 2. Bestimme den absoluten Dateipfad für Existenzprüfung
-        absolute_path = None
-        if os.path.isabs(path):
-            # Ist bereits ein absoluter Pfad
-            absolute_path = path
-        else:
-            # Relativer Pfad - versuche ihn zu konstruieren
-            # Annahme: Relativer Pfad ist relativ zum Projektroot
-            project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            absolute_path = os.path.join(project_root, path)
-
-        # 3. Prüfe ob Datei existiert
-        if absolute_path and not os.path.exists(absolute_path):
+        generation, urls = self._image_urls
+        if generation != self.cache.generation:
+            # Generation vor dem Auflösen lesen: spätere Änderungen invalidieren erneut
+            generation = self.cache.generation
+            urls = {}
+            self._image_urls = (generation, urls)
+        try:
+            return urls[path]
+        except KeyError:
+            pass
+        url = self._resolve_image_url(path)
+        urls[path] = url
+        return url
+
+    def _resolve_image_url(self, path):
+        """Uncached _path_to_url: existence from the cache manifest, then URL mapping"""
+        # Manifest des Bild-Caches statt stat() pro Item
+        if not self.cache.has_file(absolute_image_path(path)):
             # Datei existiert nicht -> None zurückgeben für Placeholder
             return None
+        return path_to_url(path)
 
-        # 4. Versuche verschiedene Muster zu finden und zu ersetzen
-        # Pattern 1: data/cache/images/ -> /cache/
-        if 'data/cache/images/' in normalized_path:
-            parts = normalized_path.split('data/cache/images/')
-            if len(parts) > 1:
-                return f"/cache/{parts[1]}"
-
-        # Pattern 2: data/images/ -> /images/
-        if 'data/images/' in normalized_path:
-            parts = normalized_path.split('data/images/')
-            if len(parts) > 1:
-                return f"/images/{parts[1]}"
-
-        # Pattern 3: Wenn es ein absoluter Pfad ist, extrahiere alles nach 'data/'
-        if '/data/' in normalized_path or 'data/' in normalized_path:
-            # Finde den Index von 'data/' und nimm alles danach
-            data_index = normalized_path.find('data/')
-            if data_index != -1:
-                relative_part = normalized_path[data_index + 5:]  # Skip 'data/'
-                return f"/images/{relative_part}"
-
-        # Fallback: Wenn der Pfad mit /images/ oder /cache/ beginnt, behalte ihn
-        if normalized_path.startswith('/images/') or normalized_path.startswith('/cache/'):
-            return normalized_path
-
-        # Letzter Fallback
-        return normalized_path
-
-    def search_items_local(self, query):
+    def search_items_local(self, query, projection='search'):
         """
         Search items in local database (for the Search Tab).
         CRITICAL: This must return ALL items (count >= 0) to allow searching for items not yet in inventory.
+        
+        Args:
+            projection: Columns per item (ITEM_PROJECTIONS); details via get_item
         """
         # Wir verwenden search_items mit include_zero_count=True (Standard in operations.py)
         if not query:
-            items = self.operations.get_all_items(include_zero_count=True)
+            items = self.operations.get_all_items(include_zero_count=True, projection=projection)
         else:
-            items = self.operations.search_items(query, include_zero_count=True)
+            items = self.operations.search_items(query, include_zero_count=True, projection=projection)
+
+        return self._prepare_list_items(items)
 
-        # Daten für Frontend aufbereiten
+    def search(self, q='', limit=SEARCH_DEFAULT_LIMIT):
+        """
+        Ranked, typo-tolerant search over item names (/api/search?q=&limit=).
+        Word order does not matter; includes items with count 0.
+        limit is clamped to 1..SEARCH_MAX_LIMIT.
+        
+        Returns:
+            {'success': True, 'items': [...], 'total': int, 'limit': int} - best
+            match first, items in the search_items_local format plus 'score'
+        """
+        try:
+            limit = clamp_limit(limit)
+        except (TypeError, ValueError):
+            return {'success': False, 'error': f"Invalid limit: {limit!r}"}
+        try:
+            items, total = self.search_index.search(q or '', limit)
+        except sqlite3.Error as e:
+            logger.error(f"Database error updating search index: {e}", extra={'emoji': '❌'})
+            return {'success': False, 'error': str(e)}
+        return {'success': True, 'items': self._prepare_list_items(items), 'total': total, 'limit': limit}
+
+    def get_item_changes(self, since=0, sync_id=None, projection='search'):
+        """
+        Delta sync for the frontend's search catalog (/api/items/changes)
+        
+        Returns:
+            {'success': True, 'sync_id': str, 'version': int, 'full': bool,
+             'items': [...], 'deleted': [names]} - items in the search_items_local format
+        """
+        try:
+            changes = self.operations.get_changes(since or 0, sync_id, projection)
+        except sqlite3.Error as e:
+            logger.error(f"Database error reading item changes: {e}", extra={'emoji': '❌'})
+            return {'success': False, 'error': str(e)}
+        self._prepare_list_items(changes['items'])
+        return {'success': True, **changes}
+
+    @staticmethod
+    def _prepare_list_items(items):
+        """Frontend fields of list rows (icon_url kommt aus der Projektion, siehe ITEM_PROJECTIONS)"""
         for item in items:
             item['is_favorite'] = bool(item.get('is_favorite', 0))
-            if item.get('image_path'):
-                item['icon_url'] = self._path_to_url(item['image_path'])
-            else:
-                item['icon_url'] = item.get('image_url')
-
+            # 'full': Items ohne lokales Bild zeigen die CStone-URL auch als Thumbnail
+            if 'thumb_url' in item and not item.get('image_path'):
+                item['thumb_url'] = item.get('image_url')
         return items
 
     def search_items_cstone(self, query):
@@ -230,26 +291,20 @@ class API:
                 except (IOError, OSError) as e:
                     logger.error(f"File error saving image for {name}: {e}", extra={'emoji': '❌'})
 
-        # 3. In DB speichern (ohne properties_json wenn die Spalte nicht existiert)
-        try:
-            result = self.operations.add_item(name, item_type, image_url, image_path, notes, initial_count, properties_json)
-        except sqlite3.OperationalError as e:
-            # Falls properties_json Spalte nicht existiert, versuche ohne
-            if 'properties_json' in str(e):
-                logger.warning(f"properties_json column not found, retrying without it", extra={'emoji': '⚠️'})
-                result = self.operations.add_item(name, item_type, image_url, image_path, notes, initial_count)
-            else:
-                logger.error(f"Database operation error: {e}", extra={'emoji': '❌'})
-                raise DatabaseError(f"Failed to add item: {e}") from e
-        except sqlite3.IntegrityError as e:
-            logger.error(f"Item '{name}' already exists", extra={'emoji': '❌'})
-            raise DatabaseError(f"Item already exists: {name}") from e
+        # 3. In DB speichern
+        result = self.operations.add_item(name, item_type, image_url, image_path, notes, initial_count, properties_json)
+        if not result.get('success'):
+            logger.error(f"Database operation error adding '{name}': {result.get('error')}", extra={'emoji': '❌'})
+        else:
+            self.history.maybe_snapshot()
 
         return result
 
     def update_item_count(self, name, count):
         """Update the count of an existing item"""
-        return self.operations.update_item_count(name, count)
+        result = self.operations.update_item_count(name, count)
+        self.history.maybe_snapshot()
+        return result
         
     def update_count(self, name, count):
         """Alias for update_item_count (used by some frontend quick actions)"""
@@ -273,11 +328,9 @@ class API:
         if item:
             item['is_favorite'] = bool(item.get('is_favorite', 0))
             if item.get('image_path'):
-                # URLs für verschiedene Zwecke setzen
-                url = self._path_to_url(item['image_path'])
-                item['full_image_url'] = url
-                item['icon_url'] = url
-                item['thumb_url'] = url
+                # thumb_url/medium_url/full_url kommen aus der Zeile
+                item['full_image_url'] = item['full_url']
+                item['icon_url'] = item['full_url']
             else:
                 url = item.get('image_url')
                 item['full_image_url'] = url
@@ -299,13 +352,8 @@ class API:
         
     def get_stats(self):
         """Get general stats"""
-        # include_zero_count=True um alle Items in DB zu zählen
-        all_items_db = self.operations.get_all_items(include_zero_count=True)
-        all_items_inventory = self.operations.get_all_items(include_zero_count=False)
-        
-        total_count = sum(item['count'] for item in all_items_inventory)
-        unique_items = len(all_items_inventory)
-        total_db = len(all_items_db)
+        # Summen aus der item_stats-Tabelle (von Triggern aktuell gehalten)
+        totals = self.operations.get_inventory_totals()
         
         # Cache size berechnen
         cache_size = 0
@@ -316,9 +364,9 @@ class API:
                     cache_size += os.path.getsize(os.path.join(root, f))
         
         return {
-            'total_items_in_db': total_db,
-            'inventory_unique_items': unique_items,
-            'total_item_count': total_count,
+            'total_items_in_db': totals['total_items_in_db'],
+            'inventory_unique_items': totals['inventory_unique_items'],
+            'total_item_count': totals['total_item_count'],
             'cache_size_mb': round(cache_size / (1024 * 1024), 2),
             'category_counts': self.operations.get_category_stats()
         }
@@ -327,80 +375,83 @@ class API:
         """
         Set all item counts to 0 (empty inventory but keep items in database).
         """
-        return self.operations.clear_inventory()
+        result = self.operations.clear_inventory()
+        self.history.maybe_snapshot()
+        return result
+
+    # =========================================================
+    # INVENTAR-HISTORIE (Event-Log, Snapshots, Wiederherstellung)
+    # =========================================================
+
+    def get_inventory_history(self, limit=100):
+        """Recent count changes and available snapshots"""
+        try:
+            return {'success': True, **self.history.get_history(limit)}
+        except Exception as e:
+            logger.error(f"Error loading inventory history: {e}", extra={'emoji': '❌'})
+            return {'success': False, 'error': str(e)}
+
+    def create_inventory_snapshot(self):
+        """Store a snapshot of the current inventory counts"""
+        return self.history.create_snapshot()
+
+    def restore_inventory(self, timestamp):
+        """
+        Restore all item counts to their values at `timestamp` (ISO format,
+        local time), e.g. to undo a bad scan import or clear_inventory.
+        """
+        result = self.history.restore(timestamp)
+        if result['success']:
+            self.history.maybe_snapshot()
+        return result
 
     def clear_cache(self):
         """Clear the image cache"""
-        return self.cache.clear_cache()
+        result = self.cache.clear_cache()
+        self._refresh_image_urls()
+        return result
+
+    def _refresh_image_urls(self):
+        """Recompute the stored image URLs after files were removed from the cache"""
+        try:
+            changed = self.operations.refresh_image_urls(self.cache.has_file)
+            if changed:
+                logger.info(f"Updated image URLs of {changed} items", extra={'emoji': '🖼️'})
+        except sqlite3.Error as e:
+            logger.error(f"Database error updating image URLs: {e}", extra={'emoji': '❌'})
 
     # =========================================================
     # HAUPTFUNKTIONEN FÜR INVENTAR & FAVORITEN
     # =========================================================
 
-    def inventory(self, sort_by='name', sort_order='asc', query='', category=None, is_favorite=None):
+    def inventory(self, sort_by='name', sort_order='asc', query='', category=None, is_favorite=None,
+                  limit=None, offset=0, projection='grid'):
         """
         Retrieves the filtered and sorted inventory list.
         Handler für /api/get_inventory_items
         CRITICAL: This must only show items with count > 0.
-        """
         
-        # 1. Daten aus DB holen (wir verwenden IMMER include_zero_count=False für Inventar-Ansichten)
+        Filter, Sortierung und Pagination laufen komplett in SQL.
+        projection: Columns per item (ITEM_PROJECTIONS); details via get_item
+        Returns: {'items': [...], 'total': int, 'limit': int|None, 'offset': int}
+        """
         filter_favorite = 1 if str(is_favorite).lower() in ('1', 'true') else None
-        
-        if query:
-            # Suche INNERHALB des Inventars (Count > 0)
-            items = self.operations.search_items(query, include_zero_count=False)
-        else:
-            # Normale Listenansicht (Count > 0, optional Favorite Filter)
-            items = self.operations.get_all_items(is_favorite=filter_favorite, include_zero_count=False)
-
-        # 2. Kategorie-Filter anwenden (wenn nicht Favorites, da das schon oben passiert ist)
-        if category and category != 'Favorites' and category != '':
-             items = [item for item in items if item.get('item_type') == category]
 
-        # 3. Daten aufbereiten (URLs & is_favorite Boolean)
-        processed_items = []
-        for item in items:
-            # Das manuelle Count-Filter ist jetzt überflüssig, da die DB-Abfrage dies übernimmt!
-            
-            # Konvertiere für JSON
-            item_dict = dict(item)
-            item_dict['is_favorite'] = bool(item_dict.get('is_favorite', 0))
-            
-            if item_dict.get('image_path'):
-                item_dict['thumb_url'] = self._path_to_url(item_dict['image_path'])
-                item_dict['icon_url'] = item_dict['thumb_url']
-            else:
-                item_dict['thumb_url'] = item_dict.get('image_url')
-                item_dict['icon_url'] = item_dict.get('image_url')
-                
-            processed_items.append(item_dict)
+        items, total = self.operations.get_inventory_page(
+            category=category or None,
+            is_favorite=filter_favorite,
+            query=query,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            limit=limit,
+            offset=offset,
+            projection=projection
+        )
 
-        # 4. Sortierung (Python-seitig, da wir hier flexibler sind)
-        reverse_sort = (sort_order.lower() == 'desc')
-        
-        def sort_key(x):
-            key = sort_by
-            # FIX: Mapping von 'date' auf die korrekte DB-Spalte
-            if key == 'date':
-                key = 'added_to_inventory_at'
-            
-            val = x.get(key)
-            if val is None:
-                # Leere Werte (z.B. wenn added_to_inventory_at noch NULL ist) am Ende sortieren
-                return ''
-            if isinstance(val, str):
-                return val.lower()
-            return val
+        # Daten aufbereiten (is_favorite Boolean)
+        self._prepare_list_items(items)
 
-        try:
-            processed_items.sort(key=sort_key, reverse=reverse_sort)
-        except (TypeError, KeyError, AttributeError):
-            # Fallback auf Name, falls Sortierung fehlschlägt
-            logger.warning(f"Sort failed on column '{sort_by}', falling back to name sort", extra={'emoji': '⚠️'})
-            processed_items.sort(key=lambda x: x.get('name', '').lower(), reverse=reverse_sort)
-            
-        return processed_items
+        return {'items': items, 'total': total, 'limit': limit, 'offset': offset}
 
     def toggle_favorite(self, name, is_favorite):
         """
@@ -418,6 +469,82 @@ class API:
             logger.error(f"Database error toggling favorite for '{name}': {e}", extra={'emoji': '❌'})
             return {'success': False, 'error': str(e)}
 
+    # =========================================================
+    # BATCH (mehrere Aufrufe in einem Request)
+    # =========================================================
+
+    def batch(self, calls, transaction=False):
+        """
+        Run several API calls in one request.
+        calls: [{'method': 'toggle_favorite', 'args': {'name': ..., 'is_favorite': True}}, ...]
+               (args may also be a list of positional arguments)
+        transaction: run all calls in one database transaction; if any call
+                     fails (exception or 'success': False) none of the database
+                     writes are kept. Reads inside it see the state before the batch.
+                     Methods in NETWORK_API_METHODS are rejected here (nothing runs).
+        
+        Returns:
+            {'success': bool, 'results': [...], 'rolled_back': bool}
+            results are in call order; a call that could not run is
+            {'success': False, 'error': str}
+        """
+        if not isinstance(calls, list):
+            return {'success': False, 'error': 'calls must be a list'}
+        if len(calls) > MAX_BATCH_CALLS:
+            return {'success': False, 'error': f'Too many calls in batch (max {MAX_BATCH_CALLS})'}
+
+        if not transaction:
+            results = [self._run_batch_call(call) for call in calls]
+            return {'success': not any(self._batch_call_failed(r) for r in results),
+                    'results': results, 'rolled_back': False}
+
+        # Scraping unter der Schreibsperre würde alle anderen Schreiber blockieren
+        network_calls = sorted({call.get('method') for call in calls
+                                if isinstance(call, dict) and call.get('method') in NETWORK_API_METHODS})
+        if network_calls:
+            return {'success': False, 'results': [], 'rolled_back': False,
+                    'error': f"Methods with network access cannot run in a transaction: {', '.join(network_calls)}"}
+
+        results = []
+        try:
+            # Verschachtelte writer()-Blöcke der Einzelaufrufe laufen in dieser Transaktion
+            with self.db.writer():
+                for call in calls:
+                    result = self._run_batch_call(call)
+                    results.append(result)
+                    if self._batch_call_failed(result):
+                        raise _BatchRollback()
+        except _BatchRollback:
+            logger.warning(f"Batch rolled back after call {len(results)} of {len(calls)}", extra={'emoji': '⚠️'})
+            return {'success': False, 'results': results, 'rolled_back': True}
+        return {'success': True, 'results': results, 'rolled_back': False}
+
+    @staticmethod
+    def _batch_call_failed(result):
+        return isinstance(result, dict) and result.get('success') is False
+
+    def _run_batch_call(self, call):
+        """Execute one {'method', 'args'} entry of a batch"""
+        if not isinstance(call, dict):
+            return {'success': False, 'error': 'Batch call must be an object'}
+        method = call.get('method')
+        if not isinstance(method, str) or method.startswith('_') or method == 'batch' or method in NON_API_METHODS:
+            return {'success': False, 'error': f'Invalid API method: {method!r}'}
+        func = getattr(self, method, None)
+        if not callable(func):
+            return {'success': False, 'error': f'API method {method} not found'}
+
+        args = call.get('args') or {}
+        try:
+            if isinstance(args, dict):
+                return func(**args)
+            if isinstance(args, list):
+                return func(*args)
+            return {'success': False, 'error': 'args must be an object or a list'}
+        except Exception as e:
+            logger.error(f"Batch call {method} failed: {e}", extra={'emoji': '❌'})
+            return {'success': False, 'error': str(e)}
+
     # =========================================================
     # GEAR SETS FUNKTIONEN
     # =========================================================
@@ -428,7 +555,7 @@ class API:
         Jedes Set enthält: Name, Anzahl Varianten, Beispiel-Varianten
         """
         try:
-            summary = self.gear_sets.get_all_sets_summary(self.db.conn)
+            summary = self.gear_sets.get_all_sets_summary(self.db.reader())
             return {'success': True, 'sets': summary}
         except sqlite3.Error as e:
             logger.error(f"Database error getting gear sets: {e}", extra={'emoji': '❌'})
@@ -440,7 +567,7 @@ class API:
         Enthält alle 4 Teile mit Bildern und Inventar-Status.
         """
         try:
-            pieces = self.gear_sets.get_set_pieces(self.db.conn, set_name, variant)
+            pieces = self.gear_sets.get_set_pieces(self.db.reader(), set_name, variant)
             
             if not pieces:
                 return {'success': False, 'error': 'Set nicht gefunden'}
@@ -503,7 +630,7 @@ class API:
         Gibt alle Farbvarianten eines Sets zurück.
         """
         try:
-            variants = self.gear_sets.get_set_variants(self.db.conn, set_name)
+            variants = self.gear_sets.get_set_variants(self.db.reader(), set_name)
             return {'success': True, 'variants': variants}
         except sqlite3.Error as e:
             logger.error(f"Database error getting gear set variants for '{set_name}': {e}", extra={'emoji': '❌'})
@@ -562,7 +689,7 @@ class API:
             import sys
 
             # Path to InvDetect scanner
-            invdetect_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'InvDetect')
+            invdetect_path = INVDETECT_PATH
             scanner_script = os.path.join(invdetect_path, 'main.py')
 
             if not os.path.exists(scanner_script):
@@ -588,6 +715,13 @@ class API:
             except (IOError, OSError, PermissionError) as e:
                 logger.warning(f'Could not clear not_detected.md: {e}', extra={'emoji': '⚠️'})
 
+            # Fortschritt des letzten Scans verwerfen
+            try:
+                if os.path.exists(SCAN_PROGRESS_FILE):
+                    os.remove(SCAN_PROGRESS_FILE)
+            except OSError as e:
+                logger.warning(f'Could not remove scan progress file: {e}', extra={'emoji': '⚠️'})
+
             # Get current scan mode (default to 1 if not set)
             scan_mode = getattr(self, 'current_scan_mode', 1)
             scan_resolution = getattr(self, 'current_scan_resolution', "1920x1080")
@@ -604,6 +738,7 @@ class API:
             )
 
             logger.info(f"Scanner started in new console with mode {scan_mode} and resolution {scan_resolution}", extra={'emoji': '✅'})
+            self.events.publish('scan', {'state': 'started', 'mode': scan_mode})
             return {'success': True}
         except FileNotFoundError as e:
             logger.error(f"Scanner script not found: {e}", extra={'emoji': '❌'})
@@ -619,7 +754,7 @@ class API:
         """
         try:
             # Path to InvDetect files
-            invdetect_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'InvDetect')
+            invdetect_path = INVDETECT_PATH
 
             output_file = os.path.join(invdetect_path, 'detected_items.txt')
             not_detected_file = os.path.join(invdetect_path, 'not_detected.md')
@@ -709,9 +844,14 @@ class API:
         """
         Imports scanned items into inventory
         items: [{'name': str, 'count': int}, ...]
+        
+        Items already in the DB (and new items without CStone details) are
+        written in one batch via add_items_bulk; only new items with details
+        go through add_item for the image download.
         """
         try:
             results = []
+            scanned = []
 
             for item_data in items:
                 name = item_data.get('name')
@@ -723,52 +863,80 @@ class API:
 
                 # Clean up name: strip whitespace and normalize multiple spaces
                 name = ' '.join(name.strip().split())
+                scanned.append((len(results), name, count))
+                results.append(None)
+
+            existing = self.operations.get_existing_names([name for _, name, _ in scanned])
+            bulk = []
+            no_details = set()
+            total = len(results)
+            self.events.publish('import', {'phase': 'started', 'total': total})
+
+            for done, (index, name, count) in enumerate(scanned, 1):
+                if name in existing:
+                    # Count erhöhen (UPSERT addiert den gescannten Count)
+                    bulk.append((index, {'name': name, 'initial_count': count}))
+                    continue
 
                 try:
-                    # Try to get item from database
-                    existing_item = self.operations.get_item_by_name(name)
-
-                    if existing_item:
-                        # Update count
-                        new_count = existing_item.get('count', 0) + count
-                        self.operations.update_item_count(name, new_count)
-                        results.append({'success': True, 'name': name, 'action': 'updated', 'count': new_count})
+                    # Item not in DB - try to scrape details
+                    details = self.scraper.get_item_details(name)
+
+                    if details:
+                        # Add item with scraped details
+                        self.add_item(
+                            name=name,
+                            item_type=details.get('item_type'),
+                            image_url=details.get('image_url'),
+                            notes='Imported from InvDetect scan',
+                            initial_count=count
+                        )
+                        results[index] = {'success': True, 'name': name, 'action': 'added', 'count': count}
+                        self.events.publish('import', {'phase': 'item', 'done': done, 'total': total, 'name': name})
                     else:
-                        # Item not in DB - try to scrape details
-                        details = self.scraper.get_item_details(name)
-
-                        if details:
-                            # Add item with scraped details
-                            self.add_item(
-                                name=name,
-                                item_type=details.get('item_type'),
-                                image_url=details.get('image_url'),
-                                notes='Imported from InvDetect scan',
-                                initial_count=count
-                            )
-                            results.append({'success': True, 'name': name, 'action': 'added', 'count': count})
-                        else:
-                            # Add item without details
-                            self.operations.add_item(
-                                name=name,
-                                item_type='Unknown',
-                                image_url=None,
-                                image_path=None,
-                                notes='Imported from InvDetect scan (no details found)',
-                                initial_count=count
-                            )
-                            results.append({'success': True, 'name': name, 'action': 'added', 'count': count, 'warning': 'No details found'})
+                        # Add item without details
+                        no_details.add(index)
+                        bulk.append((index, {
+                            'name': name,
+                            'item_type': 'Unknown',
+                            'notes': 'Imported from InvDetect scan (no details found)',
+                            'initial_count': count
+                        }))
+                    # Weitere Vorkommen desselben Namens nur noch hochzählen
+                    existing.add(name)
 
                 except sqlite3.Error as item_error:
                     logger.error(f"Database error importing item '{name}': {item_error}", extra={'emoji': '❌'})
-                    results.append({'success': False, 'name': name, 'error': str(item_error)})
+                    results[index] = {'success': False, 'name': name, 'error': str(item_error)}
                 except requests.RequestException as item_error:
                     logger.error(f"Network error scraping details for '{name}': {item_error}", extra={'emoji': '❌'})
-                    results.append({'success': False, 'name': name, 'error': str(item_error)})
+                    results[index] = {'success': False, 'name': name, 'error': str(item_error)}
+
+            bulk_result = self.operations.add_items_bulk(item for _, item in bulk)
+
+            for (index, item), outcome in zip(bulk, bulk_result['results']):
+                if outcome['action'] == 'failed':
+                    logger.error(f"Database error importing item '{item['name']}': {outcome['error']}", extra={'emoji': '❌'})
+                    results[index] = {'success': False, 'name': item['name'], 'error': outcome['error']}
+                    continue
 
+                result = {'success': True, 'name': item['name'], 'action': outcome['action']}
+                if outcome['action'] == 'added':
+                    result['count'] = item['initial_count']
+                if index in no_details:
+                    result['warning'] = 'No details found'
+                results[index] = result
+
+            self.history.maybe_snapshot()
+            self.events.publish('import', {
+                'phase': 'finished',
+                'total': total,
+                'imported': sum(1 for result in results if result['success']),
+            })
             return {'success': True, 'results': results}
         except (ValueError, TypeError) as e:
             logger.error(f"Invalid data in import_scanned_items: {e}", extra={'emoji': '❌'})
+            self.events.publish('import', {'phase': 'failed', 'error': str(e)})
             return {'success': False, 'error': str(e)}
 
     # =========================================================
@@ -923,7 +1091,9 @@ class API:
         Returns: {'removed_count': int, 'freed_mb': float, 'errors': list}
         """
         try:
-            result = self.cache.cleanup_orphaned_images(self.db.conn)
+            result = self.cache.cleanup_orphaned_images(self.db.reader())
+            if result['removed_count']:
+                self._refresh_image_urls()
             logger.info(f"Cleaned up {result['removed_count']} orphaned images, freed {result['freed_mb']} MB", extra={'emoji': '✅'})
             return {'success': True, 'result': result}
         except (IOError, OSError, PermissionError) as e:
@@ -941,6 +1111,8 @@ class API:
         """
         try:
             result = self.cache.cleanup_old_images(max_age_days)
+            if result['removed_count']:
+                self._refresh_image_urls()
             logger.info(f"Cleaned up {result['removed_count']} old images (>{max_age_days} days), freed {result['freed_mb']} MB", extra={'emoji': '✅'})
             return {'success': True, 'result': result}
         except (IOError, OSError, PermissionError) as e:
@@ -955,6 +1127,8 @@ class API:
         """
         try:
             result = self.cache.cleanup_by_size(max_size_mb)
+            if result['removed_count']:
+                self._refresh_image_urls()
             logger.info(f"Cleaned up cache to max {max_size_mb} MB: removed {result['removed_count']} images, freed {result['freed_mb']} MB", extra={'emoji': '✅'})
             return {'success': True, 'result': result}
         except (IOError, OSError, PermissionError) as e:
@@ -0,0 +1,158 @@
+"""
+HTTP response compression (gzip, brotli if installed)
+
+JSON responses are compressed per request when they exceed
+COMPRESSION_MIN_BYTES; static JS/CSS/HTML under web/ is compressed once at
+startup by StaticAssetCache and served from memory.
+"""
+import gzip
+import mimetypes
+import os
+from email.utils import formatdate
+
+from utils.logger import setup_logger
+
+try:
+    import brotli
+except ImportError:
+    # Optional: pip install brotli
+    brotli = None
+
+logger = setup_logger(__name__)
+
+# Kleinere Antworten lohnen den Header-/CPU-Aufwand nicht
+COMPRESSION_MIN_BYTES = 1024
+
+# Dateitypen unter web/, die vorkomprimiert werden
+COMPRESSIBLE_EXTENSIONS = frozenset({'.js', '.css', '.html', '.json', '.svg', '.txt'})
+
+# Bevorzugte Reihenfolge, falls der Client beide gleich gewichtet
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+# Dynamische Antworten: schnelle Stufen; statische Dateien: einmalig maximale Stufe
+_DYNAMIC_LEVELS = {'gzip': 5, 'br': 5}
+_STATIC_LEVELS = {'gzip': 9, 'br': 11}
+
+
+def choose_encoding(accept_encoding):
+    """
+    Pick the best supported content coding from an Accept-Encoding header.
+
+    Returns:
+        'br', 'gzip' or None (identity)
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        quality = weights.get(coding, weights.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(data, encoding, static=False):
+    """Compress bytes with 'gzip' or 'br'"""
+    levels = _STATIC_LEVELS if static else _DYNAMIC_LEVELS
+    if encoding == 'br':
+        return brotli.compress(data, quality=levels['br'])
+    # mtime=0: gleiche Eingabe -> gleiche Bytes (starke ETags bleiben gültig)
+    return gzip.compress(data, compresslevel=levels['gzip'], mtime=0)
+
+
+class StaticAsset:
+    """One precompressed file: encoded bodies plus the stat data they were built from"""
+    __slots__ = ('path', 'mtime', 'size', 'content_type', 'last_modified', 'bodies')
+
+    def __init__(self, path, mtime, size, content_type, bodies):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.content_type = content_type
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.bodies = bodies
+
+
+class StaticAssetCache:
+    """
+    Compressed copies of the compressible files below a directory, built once.
+    A file that changed on disk since then is recompressed on first request.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self._assets = {}
+
+    def precompress(self):
+        """Compress every eligible file below root; returns the number of files"""
+        saved = 0
+        for directory, _, files in os.walk(self.root):
+            for filename in files:
+                asset = self._build(os.path.join(directory, filename))
+                if asset is not None:
+                    self._assets[asset.path] = asset
+                    saved += asset.size - min(len(body) for body in asset.bodies.values())
+        logger.info(
+            f"Precompressed {len(self._assets)} static files ({', '.join(SUPPORTED_ENCODINGS)}, "
+            f"{saved // 1024} KB saved per full load)",
+            extra={'emoji': '🗜️'}
+        )
+        return len(self._assets)
+
+    def _build(self, path):
+        if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return None
+        try:
+            stat = os.stat(path)
+            if stat.st_size < COMPRESSION_MIN_BYTES:
+                return None
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        bodies = {encoding: compress(data, encoding, static=True) for encoding in SUPPORTED_ENCODINGS}
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+            content_type += '; charset=utf-8'
+        return StaticAsset(path, stat.st_mtime, stat.st_size, content_type, bodies)
+
+    def get(self, path, encoding):
+        """
+        Compressed body for an absolute file path, or None if the file is not
+        cached (not compressible, too small, unknown) or encoding is None.
+        """
+        if encoding is None:
+            return None
+        asset = self._assets.get(path)
+        if asset is None:
+            return None
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if stat.st_mtime != asset.mtime or stat.st_size != asset.size:
+            # Datei wurde geändert (Entwicklung): neu komprimieren
+            asset = self._build(path)
+            if asset is None:
+                self._assets.pop(path, None)
+                return None
+            self._assets[path] = asset
+
+        body = asset.bodies.get(encoding)
+        return (asset, body) if body is not None else None
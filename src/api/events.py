@@ -0,0 +1,249 @@
+"""
+Server-Sent Events: scan progress, import progress and database changes
+
+EventBus keeps the most recent events in a ring buffer with increasing ids.
+Every /api/events connection waits on the bus and sends what is newer than
+the last id it delivered, so a reconnecting EventSource (Last-Event-ID)
+gets the events it missed. Event sources that have to be polled (scanner
+progress file, commits from other processes) are only checked while at
+least one client is connected.
+"""
+import json
+import os
+import sqlite3
+import threading
+from collections import deque
+
+from api import serialization
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Anzahl Events, die für Reconnects vorgehalten werden
+EVENT_HISTORY = 256
+
+# Abstand, in dem Scanner-Datei und Datenversion geprüft werden (Sekunden)
+POLL_INTERVAL = 0.5
+
+# Maximal mitgeschickte Count-Änderungen pro 'db'-Event (sonst truncated)
+MAX_CHANGES_PER_EVENT = 500
+
+# Stream: Kommentarzeile nach so vielen Sekunden Stille (hält Proxys/Browser
+# bei Laune), Prüfintervall für geschlossene Tabs, Reconnect-Wartezeit für EventSource
+SSE_KEEPALIVE_SECONDS = 15
+SSE_CLIENT_CHECK_SECONDS = 1
+SSE_RETRY_MS = 3000
+SSE_KEEPALIVE = ": keepalive\n\n"
+
+
+def format_event(name, data, event_id=None):
+    """One text/event-stream message"""
+    prefix = f"id: {event_id}\n" if event_id is not None else ''
+    return f"{prefix}event: {name}\ndata: {serialization.dumps(data).decode()}\n\n"
+
+
+class EventBus:
+    """Thread-safe publish/subscribe with replay of recent events"""
+
+    def __init__(self, history=EVENT_HISTORY, poll_interval=POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._cond = threading.Condition()
+        self._events = deque(maxlen=history)   # (id, name, data)
+        self._last_id = 0
+        self._sources = []
+        self._subscribers = 0
+        self._pump = None
+        self._closed = False
+
+    @property
+    def last_id(self):
+        with self._cond:
+            return self._last_id
+
+    def resume_point(self, last_event_id):
+        """
+        Where a stream starts: (last_id, reset).
+
+        last_event_id is the Last-Event-ID header of a reconnecting
+        EventSource (None for a new stream). An id from an earlier server
+        run is answered with reset (the client reloads).
+        """
+        current = self.last_id
+        try:
+            last_id = int(last_event_id)
+        except (TypeError, ValueError):
+            return current, False
+        if last_id > current:
+            return current, True
+        return last_id, False
+
+    def add_source(self, source):
+        """
+        Register a polled event source: object with start() and stop() (pump
+        thread starts/ends) and poll() -> [(name, data)]
+        """
+        self._sources.append(source)
+
+    def publish(self, name, data):
+        """Append an event and wake all waiting streams; returns its id"""
+        with self._cond:
+            self._last_id += 1
+            self._events.append((self._last_id, name, data))
+            self._cond.notify_all()
+            return self._last_id
+
+    def subscribe(self):
+        """Register a client; starts the source pump with the first one"""
+        with self._cond:
+            self._subscribers += 1
+            if self._pump is None and self._sources and not self._closed:
+                self._pump = threading.Thread(target=self._run_pump, name='event-pump', daemon=True)
+                self._pump.start()
+
+    def unsubscribe(self):
+        with self._cond:
+            self._subscribers -= 1
+
+    def wait(self, last_id, timeout):
+        """
+        Events newer than last_id, waiting up to timeout seconds for one.
+
+        Returns:
+            (events, missed) - missed is True if events after last_id were
+            already dropped from the history (client should reload)
+            or None if the bus was closed
+        """
+        with self._cond:
+            if not self._closed and self._last_id <= last_id:
+                self._cond.wait(timeout)
+            if self._closed:
+                return None
+            events = [event for event in self._events if event[0] > last_id]
+            missed = bool(events) and events[0][0] > last_id + 1 and last_id > 0
+            return events, missed
+
+    def close(self):
+        """Stop the pump and release all waiting streams"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _run_pump(self):
+        """Poll the sources while clients are connected"""
+        for source in self._sources:
+            source.start()
+
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait(self.poll_interval)
+                    if self._closed or self._subscribers <= 0:
+                        self._pump = None
+                        return
+
+                for source in self._sources:
+                    try:
+                        for name, data in source.poll():
+                            self.publish(name, data)
+                    except (sqlite3.Error, OSError, ValueError) as e:
+                        logger.warning(f"Event source {type(source).__name__} failed: {e}", extra={'emoji': '⚠️'})
+        finally:
+            # Jeder neue Client startet einen neuen Pump-Thread: Ressourcen dieses Threads freigeben
+            for source in self._sources:
+                source.stop()
+
+
+class DatabaseChangeSource:
+    """
+    'db' events whenever the data version changes (own or other processes'
+    commits). Count changes are read from inventory_events, so clients can
+    patch the affected rows instead of reloading the whole grid.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._version = None
+        self._last_event_id = 0
+
+    def start(self):
+        self._version = self.db.data_version()
+        self._last_event_id = self._max_event_id()
+
+    def stop(self):
+        # Reader-Verbindung des Pump-Threads schließen
+        self.db.release_reader()
+
+    def _max_event_id(self):
+        row = self.db.reader().execute('SELECT COALESCE(MAX(id), 0) FROM inventory_events').fetchone()
+        return row[0]
+
+    def poll(self):
+        version = self.db.data_version()
+        if version == self._version:
+            return []
+        self._version = version
+
+        rows = self.db.reader().execute(
+            """SELECT e.id, e.name, e.old_count, e.new_count, i.id IS NOT NULL AS present
+               FROM inventory_events e LEFT JOIN items i ON i.id = e.item_id
+               WHERE e.id > ? ORDER BY e.id LIMIT ?""",
+            (self._last_event_id, MAX_CHANGES_PER_EVENT + 1)
+        ).fetchall()
+
+        truncated = len(rows) > MAX_CHANGES_PER_EVENT
+        if truncated:
+            rows = rows[:MAX_CHANGES_PER_EVENT]
+            self._last_event_id = self._max_event_id()
+        elif rows:
+            self._last_event_id = rows[-1][0]
+
+        # Pro Item zählt nur der letzte Stand
+        changes = {}
+        for _, name, old_count, new_count, present in rows:
+            previous = changes.get(name)
+            changes[name] = {
+                'name': name,
+                'old_count': previous['old_count'] if previous else old_count,
+                'count': new_count if present else None,
+            }
+
+        return [('db', {
+            'version': version,
+            'changes': list(changes.values()),
+            'truncated': truncated,
+        })]
+
+
+class ScanProgressSource:
+    """'scan' events from the progress file the InvDetect scanner writes"""
+
+    def __init__(self, path):
+        self.path = path
+        self._stamp = None
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def start(self):
+        self._stamp = self._stat()
+
+    def stop(self):
+        pass
+
+    def poll(self):
+        stamp = self._stat()
+        if stamp is None or stamp == self._stamp:
+            return []
+        self._stamp = stamp
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                progress = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            # Wird gerade ersetzt: beim nächsten Durchlauf erneut lesen
+            self._stamp = None
+            return []
+        return [('scan', progress)]
@@ -0,0 +1,633 @@
+"""
+HTTP server with a bounded worker pool and a separate lane for slow API calls
+
+HTTPServer handles one connection at a time, so a CStone scrape inside
+add_item blocked thumbnails and every other API call. PooledHTTPServer
+hands each connection to a fixed-size thread pool; requests for API methods
+in LONG_RUNNING_API_METHODS (or batches containing one) are routed to their
+own small pool, so imports and scrapes can never occupy all regular workers. Event streams
+(/api/events) stay open for as long as the page does and get a thread of
+their own, limited by max_event_streams.
+
+Connections are persistent (HTTP/1.1, see KeepAliveMixin). Between two
+requests an idle connection does not hold a worker: it is parked in a
+selector and handed back to the pool when the next request arrives, or
+closed after keep_alive_timeout seconds. A worker only serves the next
+request of its connection itself if it belongs to the same lane (regular,
+long-running, event stream); otherwise the connection goes back to the
+server and is dispatched like a new one.
+"""
+import email.utils
+import html
+import json
+import os
+import queue
+import re
+import select
+import selectors
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer
+
+from database.models import USER_CONFIG_PATH
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Override via the "server" section of user_config.json
+DEFAULT_SERVER_SETTINGS = {
+    'workers': 8,                 # reguläre Requests (Bilder, Inventar, Suche)
+    'long_running_workers': 2,    # Scraping / Import / Cache-Aufräumen
+    'max_pending': 64,            # offene Verbindungen, danach wartet accept()
+    'max_event_streams': 8,       # gleichzeitige /api/events-Verbindungen (offene Tabs)
+    'keep_alive_timeout': 15,     # Sekunden, die eine ungenutzte Verbindung offen bleibt
+    'max_idle_connections': 64,   # ungenutzte Verbindungen, danach wird die älteste geschlossen
+}
+
+# API-Methoden, die CStone scrapen oder viele Zeilen/Dateien anfassen
+LONG_RUNNING_API_METHODS = frozenset({
+    'add_item',
+    'import_scanned_items',
+    'search_items_cstone',
+    'get_category_items',
+    'restore_inventory',
+    'clear_cache',
+    'cleanup_cache_orphaned',
+    'cleanup_cache_old',
+    'cleanup_cache_by_size',
+})
+
+# GET-Pfade, die auf eine langsame Methode abgebildet werden
+LONG_RUNNING_PATH_PREFIXES = ('/api/bulk-import/',)
+
+# Server-Sent-Events-Pfade: Verbindung bleibt offen, eigener Thread statt Pool-Worker
+EVENT_STREAM_PATHS = frozenset({'/api/events'})
+
+# Antwort, wenn max_event_streams erreicht ist
+_STREAMS_EXHAUSTED_RESPONSE = (
+    b'HTTP/1.0 503 Service Unavailable\r\n'
+    b'Content-Type: text/plain\r\n'
+    b'Content-Length: 24\r\n'
+    b'Connection: close\r\n'
+    b'\r\n'
+    b'Too many event streams\r\n'
+)
+
+# Wie lange ein Worker auf die Request-Zeile wartet, bevor er sie selbst bearbeitet
+_PEEK_TIMEOUT = 1.0
+_PEEK_BYTES = 2048
+# Pause, wenn beim Warten auf die Request-Zeile keine neuen Bytes kamen
+_PEEK_RETRY_SECONDS = 0.005
+# /api/batch wird nach seinen Methoden eingeordnet; größere Bodies (weit unter
+# dem Socket-Empfangspuffer) laufen ohne Blick hinein auf der regulären Spur
+_PEEK_BATCH_BYTES = 64 * 1024
+_CONTENT_LENGTH_RE = re.compile(rb'^content-length:[ \t]*(\d+)[ \t]*\r?$', re.IGNORECASE | re.MULTILINE)
+
+# Spuren, auf die der Server einen Request verteilt
+REGULAR_LANE = 'regular'
+LONG_RUNNING_LANE = 'long-running'
+EVENT_STREAM_LANE = 'event-stream'
+
+# Obergrenze für einen einzelnen Lese-/Schreibvorgang (halbe Requests, hängende Clients)
+SOCKET_TIMEOUT = 60
+
+# Kurz auf den nächsten Request warten, bevor die Verbindung geparkt wird:
+# Browser schicken ihn meist sofort (Thumbnail-Warteschlange), der Umweg
+# über den Selector-Thread kostet mehr
+_LINGER_SECONDS = 0.002
+
+# Fehler, nach denen die Verbindung offen bleiben darf: der Request (GET/HEAD,
+# ohne Body) ist vollständig gelesen, z.B. ein fehlendes Thumbnail
+KEEP_ALIVE_ERRORS = frozenset({403, 404, 405, 416})
+
+IMAGE_CONTENT_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.webp': 'image/webp',
+    '.gif': 'image/gif'
+}
+
+
+def load_server_settings(config_path=USER_CONFIG_PATH):
+    """
+    Build the server settings from the defaults and the "server" section of
+    user_config.json, e.g.
+
+        "server": {"workers": 16, "long_running_workers": 4}
+
+    Unknown keys and invalid values are ignored (with a warning).
+    """
+    settings = dict(DEFAULT_SERVER_SETTINGS)
+
+    overrides = {}
+    if config_path and os.path.exists(config_path):
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                overrides = json.load(f).get('server', {})
+        except (json.JSONDecodeError, IOError, OSError, AttributeError) as e:
+            logger.warning(f"Could not read server settings from {config_path}: {e}", extra={'emoji': '⚠️'})
+            overrides = {}
+
+    for key, value in overrides.items():
+        if key not in settings:
+            logger.warning(f"Unknown server setting '{key}' ignored", extra={'emoji': '⚠️'})
+            continue
+        try:
+            value = int(value)
+            if value < 1:
+                raise ValueError(value)
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid value for server setting '{key}': {value!r}", extra={'emoji': '⚠️'})
+            continue
+        settings[key] = value
+
+    return settings
+
+
+def is_long_running_path(path):
+    """True if a request path targets a slow API method"""
+    path = path.split('?', 1)[0]
+    if path.startswith(LONG_RUNNING_PATH_PREFIXES):
+        return True
+    return path.startswith('/api/') and path[5:] in LONG_RUNNING_API_METHODS
+
+
+def is_long_running_batch(data):
+    """True if a parsed /api/batch body ({'calls': [...]} or a bare list) contains a slow API method"""
+    calls = data.get('calls') if isinstance(data, dict) else data
+    if not isinstance(calls, list):
+        return False
+    return any(isinstance(call, dict) and call.get('method') in LONG_RUNNING_API_METHODS for call in calls)
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match value lists `etag` (weak comparison, '*' matches anything)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or etag in [tag[2:] if tag.startswith('W/') else tag for tag in tags]
+
+
+def is_fresh(if_none_match, if_modified_since, etag, mtime):
+    """
+    Conditional GET: does the client's copy match?
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+    """
+    if if_none_match:
+        return etag is not None and etag_matches(if_none_match, etag)
+    if not if_modified_since:
+        return False
+    try:
+        return email.utils.parsedate_to_datetime(if_modified_since).timestamp() >= int(mtime)
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return False
+
+
+def parse_byte_range(header, size):
+    """
+    Parse a single-range 'bytes=' header.
+
+    Returns:
+        (start, end) inclusive, None to ignore the header (multiple ranges,
+        other units, malformed) or 'unsatisfiable'
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, sep, last = spec.strip().partition('-')
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+            if start >= size:
+                return 'unsatisfiable'
+            if start > end:
+                return None
+        elif last:
+            # Suffix-Range: die letzten N Bytes
+            start, end = max(size - int(last), 0), size - 1
+            if int(last) == 0:
+                return 'unsatisfiable'
+        else:
+            return None
+    except ValueError:
+        return None
+    if start >= size:
+        return 'unsatisfiable'
+    return start, min(end, size - 1)
+
+
+def is_event_stream_path(path):
+    """True if a request path opens a long-lived event stream"""
+    return path.split('?', 1)[0] in EVENT_STREAM_PATHS
+
+
+def request_lane(path):
+    """Lane of a request target: event stream, long-running API call or regular"""
+    if is_event_stream_path(path):
+        return EVENT_STREAM_LANE
+    if is_long_running_path(path):
+        return LONG_RUNNING_LANE
+    return REGULAR_LANE
+
+
+def _peek_socket(request, size, timeout):
+    """Pending bytes of the socket without consuming them (None: nothing within timeout)"""
+    readable, _, _ = select.select([request], [], [], timeout)
+    if not readable:
+        return None
+    try:
+        return request.recv(size, socket.MSG_PEEK)
+    except OSError:
+        return None
+
+
+def _peek_until(request, buffered, deadline, size, complete):
+    """
+    Peek at the start of the connection's pending data until complete(data)
+    holds, `size` bytes are there or the deadline passed.
+
+    Args:
+        buffered: Bytes the handler's rfile already read from the socket;
+                  the socket's pending data follows them
+
+    Returns:
+        The bytes seen (possibly incomplete)
+    """
+    data = buffered
+    while not complete(data) and len(data) < size:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        pending = _peek_socket(request, size - len(buffered), remaining)
+        if not pending:
+            # Nichts gekommen oder Verbindung geschlossen: der Handler liest das selbst
+            break
+        if len(buffered) + len(pending) == len(data):
+            # Socket lesbar, aber noch keine neuen Bytes: Request kommt in Stücken
+            time.sleep(_PEEK_RETRY_SECONDS)
+            continue
+        data = buffered + pending
+    return data
+
+
+def _peek_request_lane(request, buffered=b''):
+    """
+    Lane of the next request on a connection, read without consuming it.
+    POST /api/batch is classified by the methods in its body.
+
+    Args:
+        buffered: Bytes the handler's rfile already read from the socket
+
+    Returns:
+        REGULAR_LANE as well if the request does not arrive within _PEEK_TIMEOUT
+    """
+    deadline = time.monotonic() + _PEEK_TIMEOUT
+    data = _peek_until(request, buffered, deadline, _PEEK_BYTES, lambda data: b'\n' in data)
+    parts = data.split(b'\n', 1)[0].rstrip(b'\r').split(b' ')
+    if len(parts) < 2:
+        return REGULAR_LANE
+    path = parts[1].decode('latin-1')
+    if parts[0] != b'POST' or path.split('?', 1)[0] != '/api/batch':
+        return request_lane(path)
+
+    # Batch: Header, dann den Body ansehen (Content-Length begrenzt, was gewartet wird)
+    data = _peek_until(request, buffered, deadline, _PEEK_BATCH_BYTES, lambda data: b'\r\n\r\n' in data)
+    head, separator, _ = data.partition(b'\r\n\r\n')
+    content_length = _CONTENT_LENGTH_RE.search(head)
+    if not separator or content_length is None:
+        return REGULAR_LANE
+    size = len(head) + len(separator) + int(content_length.group(1))
+    if size > _PEEK_BATCH_BYTES:
+        return REGULAR_LANE
+    data = _peek_until(request, buffered, deadline, size, lambda data: len(data) >= size)
+    if len(data) < size:
+        return REGULAR_LANE
+    try:
+        body = json.loads(data[len(head) + len(separator):size].decode('utf-8'))
+    except ValueError:
+        return REGULAR_LANE
+    return LONG_RUNNING_LANE if is_long_running_batch(body) else REGULAR_LANE
+
+
+class KeepAliveMixin:
+    """
+    HTTP/1.1 persistent connections for request handlers.
+
+    Served by PooledHTTPServer, the handler does not block its worker while
+    waiting for the next request: once nothing is buffered it sets `parked`
+    and returns, and the server resumes it when the socket becomes readable.
+    If the next request is already there but belongs to another lane than
+    the worker's (event stream, slow API call, regular), it sets `parked`
+    and `handoff_lane` instead and the server dispatches the connection
+    like a new one.
+    Every response must carry a Content-Length (or close the connection).
+    """
+    protocol_version = 'HTTP/1.1'
+    timeout = SOCKET_TIMEOUT
+    # Header und Body gehen getrennt raus: ohne TCP_NODELAY wartet der Body
+    # auf das (verzögerte) ACK des Clients, sobald die Verbindung offen bleibt
+    disable_nagle_algorithm = True
+    parked = False
+    handoff_lane = None
+
+    def handle(self):
+        self.close_connection = True
+        self.handle_one_request()
+        self._serve_until_idle()
+
+    def resume(self):
+        """Serve the request that arrived on a parked connection"""
+        self.parked = False
+        try:
+            self.handle_one_request()
+            self._serve_until_idle()
+        finally:
+            if not self.parked:
+                self.finish()
+
+    def finish(self):
+        # Geparkte Verbindung: rfile/wfile bleiben für den nächsten Request offen
+        if not self.parked:
+            super().finish()
+
+    def _serve_until_idle(self):
+        can_park = getattr(self.server, 'parks_idle_connections', False)
+        while not self.close_connection:
+            if can_park:
+                lane = self._next_request_lane()
+                if lane != self.server.current_lane():
+                    # Nichts da (None): parken; andere Spur: zurück an den Server
+                    self.parked = True
+                    self.handoff_lane = lane
+                    return
+            self.handle_one_request()
+
+    def _next_request_lane(self):
+        """
+        Lane of the next request if it is buffered or arrives within
+        _LINGER_SECONDS, None otherwise
+        """
+        timeout = self.connection.gettimeout()
+        self.connection.settimeout(0)
+        try:
+            # peek() liefert den ganzen Puffer von rfile (Pipelining: dort liegt schon der nächste Request)
+            buffered = self.rfile.peek(1)
+            if not buffered:
+                readable, _, _ = select.select([self.connection], [], [], _LINGER_SECONDS)
+                if not readable:
+                    return None
+        except OSError:
+            return None
+        finally:
+            self.connection.settimeout(timeout)
+        return _peek_request_lane(self.connection, buffered)
+
+    def send_error(self, code, message=None, explain=None):
+        """
+        Like BaseHTTPRequestHandler.send_error, but a 403/404/405/416 on a
+        GET/HEAD request does not close the connection (the base class always
+        sends 'Connection: close').
+        """
+        if code not in KEEP_ALIVE_ERRORS or self.command not in ('GET', 'HEAD') or self.close_connection:
+            super().send_error(code, message, explain)
+            return
+
+        shortmsg, longmsg = self.responses.get(code, ('???', '???'))
+        message = shortmsg if message is None else message
+        explain = longmsg if explain is None else explain
+        body = (self.error_message_format % {
+            'code': code,
+            'message': html.escape(message, quote=False),
+            'explain': html.escape(explain, quote=False),
+        }).encode('UTF-8', 'replace')
+
+        self.log_error("code %d, message %s", code, message)
+        self.send_response(code, message)
+        self.send_header('Content-Type', self.error_content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTPServer whose connections are handled by a bounded thread pool.
+
+    The accept loop blocks once max_pending connections are in flight, so a
+    burst of requests queues in the kernel instead of spawning threads.
+    Idle keep-alive connections are watched by a single selector thread.
+    """
+    parks_idle_connections = True
+
+    def __init__(self, server_address, handler_class, workers=None, long_running_workers=None,
+                 max_pending=None, max_event_streams=None, keep_alive_timeout=None,
+                 max_idle_connections=None, settings=None):
+        settings = settings if settings is not None else load_server_settings()
+        self.workers = workers or settings['workers']
+        self.long_running_workers = long_running_workers or settings['long_running_workers']
+        self.max_pending = max_pending or settings['max_pending']
+        self.max_event_streams = max_event_streams or settings['max_event_streams']
+        self.keep_alive_timeout = keep_alive_timeout or settings['keep_alive_timeout']
+        self.max_idle_connections = max_idle_connections or settings['max_idle_connections']
+
+        super().__init__(server_address, handler_class)
+
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='http')
+        self._long_pool = ThreadPoolExecutor(self.long_running_workers, thread_name_prefix='http-long')
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._stream_slots = threading.BoundedSemaphore(self.max_event_streams)
+        # Spur, auf der der aktuelle Thread gerade eine Verbindung bedient
+        self._lane_local = threading.local()
+
+        # Geparkte Handler gehen über eine Queue an den Selector-Thread;
+        # das Socket-Paar weckt dessen select()
+        self._parked = queue.SimpleQueue()
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self._closing = False
+        self._idle_thread = threading.Thread(target=self._watch_idle, name='http-idle', daemon=True)
+        self._idle_thread.start()
+
+    def finish_request(self, request, client_address):
+        """Run the handler; returns it so a parked connection can be resumed"""
+        return self.RequestHandlerClass(request, client_address, self)
+
+    def process_request(self, request, client_address):
+        """Called by the accept loop: queue the connection for a worker"""
+        self._slots.acquire()
+        try:
+            self._pool.submit(self._route_request, request, client_address)
+        except RuntimeError:
+            # Pool bereits heruntergefahren (server_close)
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def _route_request(self, request, client_address):
+        """Worker: route a new connection by its first request line"""
+        try:
+            self._route(None, request, client_address)
+        finally:
+            self._slots.release()
+
+    def _route(self, handler, request, client_address):
+        """Worker: route a new (handler None) or resumed connection by its next request line"""
+        self._dispatch(handler, request, client_address, _peek_request_lane(request), wait=True)
+
+    def _dispatch(self, handler, request, client_address, lane, wait=False):
+        """
+        Event streams get their own thread, slow API calls the long-running
+        lane, everything else a regular worker (with wait=True: this one).
+        """
+        if lane == EVENT_STREAM_LANE:
+            self._start_stream(handler, request, client_address)
+            return
+        if lane == LONG_RUNNING_LANE:
+            try:
+                self._long_pool.submit(self._serve, handler, request, client_address, LONG_RUNNING_LANE)
+                return
+            except RuntimeError:
+                pass
+        if wait:
+            self._serve(handler, request, client_address, REGULAR_LANE)
+            return
+        try:
+            self._pool.submit(self._serve, handler, request, client_address, REGULAR_LANE)
+        except RuntimeError:
+            self._close_idle(handler)
+
+    def current_lane(self):
+        """Lane of the connection the calling thread is serving"""
+        return getattr(self._lane_local, 'lane', REGULAR_LANE)
+
+    def _serve(self, handler, request, client_address, lane):
+        """Run a new (handler None) or resumed connection until it closes, goes idle or changes lane"""
+        self._lane_local.lane = lane
+        try:
+            if handler is None:
+                handler = self.finish_request(request, client_address)
+            else:
+                handler.resume()
+        except Exception:
+            self.handle_error(request, client_address)
+            handler = None
+
+        if handler is not None and getattr(handler, 'parked', False) and not self._closing:
+            lane = handler.handoff_lane
+            if lane is not None:
+                # Nächster Request liegt schon an, gehört aber auf eine andere Spur
+                handler.handoff_lane = None
+                self._dispatch(handler, request, client_address, lane)
+                return
+            self._parked.put(handler)
+            self._wakeup_send.send(b'\0')
+        else:
+            self.shutdown_request(request)
+
+    def _start_stream(self, handler, request, client_address):
+        """Hand an event stream to its own thread"""
+        if not self._stream_slots.acquire(blocking=False):
+            logger.warning(f"Event stream limit ({self.max_event_streams}) reached", extra={'emoji': '⚠️'})
+            try:
+                request.sendall(_STREAMS_EXHAUSTED_RESPONSE)
+            except OSError:
+                pass
+            if handler is not None:
+                self._close_idle(handler)
+            else:
+                self.shutdown_request(request)
+            return
+
+        threading.Thread(
+            target=self._handle_stream, args=(handler, request, client_address),
+            name='http-events', daemon=True
+        ).start()
+
+    def _handle_stream(self, handler, request, client_address):
+        try:
+            self._serve(handler, request, client_address, EVENT_STREAM_LANE)
+        finally:
+            self._stream_slots.release()
+
+    def _close_idle(self, handler):
+        """Close a parked connection"""
+        handler.parked = False
+        try:
+            handler.finish()
+        except OSError:
+            pass
+        self.shutdown_request(handler.request)
+
+    def _watch_idle(self):
+        """
+        Selector thread: hand parked connections to a worker when the next
+        request arrives, close them after keep_alive_timeout (oldest first if
+        more than max_idle_connections are idle). It never reads from a
+        connection itself; the worker routes it by its request line.
+        """
+        selector = selectors.DefaultSelector()
+        selector.register(self._wakeup_recv, selectors.EVENT_READ)
+        idle = {}   # Handler -> Ablaufzeit, in Park-Reihenfolge
+
+        while not self._closing:
+            timeout = min(idle.values()) - time.monotonic() if idle else None
+            for key, _ in selector.select(None if timeout is None else max(timeout, 0)):
+                if key.fileobj is self._wakeup_recv:
+                    try:
+                        self._wakeup_recv.recv(4096)
+                    except BlockingIOError:
+                        pass
+                    continue
+                handler = key.data
+                selector.unregister(key.fileobj)
+                del idle[handler]
+                # Request-Zeile erst im Worker ansehen: das Warten darauf
+                # (bis _PEEK_TIMEOUT) darf die anderen Verbindungen nicht aufhalten
+                try:
+                    self._pool.submit(self._route, handler, handler.request, handler.client_address)
+                except RuntimeError:
+                    self._close_idle(handler)
+
+            while True:
+                try:
+                    handler = self._parked.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    selector.register(handler.request, selectors.EVENT_READ, handler)
+                except (ValueError, OSError):
+                    # Socket inzwischen geschlossen
+                    self._close_idle(handler)
+                    continue
+                idle[handler] = time.monotonic() + self.keep_alive_timeout
+                if len(idle) > self.max_idle_connections:
+                    oldest = next(iter(idle))
+                    del idle[oldest]
+                    selector.unregister(oldest.request)
+                    self._close_idle(oldest)
+
+            now = time.monotonic()
+            for handler in [handler for handler, deadline in idle.items() if deadline <= now]:
+                del idle[handler]
+                selector.unregister(handler.request)
+                self._close_idle(handler)
+
+        for handler in idle:
+            self._close_idle(handler)
+        selector.close()
+
+    def server_close(self):
+        super().server_close()
+        self._closing = True
+        self._wakeup_send.send(b'\0')
+        self._idle_thread.join(timeout=2)
+        self._wakeup_send.close()
+        self._wakeup_recv.close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._long_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,182 @@
+"""
+Precompiled route registry for the HTTP handler
+
+Exact paths are a dict lookup, prefix routes (/images/, /api/bulk-import/)
+live in a segment trie, and each route declares its query parameters with a
+type and default, so handlers receive ready-to-use keyword arguments instead
+of parsing parse_qs lists themselves.
+
+build_get_routes() is the GET route table of the browser mode; the threaded
+handler (main_browser.py) and the asyncio server only supply the handlers.
+"""
+from urllib.parse import unquote_plus
+
+from database.operations import item_projection
+from database.search_index import SEARCH_DEFAULT_LIMIT
+
+
+def parse_query(query):
+    """
+    Query string -> {name: value} (first non-empty occurrence wins).
+
+    Lighter than parse_qs: no per-key lists, and unquoting only runs for
+    components that actually contain '%' or '+'.
+    """
+    result = {}
+    for pair in query.split('&'):
+        if not pair:
+            continue
+        key, _, value = pair.partition('=')
+        if '%' in key or '+' in key:
+            key = unquote_plus(key)
+        if '%' in value or '+' in value:
+            value = unquote_plus(value)
+        if value and key not in result:
+            result[key] = value
+    return result
+
+
+class Param:
+    """Query parameter of a route: name, converter, default and legacy aliases"""
+    __slots__ = ('name', 'convert', 'default', 'keys')
+
+    def __init__(self, name, convert=str, default=None, aliases=()):
+        self.name = name
+        self.convert = convert
+        self.default = default
+        self.keys = (name,) + tuple(aliases)
+
+    def extract(self, query):
+        """
+        Value from a parse_query dict (empty counts as missing).
+
+        Raises:
+            ValueError: value cannot be converted
+        """
+        for key in self.keys:
+            value = query.get(key)
+            if value:
+                try:
+                    return self.convert(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Invalid value for parameter '{key}': {value!r}")
+        return self.default
+
+
+class Route:
+    """
+    A handler plus its parameter spec.
+
+    versioned: the response depends only on the database content (and the
+    request URL), so it can be tagged with the data version and revalidated.
+    """
+    __slots__ = ('name', 'handler', 'params', 'versioned')
+
+    def __init__(self, name, handler, params=(), versioned=False):
+        self.name = name
+        self.handler = handler
+        self.params = tuple(params)
+        self.versioned = versioned
+
+    def coerce(self, query_string):
+        """Raw query string -> keyword arguments for the handler"""
+        query = parse_query(query_string) if query_string else {}
+        return {param.name: param.extract(query) for param in self.params}
+
+
+class _TrieNode:
+    __slots__ = ('children', 'route')
+
+    def __init__(self):
+        self.children = {}
+        self.route = None
+
+
+class RouteTable:
+    """Exact-path dict plus a prefix trie over path segments"""
+
+    def __init__(self):
+        self._exact = {}
+        self._prefixes = _TrieNode()
+
+    def add(self, path, handler, params=(), name=None, versioned=False):
+        """Register a handler for exactly `path`"""
+        self._exact[path] = Route(name or path, handler, params, versioned)
+
+    def add_prefix(self, prefix, handler, params=(), name=None, versioned=False):
+        """Register a handler for every path below `prefix` (e.g. '/images/')"""
+        node = self._prefixes
+        for segment in prefix.strip('/').split('/'):
+            node = node.children.setdefault(segment, _TrieNode())
+        node.route = Route(name or prefix, handler, params, versioned)
+
+    def resolve(self, path):
+        """
+        Find the route for a request path (without query string).
+
+        Returns:
+            (route, remainder) - remainder is the part after a prefix route
+            ('' for exact routes), or (None, None) if nothing matches
+        """
+        route = self._exact.get(path)
+        if route is not None:
+            return route, ''
+
+        # Längster passender Präfix gewinnt
+        match = (None, None)
+        node = self._prefixes
+        segments = path.split('/')
+        for index in range(1, len(segments)):
+            node = node.children.get(segments[index])
+            if node is None:
+                break
+            if node.route is not None:
+                match = (node.route, '/'.join(segments[index + 1:]))
+        return match
+
+
+def build_get_routes(handlers):
+    """
+    GET routes of both browser-mode servers (paths, parameters, versioning).
+
+    Args:
+        handlers: Object with one attribute per route handler (_get_image,
+                  _get_inventory_items, ..., _get_events); the server decides
+                  how a handler is called
+    """
+    routes = RouteTable()
+    routes.add_prefix('/images/', handlers._get_image)
+    routes.add('/api/get_inventory_items', handlers._get_inventory_items, [
+        Param('sort_by', default='name'),
+        Param('sort_order', default='asc'),
+        # 'category' (neu) oder 'category_filter' (alt)
+        Param('category', aliases=('category_filter',)),
+        Param('is_favorite'),
+        # Pagination (optional)
+        Param('limit', int),
+        Param('offset', int, 0),
+        Param('projection', item_projection, 'grid'),
+    ], versioned=True)
+    routes.add('/api/search_items_local', handlers._get_search_items_local, [
+        Param('query', default=''),
+        Param('projection', item_projection, 'search'),
+    ], versioned=True)
+    routes.add('/api/search', handlers._get_search, [
+        Param('q', default='', aliases=('query',)),
+        Param('limit', int, SEARCH_DEFAULT_LIMIT),
+    ], versioned=True)
+    routes.add('/api/items/changes', handlers._get_item_changes, [
+        Param('since', int, 0),
+        Param('sync_id'),
+        Param('projection', item_projection, 'search'),
+    ], versioned=True)
+    routes.add('/api/get_all_gear_sets', handlers._get_all_gear_sets, versioned=True)
+    routes.add('/api/get_gear_set_details', handlers._get_gear_set_details, [
+        Param('set_name', default=''),
+        Param('variant', default=''),
+    ])
+    routes.add('/api/get_gear_set_variants', handlers._get_gear_set_variants, [Param('set_name', default='')])
+    routes.add_prefix('/api/bulk-import/', handlers._get_bulk_import)
+    routes.add('/api/get_scan_results', handlers._get_scan_results)
+    routes.add('/api/events', handlers._get_events)
+    return routes
@@ -0,0 +1,38 @@
+"""
+JSON serialization for HTTP responses
+
+Uses orjson when it is installed and falls back to the stdlib json module
+(compact separators, UTF-8). API results are plain dicts/lists - the list
+endpoints build their rows with ItemOperations' zip-dicts - so both paths
+encode the same values.
+"""
+import json
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:
+    # Optional: pip install orjson
+    orjson = None
+
+SERIALIZER = 'orjson' if orjson is not None else 'json'
+
+
+def _default(obj):
+    """Types json/orjson do not know natively"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# C-Encoder des json-Moduls, einmal konfiguriert
+_json_encoder = json.JSONEncoder(default=_default, ensure_ascii=False, separators=(',', ':'))
+
+
+def dumps(obj):
+    """Serialize to UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return _json_encoder.encode(obj).encode()
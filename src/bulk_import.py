@@ -18,6 +18,10 @@ from database.operations import ItemOperations
 from scraper.cstone import CStoneScraper
 from cache.image_cache import ImageCache
 
+# Vorbereitete Items so oft schreiben (= Transaktion von add_items_bulk), damit ein
+# Abbruch mitten in einer Kategorie nicht alle bisher geladenen Items verliert
+IMPORT_CHUNK_SIZE = 50
+
 
 class BulkImporter:
     def __init__(self):
@@ -94,14 +98,14 @@ class BulkImporter:
             print(f"    Fehler beim Laden der Kategorie: {e}")
             return []
     
-    def import_item(self, item_name, item_type, item_url):
-        """Importiert ein einzelnes Item"""
+    def prepare_item(self, item_name, item_type, item_url):
+        """Lädt das Bild eines Items und gibt den Datensatz für add_items_bulk zurück"""
         try:
             # Check if already exists
             existing = self.operations.get_item_by_name(item_name)
             if existing:
                 print(f"    ⏭️  '{item_name}' bereits vorhanden")
-                return True
+                return None
             
             # Get image
             image_url = self.scraper.get_item_image(item_url)
@@ -120,25 +124,27 @@ class BulkImporter:
                         if os.path.exists(temp_path):
                             os.remove(temp_path)
             
-            # Add to database
-            result = self.operations.add_item(
-                name=item_name,
-                item_type=item_type,
-                image_url=image_url,
-                image_path=image_path,
-                notes=None
-            )
-            
-            if result['success']:
-                print(f"    ✅ '{item_name}' importiert")
-                return True
-            else:
-                print(f"    ❌ Fehler bei '{item_name}': {result.get('error')}")
-                return False
+            return {
+                'name': item_name,
+                'item_type': item_type,
+                'image_url': image_url,
+                'image_path': image_path,
+                'notes': None
+            }
         
         except Exception as e:
             print(f"    ❌ Fehler bei '{item_name}': {e}")
-            return False
+            return None
+    
+    def write_items(self, prepared):
+        """Schreibt vorbereitete Items in einer Transaktion; gibt die Anzahl neuer Items zurück"""
+        result = self.operations.add_items_bulk(prepared, chunk_size=IMPORT_CHUNK_SIZE, skip_existing=True)
+        for row in result['results']:
+            if row['action'] == 'added':
+                print(f"    ✅ '{row['name']}' importiert")
+            elif row['action'] == 'failed':
+                print(f"    ❌ Fehler bei '{row['name']}': {row.get('error')}")
+        return result['added']
     
     def run(self):
         """Startet den Bulk-Import"""
@@ -157,14 +163,25 @@ class BulkImporter:
             items = self.get_all_items_from_category(category_url)
             total_items += len(items)
             
+            prepared = []
             for i, item in enumerate(items, 1):
                 print(f"  [{i}/{len(items)}] {item['name']}")
                 
-                if self.import_item(item['name'], item_type, item['url']):
-                    imported_items += 1
+                data = self.prepare_item(item['name'], item_type, item['url'])
+                if data:
+                    prepared.append(data)
+                
+                # Alle IMPORT_CHUNK_SIZE Items schreiben statt erst am Ende der Kategorie
+                if len(prepared) >= IMPORT_CHUNK_SIZE:
+                    imported_items += self.write_items(prepared)
+                    prepared = []
                 
                 # Rate limiting
                 time.sleep(0.5)
+            
+            # Rest der Kategorie
+            if prepared:
+                imported_items += self.write_items(prepared)
         
         print()
         print("=" * 60)
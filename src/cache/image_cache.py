@@ -3,6 +3,7 @@ Image caching system for downloaded images
 """
 import os
 import hashlib
+import threading
 import time
 from pathlib import Path
 from PIL import Image
@@ -17,9 +18,66 @@ class ImageCache:
             project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
             cache_dir = os.path.join(project_root, cache_dir)
 
-        self.cache_dir = cache_dir
-        os.makedirs(cache_dir, exist_ok=True)
+        # Normalisiert (unter Windows z.B. 'C:\\GearCrate\\data/images'): Manifest-Einträge
+        # aus os.walk und has_file()-Argumente werden gegen diese Schreibweise verglichen
+        self.cache_dir = os.path.normpath(cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
         print(f"Image cache initialized at: {self.cache_dir}")
+        
+        # Manifest: alle Dateien unter cache_dir (beim ersten has_file() eingelesen),
+        # damit API-Antworten die Existenz ohne stat() pro Item kennen.
+        # generation zählt Schreib-/Aufräumvorgänge (Invalidierung für Aufrufer-Caches)
+        self._manifest = None
+        self._manifest_lock = threading.Lock()
+        self.generation = 0
+    
+    def _load_manifest(self):
+        manifest = self._manifest
+        if manifest is None:
+            with self._manifest_lock:
+                if self._manifest is None:
+                    # Einträge in derselben Schreibweise wie die has_file()-Argumente
+                    self._manifest = {
+                        os.path.normpath(os.path.join(root, file))
+                        for root, dirs, files in os.walk(self.cache_dir)
+                        for file in files if file != '.gitkeep'
+                    }
+                manifest = self._manifest
+        return manifest
+    
+    def _record(self, *paths):
+        """Add written files to the manifest and invalidate dependent caches"""
+        paths = [os.path.normpath(path) for path in paths]
+        with self._manifest_lock:
+            if self._manifest is not None:
+                self._manifest.update(paths)
+            self.generation += 1
+    
+    def _forget(self, *paths):
+        """Remove deleted files from the manifest and invalidate dependent caches"""
+        paths = [os.path.normpath(path) for path in paths]
+        with self._manifest_lock:
+            if self._manifest is not None:
+                self._manifest.difference_update(paths)
+            self.generation += 1
+    
+    def has_file(self, path):
+        """
+        Whether a file exists, from the in-memory manifest for paths below
+        cache_dir (other paths are checked on disk)
+        """
+        path = os.path.normpath(path)
+        if path in self._load_manifest():
+            return True
+        if not path.startswith(self.cache_dir + os.sep):
+            return os.path.exists(path)
+        # Von einem anderen Prozess geschrieben (z.B. bulk_import): einmal prüfen und merken
+        if os.path.isfile(path):
+            with self._manifest_lock:
+                if self._manifest is not None:
+                    self._manifest.add(path)
+            return True
+        return False
     
     def _get_cache_filename(self, url, item_type=None):
         """Generate cache filename from URL with optional category subdirectory"""
@@ -72,17 +130,18 @@ class ImageCache:
                 # Save original
                 img.save(filepath)
                 # Generate thumbnails
-                self._generate_thumbnails(img, filepath)
+                written = self._generate_thumbnails(img, filepath)
             # If it's bytes, save directly
             elif isinstance(image_data_or_path, bytes):
                 with open(filepath, 'wb') as f:
                     f.write(image_data_or_path)
                 # Open and generate thumbnails
                 img = Image.open(filepath)
-                self._generate_thumbnails(img, filepath)
+                written = self._generate_thumbnails(img, filepath)
             else:
                 return None
             
+            self._record(filepath, *written)
             return filepath
         
         except Exception as e:
@@ -90,7 +149,8 @@ class ImageCache:
             return None
     
     def _generate_thumbnails(self, img, original_path):
-        """Generate thumbnail versions of an image"""
+        """Generate thumbnail versions of an image; returns the written paths"""
+        written = []
         try:
             # Get base path without extension
             base_path = os.path.splitext(original_path)[0]
@@ -100,17 +160,17 @@ class ImageCache:
             thumb_img.thumbnail((64, 64), Image.Resampling.LANCZOS)
             thumb_path = f"{base_path}_thumb.png"
             thumb_img.save(thumb_path, 'PNG', optimize=True)
+            written.append(thumb_path)
             
             # Medium (256x256) - for modal preview
             medium_img = img.copy()
             medium_img.thumbnail((256, 256), Image.Resampling.LANCZOS)
             medium_path = f"{base_path}_medium.png"
             medium_img.save(medium_path, 'PNG', optimize=True)
-            
-            return True
+            written.append(medium_path)
         except Exception as e:
             print(f"Error generating thumbnails: {e}")
-            return False
+        return written
     
     def get_thumbnail_path(self, url, item_type=None):
         """Get path to thumbnail version of cached image"""
@@ -148,6 +208,11 @@ class ImageCache:
         except Exception as e:
             print(f"Error clearing cache: {e}")
             return False
+        finally:
+            # Neu einlesen statt einzeln austragen (auch bei Teilerfolg)
+            with self._manifest_lock:
+                self._manifest = None
+                self.generation += 1
     
     def get_cache_size(self):
         """Get total size of cache in bytes including subdirectories"""
@@ -230,15 +295,18 @@ class ImageCache:
         removed_count = 0
         freed_bytes = 0
         errors = []
+        removed = []
 
         for filepath in orphaned:
             try:
                 file_size = os.path.getsize(filepath)
                 os.remove(filepath)
+                removed.append(filepath)
                 removed_count += 1
                 freed_bytes += file_size
             except Exception as e:
                 errors.append({'file': filepath, 'error': str(e)})
+        self._forget(*removed)
 
         return {
             'removed_count': removed_count,
@@ -262,6 +330,7 @@ class ImageCache:
         removed_count = 0
         freed_bytes = 0
         errors = []
+        removed = []
 
         for root, dirs, files in os.walk(self.cache_dir):
             for file in files:
@@ -278,11 +347,13 @@ class ImageCache:
                     if file_age > max_age_seconds:
                         file_size = os.path.getsize(filepath)
                         os.remove(filepath)
+                        removed.append(filepath)
                         removed_count += 1
                         freed_bytes += file_size
 
                 except Exception as e:
                     errors.append({'file': filepath, 'error': str(e)})
+        self._forget(*removed)
 
         return {
             'removed_count': removed_count,
@@ -337,6 +408,7 @@ class ImageCache:
         removed_count = 0
         freed_bytes = 0
         errors = []
+        removed = []
 
         # Remove oldest files until we're under the limit
         for file_info in files_with_atime:
@@ -345,11 +417,13 @@ class ImageCache:
 
             try:
                 os.remove(file_info['path'])
+                removed.append(file_info['path'])
                 removed_count += 1
                 freed_bytes += file_info['size']
                 current_size -= file_info['size']
             except Exception as e:
                 errors.append({'file': file_info['path'], 'error': str(e)})
+        self._forget(*removed)
 
         return {
             'removed_count': removed_count,
@@ -0,0 +1,81 @@
+"""
+URL mapping for cached images
+
+image_path in the database is an OS path (absolute, on Windows with
+backslashes). The browser server serves the cache under /images/, so the
+paths are mapped to URLs once when a row is written and stored in the
+thumb_url / medium_url / full_url columns.
+"""
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Varianten, die ImageCache._generate_thumbnails neben dem Original ablegt
+IMAGE_VARIANTS = (('thumb_url', '_thumb.png'), ('medium_url', '_medium.png'))
+
+
+def absolute_image_path(path):
+    """image_path as an absolute path (relative paths are relative to the project root)"""
+    if os.path.isabs(path):
+        return path
+    return os.path.join(PROJECT_ROOT, path)
+
+
+def path_to_url(path):
+    """Map a cache path to its URL (/images/...), without checking the file"""
+    # 1. Normalisieren des Pfadtrenners für URL
+    normalized_path = path.replace('\\', '/')
+
+    # 2. Versuche verschiedene Muster zu finden und zu ersetzen
+    # Pattern 1: data/cache/images/ -> /cache/
+    if 'data/cache/images/' in normalized_path:
+        parts = normalized_path.split('data/cache/images/')
+        if len(parts) > 1:
+            return f"/cache/{parts[1]}"
+
+    # Pattern 2: data/images/ -> /images/
+    if 'data/images/' in normalized_path:
+        parts = normalized_path.split('data/images/')
+        if len(parts) > 1:
+            return f"/images/{parts[1]}"
+
+    # Pattern 3: Wenn es ein absoluter Pfad ist, extrahiere alles nach 'data/'
+    if '/data/' in normalized_path or 'data/' in normalized_path:
+        # Finde den Index von 'data/' und nimm alles danach
+        data_index = normalized_path.find('data/')
+        if data_index != -1:
+            relative_part = normalized_path[data_index + 5:]  # Skip 'data/'
+            return f"/images/{relative_part}"
+
+    # Fallback: Wenn der Pfad mit /images/ oder /cache/ beginnt, behalte ihn
+    if normalized_path.startswith('/images/') or normalized_path.startswith('/cache/'):
+        return normalized_path
+
+    # Letzter Fallback
+    return normalized_path
+
+
+def image_urls(image_path, exists=os.path.isfile):
+    """
+    URL columns for an image_path.
+
+    Returns:
+        {'thumb_url', 'medium_url', 'full_url'} - all None if the image file
+        does not exist (frontend shows a placeholder); a missing thumbnail or
+        medium variant falls back to the full image
+    """
+    urls = {'thumb_url': None, 'medium_url': None, 'full_url': None}
+    if not image_path:
+        return urls
+
+    absolute_path = absolute_image_path(image_path)
+    if not exists(absolute_path):
+        return urls
+
+    full_url = path_to_url(image_path)
+    urls['full_url'] = full_url
+    base_url = os.path.splitext(full_url)[0]
+    absolute_base = os.path.splitext(absolute_path)[0]
+    for column, suffix in IMAGE_VARIANTS:
+        urls[column] = base_url + suffix if exists(absolute_base + suffix) else full_url
+    return urls
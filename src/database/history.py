@@ -0,0 +1,203 @@
+"""
+Inventory history: event log, compacted snapshots and point-in-time restore
+
+Every count change is appended to inventory_events by triggers on the items
+table (see migration 6), so the log is written in the same transaction as
+update_item_count, add_item, clear_inventory, import_scanned_items and the
+bulk importers. Snapshots copy all non-zero counts every SNAPSHOT_EVERY_EVENTS
+events; a restore loads the newest snapshot before the requested time and
+replays the events after it, then writes the differences back to items.
+"""
+from datetime import datetime, timedelta
+
+from database.migrations import EVENT_TIMESTAMP_SQL
+from database.operations import local_timestamp, utc_timestamp
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Neuer Snapshot nach so vielen Events seit dem letzten
+SNAPSHOT_EVERY_EVENTS = 500
+
+# Ältere Events/Snapshots werden beim Snapshot-Erstellen verdichtet
+HISTORY_RETENTION_DAYS = 90
+
+
+def _normalize_timestamp(value):
+    """ISO timestamp (or datetime) -> 'YYYY-MM-DD HH:MM:SS.mmm' as stored in the event log"""
+    if isinstance(value, datetime):
+        moment = value
+    else:
+        text = str(value).strip().replace('T', ' ')
+        if text.endswith(('Z', 'z')):
+            text = text[:-1] + '+00:00'
+        moment = datetime.fromisoformat(text)
+    if moment.tzinfo is not None:
+        # Events stehen in lokaler Zeit (EVENT_TIMESTAMP_SQL): Offset erst umrechnen
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment.isoformat(' ', 'milliseconds')
+
+
+class InventoryHistory:
+    """Snapshots and point-in-time restore on top of the inventory_events log"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def _last_snapshot_event_id(self, conn):
+        row = conn.execute(
+            'SELECT last_event_id FROM inventory_snapshots ORDER BY id DESC LIMIT 1'
+        ).fetchone()
+        return row['last_event_id'] if row else 0
+
+    def create_snapshot(self):
+        """
+        Store the current non-zero counts as a snapshot and compact history
+        older than HISTORY_RETENTION_DAYS.
+
+        Returns:
+            {'success': True, 'snapshot_id': int, 'items': int, 'pruned_events': int}
+        """
+        try:
+            with self.db.writer() as conn:
+                snapshot_id = conn.execute(f'''
+                    INSERT INTO inventory_snapshots (created_at, last_event_id)
+                    VALUES ({EVENT_TIMESTAMP_SQL}, (SELECT COALESCE(MAX(id), 0) FROM inventory_events))
+                ''').lastrowid
+                items = conn.execute('''
+                    INSERT INTO inventory_snapshot_items (snapshot_id, item_id, count)
+                    SELECT ?, id, count FROM items WHERE count != 0
+                ''', (snapshot_id,)).rowcount
+                pruned = self._compact(conn)
+            logger.info(f"Inventory snapshot {snapshot_id} created ({items} items)", extra={'emoji': '📸'})
+            return {'success': True, 'snapshot_id': snapshot_id, 'items': items, 'pruned_events': pruned}
+        except Exception as e:
+            logger.error(f"Error creating inventory snapshot: {e}", extra={'emoji': '❌'})
+            return {'success': False, 'error': str(e)}
+
+    def _compact(self, conn):
+        """
+        Drop snapshots and events that are no longer needed to restore any
+        point within the retention window. The newest snapshot before the
+        cutoff is kept as the anchor for restores at the window's start.
+        """
+        cutoff = _normalize_timestamp(datetime.now() - timedelta(days=HISTORY_RETENTION_DAYS))
+        anchor = conn.execute('''
+            SELECT id, last_event_id FROM inventory_snapshots
+            WHERE created_at <= ? ORDER BY id DESC LIMIT 1
+        ''', (cutoff,)).fetchone()
+        if anchor is None:
+            return 0
+
+        conn.execute('DELETE FROM inventory_snapshot_items WHERE snapshot_id < ?', (anchor['id'],))
+        conn.execute('DELETE FROM inventory_snapshots WHERE id < ?', (anchor['id'],))
+        return conn.execute('DELETE FROM inventory_events WHERE id <= ?', (anchor['last_event_id'],)).rowcount
+
+    def maybe_snapshot(self):
+        """Create a snapshot if SNAPSHOT_EVERY_EVENTS events were logged since the last one"""
+        conn = self.db.reader()
+        last_event = conn.execute('SELECT COALESCE(MAX(id), 0) FROM inventory_events').fetchone()[0]
+        if last_event - self._last_snapshot_event_id(conn) >= SNAPSHOT_EVERY_EVENTS:
+            return self.create_snapshot()
+        return None
+
+    def counts_as_of(self, timestamp, conn=None):
+        """
+        Reconstruct {item_id: count} (non-zero counts only) at a point in time.
+
+        Raises:
+            ValueError: timestamp is invalid or older than the retained history
+        """
+        as_of = _normalize_timestamp(timestamp)
+        conn = conn or self.db.reader()
+
+        snapshot = conn.execute('''
+            SELECT id, last_event_id FROM inventory_snapshots
+            WHERE created_at <= ? ORDER BY id DESC LIMIT 1
+        ''', (as_of,)).fetchone()
+        if snapshot is None:
+            oldest = conn.execute('SELECT MIN(created_at) FROM inventory_snapshots').fetchone()[0]
+            raise ValueError(f"No inventory history before {oldest}")
+
+        counts = dict(conn.execute(
+            'SELECT item_id, count FROM inventory_snapshot_items WHERE snapshot_id = ?', (snapshot['id'],)
+        ).fetchall())
+
+        # Events nach dem Snapshot bis zum Zeitpunkt nachspielen (id-Reihenfolge = Schreibreihenfolge)
+        for item_id, new_count in conn.execute('''
+            SELECT item_id, new_count FROM inventory_events
+            WHERE id > ? AND created_at <= ?
+            ORDER BY id
+        ''', (snapshot['last_event_id'], as_of)):
+            if new_count:
+                counts[item_id] = new_count
+            else:
+                counts.pop(item_id, None)
+
+        return counts
+
+    def restore(self, timestamp):
+        """
+        Set every item's count to its value at `timestamp`.
+
+        The restore itself is logged as events, so it can be undone by
+        restoring to a time just before it. Items deleted since then stay
+        deleted.
+
+        Returns:
+            {'success': True, 'restored_to': str, 'changed': int}
+        """
+        try:
+            as_of = _normalize_timestamp(timestamp)
+            added_at, updated_at = local_timestamp(), utc_timestamp()
+            with self.db.writer() as conn:
+                counts = self.counts_as_of(as_of, conn)
+                current = conn.execute('SELECT id, count FROM items').fetchall()
+
+                changes = [
+                    (target, updated_at, target, added_at, item_id)
+                    for item_id, count in current
+                    for target in (counts.get(item_id, 0),)
+                    if count != target
+                ]
+                conn.executemany('''
+                    UPDATE items
+                    SET count = ?,
+                        updated_at = ?,
+                        added_to_inventory_at = CASE
+                            WHEN ? = 0 THEN NULL
+                            WHEN count = 0 OR added_to_inventory_at IS NULL THEN ?
+                            ELSE added_to_inventory_at END
+                    WHERE id = ?
+                ''', changes)
+
+            logger.info(f"Inventory restored to {as_of} ({len(changes)} items changed)", extra={'emoji': '⏪'})
+            return {'success': True, 'restored_to': as_of, 'changed': len(changes)}
+        except ValueError as e:
+            return {'success': False, 'error': str(e)}
+        except Exception as e:
+            logger.error(f"Error restoring inventory to {timestamp}: {e}", extra={'emoji': '❌'})
+            return {'success': False, 'error': str(e)}
+
+    def get_history(self, limit=100):
+        """
+        Recent count changes and available snapshots (newest first).
+
+        Returns:
+            {'events': [...], 'snapshots': [...], 'oldest_restorable': str or None}
+        """
+        conn = self.db.reader()
+        events = conn.execute('''
+            SELECT id, item_id, name, old_count, new_count, created_at
+            FROM inventory_events ORDER BY id DESC LIMIT ?
+        ''', (int(limit),)).fetchall()
+        snapshots = conn.execute('''
+            SELECT s.id, s.created_at, s.last_event_id,
+                   (SELECT COUNT(*) FROM inventory_snapshot_items WHERE snapshot_id = s.id) AS items
+            FROM inventory_snapshots s ORDER BY s.id DESC
+        ''').fetchall()
+        return {
+            'events': [dict(row) for row in events],
+            'snapshots': [dict(row) for row in snapshots],
+            'oldest_restorable': snapshots[-1]['created_at'] if snapshots else None
+        }
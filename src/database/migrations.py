@@ -0,0 +1,487 @@
+"""
+Versioned schema migrations for the inventory database
+
+The schema version is stored in PRAGMA user_version. Each migration runs in
+its own transaction together with the version bump, so an interrupted
+upgrade resumes at the first missing step. Migrations are written to be
+idempotent (IF NOT EXISTS, column checks) because pre-versioning databases
+already contain parts of the schema.
+"""
+import sqlite3
+
+from cache.image_urls import image_urls
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def _existing_columns(cursor, table):
+    """Column names of a table"""
+    return {row[1] for row in cursor.execute(f'PRAGMA table_info({table})').fetchall()}
+
+
+def _add_columns(cursor, table, columns):
+    """ALTER TABLE ADD COLUMN for every column that is missing"""
+    existing = _existing_columns(cursor, table)
+    for column_name, column_type in columns:
+        if column_name not in existing:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column_name} {column_type}')
+
+
+def _create_items_table(cursor):
+    """Base items table plus the columns older databases got via ALTER TABLE"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            item_type TEXT,
+            image_url TEXT,
+            image_path TEXT,
+            count INTEGER DEFAULT 1,
+            notes TEXT,
+            damage_reduction TEXT,
+            min_temp REAL,
+            max_temp REAL,
+            radiation_resistance REAL,
+            radiation_scrub_rate REAL,
+            capacity REAL,
+            volume REAL,
+            is_favorite INTEGER DEFAULT 0,  -- NEU: Favoriten-Status (0=false, 1=true)
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Spalten, die frühere Versionen per ALTER TABLE nachgerüstet haben
+    _add_columns(cursor, 'items', [
+        ('damage_reduction', 'TEXT'),
+        ('min_temp', 'REAL'),
+        ('max_temp', 'REAL'),
+        ('radiation_resistance', 'REAL'),
+        ('radiation_scrub_rate', 'REAL'),
+        ('capacity', 'REAL'),
+        ('volume', 'REAL'),
+        ('added_to_inventory_at', 'TIMESTAMP'),  # NEU: Wann Item ins Inventar kam
+        ('is_favorite', 'INTEGER DEFAULT 0')  # NEU: Favoriten-Spalte hinzufügen
+    ])
+
+
+def _add_properties_json(cursor):
+    """Scraped CStone properties (used by API.add_item)"""
+    _add_columns(cursor, 'items', [('properties_json', 'TEXT')])
+
+
+def _create_indexes(cursor):
+    """Indexes tuned to the query shapes of ItemOperations and GearSetsManager"""
+    # Create index on name for faster searching
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_items_name ON items(name)')
+
+    # Create index on item_type for filtering
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_items_type ON items(item_type)')
+
+    # Inventar-Ansicht (count > 0): Kategorie-Seite nach Name, Sortierung nach Datum/Count/Typ
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_items_owned_type_name
+        ON items(item_type, name COLLATE NOCASE) WHERE count > 0
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_items_owned_added
+        ON items(added_to_inventory_at) WHERE count > 0
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_items_owned_count
+        ON items(count, name COLLATE NOCASE) WHERE count > 0
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_items_owned_type_sort
+        ON items(item_type COLLATE NOCASE, name COLLATE NOCASE) WHERE count > 0
+    ''')
+
+    # Inventar-Liste nach Name (nur count > 0) und Favoriten-Filter
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_items_owned_name
+        ON items(name COLLATE NOCASE) WHERE count > 0
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_items_owned_favorite_name
+        ON items(is_favorite, name COLLATE NOCASE) WHERE count > 0
+    ''')
+
+    # Gesamter Katalog nach Name (Suche-Tab / Fuse.js)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_items_name_nocase
+        ON items(name COLLATE NOCASE)
+    ''')
+
+    # Covering Index: Gear-Set-Varianten (item_type + name LIKE 'X%') und SUM(count) GROUP BY item_type
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_items_type_name_count
+        ON items(item_type, name, count)
+    ''')
+
+
+def _create_fts_index(cursor):
+    """
+    FTS5 trigram index on item names, mirrored from items by triggers.
+    Skipped (not an error) if the SQLite build has no FTS5 or no trigram
+    tokenizer; ItemOperations.search_items then uses LIKE.
+    """
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items_fts'"
+    ).fetchone() is not None
+
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+                name,
+                content='items',
+                content_rowid='id',
+                tokenize='trigram'
+            )
+        ''')
+    except sqlite3.OperationalError:
+        # FTS5 oder Trigram-Tokenizer nicht verfügbar (SQLite < 3.34)
+        logger.warning("FTS5 trigram tokenizer not available, item search uses LIKE", extra={'emoji': '⚠️'})
+        return
+
+    # Trigger halten den Index synchron mit der items-Tabelle
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN
+            INSERT INTO items_fts(rowid, name) VALUES (new.id, new.name);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN
+            INSERT INTO items_fts(items_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS items_fts_au AFTER UPDATE OF name ON items BEGIN
+            INSERT INTO items_fts(items_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            INSERT INTO items_fts(rowid, name) VALUES (new.id, new.name);
+        END
+    ''')
+
+    # Bestehende Datenbank: Index einmalig aus items aufbauen
+    if not exists:
+        cursor.execute("INSERT INTO items_fts(items_fts) VALUES ('rebuild')")
+
+
+def _create_item_stats(cursor):
+    """
+    item_stats: per-category aggregates kept current by triggers on items,
+    so stats endpoints are point reads instead of GROUP BY over the catalog.
+    NULL item_type is stored under '' (counts towards totals, not categories).
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS item_stats (
+            item_type TEXT PRIMARY KEY,
+            item_count INTEGER NOT NULL DEFAULT 0,      -- Zeilen in der DB
+            owned_count INTEGER NOT NULL DEFAULT 0,     -- Zeilen mit count > 0
+            total_count INTEGER NOT NULL DEFAULT 0,     -- SUM(count)
+            owned_total INTEGER NOT NULL DEFAULT 0,     -- SUM(count) WHERE count > 0
+            favorite_total INTEGER NOT NULL DEFAULT 0   -- SUM(count) WHERE is_favorite = 1 AND count > 0
+        )
+    ''')
+
+    # Beitrag einer Zeile (new/old) zu den Aggregaten.
+    # Kein INSERT OR IGNORE: in Triggern gilt die Konfliktbehandlung des äußeren
+    # Statements, ein UPSERT auf items würde sonst mit UNIQUE-Fehler abbrechen.
+    def delta(row, sign):
+        return f'''
+            INSERT INTO item_stats (item_type)
+            SELECT COALESCE({row}.item_type, '')
+            WHERE NOT EXISTS (SELECT 1 FROM item_stats WHERE item_type = COALESCE({row}.item_type, ''));
+            UPDATE item_stats SET
+                item_count = item_count {sign} 1,
+                owned_count = owned_count {sign} ({row}.count > 0),
+                total_count = total_count {sign} COALESCE({row}.count, 0),
+                owned_total = owned_total {sign} (CASE WHEN {row}.count > 0 THEN {row}.count ELSE 0 END),
+                favorite_total = favorite_total {sign}
+                    (CASE WHEN {row}.count > 0 AND {row}.is_favorite = 1 THEN {row}.count ELSE 0 END)
+            WHERE item_type = COALESCE({row}.item_type, '');
+        '''
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS item_stats_ai AFTER INSERT ON items BEGIN
+            {delta('new', '+')}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS item_stats_ad AFTER DELETE ON items BEGIN
+            {delta('old', '-')}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS item_stats_au AFTER UPDATE OF count, item_type, is_favorite ON items BEGIN
+            {delta('old', '-')}
+            {delta('new', '+')}
+        END
+    ''')
+
+    # Aggregate aus dem bestehenden Katalog aufbauen
+    cursor.execute('DELETE FROM item_stats')
+    cursor.execute('''
+        INSERT INTO item_stats (item_type, item_count, owned_count, total_count, owned_total, favorite_total)
+        SELECT COALESCE(item_type, ''),
+               COUNT(*),
+               SUM(count > 0),
+               COALESCE(SUM(count), 0),
+               SUM(CASE WHEN count > 0 THEN count ELSE 0 END),
+               SUM(CASE WHEN count > 0 AND is_favorite = 1 THEN count ELSE 0 END)
+        FROM items
+        GROUP BY COALESCE(item_type, '')
+    ''')
+
+
+# Lokale Zeit mit Millisekunden, im selben Format wie die Python-Zeitstempel der App
+EVENT_TIMESTAMP_SQL = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+
+
+def _create_inventory_history(cursor):
+    """
+    inventory_events: append-only log of count changes, written by triggers in
+    the same transaction as the change. inventory_snapshots: compacted copies
+    of all non-zero counts; a restore replays events on top of the newest
+    snapshot before the requested time (see database/history.py).
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS inventory_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_id INTEGER NOT NULL,
+            name TEXT,
+            old_count INTEGER,
+            new_count INTEGER,
+            created_at TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS inventory_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at TEXT NOT NULL,
+            last_event_id INTEGER NOT NULL  -- letztes Event, das im Snapshot enthalten ist
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS inventory_snapshot_items (
+            snapshot_id INTEGER NOT NULL,
+            item_id INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (snapshot_id, item_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_inventory_snapshots_created
+        ON inventory_snapshots(created_at)
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS inventory_events_ai AFTER INSERT ON items
+        WHEN new.count IS NOT 0 BEGIN
+            INSERT INTO inventory_events (item_id, name, old_count, new_count, created_at)
+            VALUES (new.id, new.name, 0, new.count, {EVENT_TIMESTAMP_SQL});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS inventory_events_au AFTER UPDATE OF count ON items
+        WHEN old.count IS NOT new.count BEGIN
+            INSERT INTO inventory_events (item_id, name, old_count, new_count, created_at)
+            VALUES (new.id, new.name, old.count, new.count, {EVENT_TIMESTAMP_SQL});
+        END
+    ''')
+
+    # Ausgangs-Snapshot: ohne ihn wäre der Stand vor dem ersten Event unbekannt
+    if cursor.execute('SELECT 1 FROM inventory_snapshots LIMIT 1').fetchone() is None:
+        cursor.execute(f'''
+            INSERT INTO inventory_snapshots (created_at, last_event_id)
+            VALUES ({EVENT_TIMESTAMP_SQL}, (SELECT COALESCE(MAX(id), 0) FROM inventory_events))
+        ''')
+        cursor.execute('''
+            INSERT INTO inventory_snapshot_items (snapshot_id, item_id, count)
+            SELECT ?, id, count FROM items WHERE count != 0
+        ''', (cursor.lastrowid,))
+
+
+def _add_image_url_columns(cursor):
+    """
+    thumb_url / medium_url / full_url: browser URLs of the cached image, computed
+    when a row is written (see cache/image_urls.py) instead of per read.
+    Existing rows are backfilled from image_path once.
+    """
+    _add_columns(cursor, 'items', [
+        ('thumb_url', 'TEXT'),
+        ('medium_url', 'TEXT'),
+        ('full_url', 'TEXT'),
+    ])
+
+    rows = cursor.execute('SELECT id, image_path FROM items WHERE image_path IS NOT NULL').fetchall()
+    updates = []
+    for item_id, image_path in rows:
+        urls = image_urls(image_path)
+        updates.append((urls['thumb_url'], urls['medium_url'], urls['full_url'], item_id))
+    cursor.executemany('UPDATE items SET thumb_url = ?, medium_url = ?, full_url = ? WHERE id = ?', updates)
+
+
+# Spalten, deren Änderung keine neue row_version auslöst
+_ROW_VERSION_IGNORED_COLUMNS = ('id', 'row_version', 'updated_at')
+
+
+def _create_row_version_update_trigger(cursor):
+    """
+    (Re)create the UPDATE trigger that stamps changed rows with a new
+    row_version. It compares every item column, so a migration that adds
+    columns to items must call this again.
+    """
+    columns = sorted(_existing_columns(cursor, 'items') - set(_ROW_VERSION_IGNORED_COLUMNS))
+    changed = ' OR '.join(f'old.{column} IS NOT new.{column}' for column in columns)
+    cursor.execute('DROP TRIGGER IF EXISTS items_row_version_au')
+    cursor.execute(f'''
+        CREATE TRIGGER items_row_version_au AFTER UPDATE ON items
+        WHEN {changed} BEGIN
+            UPDATE item_sync SET version = version + 1;
+            UPDATE items SET row_version = (SELECT version FROM item_sync) WHERE id = new.id;
+        END
+    ''')
+
+
+def _create_row_versions(cursor):
+    """
+    Delta sync for the frontend's catalog cache: every insert, update and
+    delete on items takes the next value of item_sync.version (as row_version
+    of the row, or as a tombstone for deleted names), so "what changed since
+    version N" is an index range scan. sync_id identifies this database; a
+    client holding versions of another database has to reload.
+    """
+    _add_columns(cursor, 'items', [('row_version', 'INTEGER')])
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS item_sync (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            sync_id TEXT NOT NULL,
+            version INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS item_tombstones (
+            row_version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_item_tombstones_name ON item_tombstones(name)')
+
+    # Bestehender Katalog: alles ist Version 1
+    if cursor.execute('SELECT 1 FROM item_sync').fetchone() is None:
+        cursor.execute("INSERT INTO item_sync (id, sync_id, version) VALUES (1, lower(hex(randomblob(8))), 1)")
+        cursor.execute('UPDATE items SET row_version = 1')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_items_row_version ON items(row_version)')
+
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS items_row_version_ai AFTER INSERT ON items BEGIN
+            UPDATE item_sync SET version = version + 1;
+            UPDATE items SET row_version = (SELECT version FROM item_sync) WHERE id = new.id;
+            DELETE FROM item_tombstones WHERE name = new.name;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS items_row_version_ad AFTER DELETE ON items BEGIN
+            UPDATE item_sync SET version = version + 1;
+            INSERT INTO item_tombstones (row_version, name) VALUES ((SELECT version FROM item_sync), old.name);
+        END
+    ''')
+    _create_row_version_update_trigger(cursor)
+
+
+def _drop_redundant_indexes(cursor):
+    """
+    Drop indexes another index already covers (every index is maintained by
+    each bulk upsert): idx_items_name duplicates the UNIQUE autoindex on name,
+    idx_items_type is a prefix of idx_items_type_name_count, and
+    idx_items_owned_type_name only differs from idx_items_owned_type_sort in
+    collation (the category filter compares item_type COLLATE NOCASE).
+    idx_items_owned_added gets name as second key, like idx_items_owned_count.
+    """
+    for index in ('idx_items_name', 'idx_items_type', 'idx_items_owned_type_name'):
+        cursor.execute(f'DROP INDEX IF EXISTS {index}')
+
+    # Ohne Name als zweiten Schlüssel wählt der Planer den Datums-Index nicht (Temp-B-Tree)
+    cursor.execute('DROP INDEX IF EXISTS idx_items_owned_added')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_items_owned_added_name
+        ON items(added_to_inventory_at, name COLLATE NOCASE) WHERE count > 0
+    ''')
+
+
+# (version, description, function) - append only, never renumber
+def _add_tombstone_retention(cursor):
+    """
+    Tombstones get a deletion time so they can be dropped after a retention
+    window; item_sync.oldest_version remembers the newest dropped one, the
+    lowest `since` a delta is still complete for (see
+    operations._prune_tombstones). Existing tombstones count as deleted now.
+    """
+    _add_columns(cursor, 'item_tombstones', [('created_at', 'TIMESTAMP')])
+    _add_columns(cursor, 'item_sync', [('oldest_version', 'INTEGER NOT NULL DEFAULT 0')])
+    cursor.execute('UPDATE item_tombstones SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL')
+
+    cursor.execute('DROP TRIGGER IF EXISTS items_row_version_ad')
+    cursor.execute('''
+        CREATE TRIGGER items_row_version_ad AFTER DELETE ON items BEGIN
+            UPDATE item_sync SET version = version + 1;
+            INSERT INTO item_tombstones (row_version, name, created_at)
+            VALUES ((SELECT version FROM item_sync), old.name, CURRENT_TIMESTAMP);
+        END
+    ''')
+
+
+MIGRATIONS = [
+    (1, 'items table and legacy columns', _create_items_table),
+    (2, 'properties_json column', _add_properties_json),
+    (3, 'query indexes', _create_indexes),
+    (4, 'FTS5 trigram name index', _create_fts_index),
+    (5, 'item_stats aggregates', _create_item_stats),
+    (6, 'inventory event log and snapshots', _create_inventory_history),
+    (7, 'precomputed image URL columns', _add_image_url_columns),
+    (8, 'row versions for catalog delta sync', _create_row_versions),
+    (9, 'drop redundant item indexes', _drop_redundant_indexes),
+    (10, 'tombstone retention for catalog delta sync', _add_tombstone_retention),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Current PRAGMA user_version of the database"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def run_migrations(conn):
+    """
+    Apply all migrations newer than the database's user_version.
+
+    Returns:
+        Number of migrations applied (0 if the schema is current)
+    """
+    version = get_schema_version(conn)
+    if version >= SCHEMA_VERSION:
+        return 0
+
+    applied = 0
+    for target, description, migrate in MIGRATIONS:
+        if target <= version:
+            continue
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute('BEGIN')
+            migrate(cursor)
+            # user_version ist transaktional: Version und Schema ändern sich gemeinsam
+            cursor.execute(f'PRAGMA user_version = {int(target)}')
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            logger.error(f"Schema migration {target} ({description}) failed", extra={'emoji': '❌'})
+            raise
+
+        logger.info(f"Schema migrated to version {target}: {description}", extra={'emoji': '✅'})
+        applied += 1
+
+    return applied
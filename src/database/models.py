@@ -3,78 +3,263 @@ Database models for Star Citizen Inventory Manager
 """
 import sqlite3
 import os
+import json
+import threading
+import weakref
+from contextlib import contextmanager
 from pathlib import Path
 
+from utils.logger import setup_logger
+from database.migrations import run_migrations
+
+logger = setup_logger(__name__)
+
+# User config with an optional "database" section overriding the profile below
+USER_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data', 'user_config.json'
+)
+
+# Connection profile: WAL lets readers (InvDetect, HTTP requests) run while a write is in progress
+DEFAULT_CONNECTION_PROFILE = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size_kb': 16384,
+    'mmap_size_mb': 64,
+    'temp_store': 'MEMORY',
+    'busy_timeout_ms': 5000,
+}
+
+_ALLOWED_PRAGMA_VALUES = {
+    'journal_mode': ('WAL', 'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY'),
+    'synchronous': ('OFF', 'NORMAL', 'FULL', 'EXTRA'),
+    'temp_store': ('DEFAULT', 'FILE', 'MEMORY'),
+}
+
+
+def load_connection_profile(config_path=USER_CONFIG_PATH):
+    """
+    Build the connection profile from the defaults and the "database"
+    section of user_config.json, e.g.
+    
+        "database": {"synchronous": "FULL", "cache_size_kb": 32768}
+    
+    Unknown keys and invalid values are ignored (with a warning).
+    """
+    profile = dict(DEFAULT_CONNECTION_PROFILE)
+    
+    overrides = {}
+    if config_path and os.path.exists(config_path):
+        try:
+            with open(config_path, 'r', encoding='utf-8') as f:
+                overrides = json.load(f).get('database', {})
+        except (json.JSONDecodeError, IOError, OSError, AttributeError) as e:
+            logger.warning(f"Could not read database profile from {config_path}: {e}", extra={'emoji': '⚠️'})
+            overrides = {}
+    
+    for key, value in overrides.items():
+        if key not in profile:
+            logger.warning(f"Unknown database profile setting '{key}' ignored", extra={'emoji': '⚠️'})
+            continue
+        try:
+            if key in _ALLOWED_PRAGMA_VALUES:
+                value = str(value).upper()
+                if value not in _ALLOWED_PRAGMA_VALUES[key]:
+                    raise ValueError(value)
+            else:
+                value = int(value)
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid value for database profile setting '{key}': {value!r}", extra={'emoji': '⚠️'})
+            continue
+        profile[key] = value
+    
+    return profile
+
+
+def apply_connection_profile(conn, profile):
+    """Apply the PRAGMAs of a connection profile to an open connection"""
+    conn.execute(f"PRAGMA busy_timeout = {profile['busy_timeout_ms']}")
+    conn.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+    conn.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+    # Negativer Wert = Größe in KiB statt in Seiten
+    conn.execute(f"PRAGMA cache_size = -{profile['cache_size_kb']}")
+    conn.execute(f"PRAGMA mmap_size = {profile['mmap_size_mb'] * 1024 * 1024}")
+    conn.execute(f"PRAGMA temp_store = {profile['temp_store']}")
+
+
+class _ThreadReader:
+    """Holder of a thread's reader connection in threading.local (see ConnectionPool.reader)"""
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn):
+        self.conn = conn
+
+
+class ConnectionPool:
+    """
+    One reader connection per thread plus a single writer connection behind a lock.
+    
+    Readers never share a cursor, so concurrent requests can't see each other's
+    rows; with WAL they also never block on the writer. A reader is closed when
+    its thread ends (the thread-local holder is finalized) or on release_reader().
+    """
+    
+    def __init__(self, db_path, profile):
+        # Absolut: Reader werden erst in Worker-Threads geöffnet, evtl. nach os.chdir()
+        self.db_path = os.path.abspath(db_path)
+        self.profile = profile
+        self._local = threading.local()
+        self._readers = set()
+        self._readers_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._write_depth = 0  # Verschachtelung von writer() (nur vom Lock-Halter geändert)
+        self.writer_conn = self._connect()
+        
+        # Datenversion: steigt mit jedem Commit, der Zeilen geändert hat
+        self._version_lock = threading.Lock()
+        self._version = 0
+        # Eigene Verbindung nur für PRAGMA data_version (Commits anderer Prozesse)
+        self._probe_conn = self._connect()
+        self._probe_version = self._probe_conn.execute('PRAGMA data_version').fetchone()[0]
+    
+    def _connect(self):
+        """Open a new connection with the connection profile applied"""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            timeout=self.profile['busy_timeout_ms'] / 1000
+        )
+        apply_connection_profile(conn, self.profile)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def reader(self):
+        """Return the calling thread's reader connection (created on first use)"""
+        holder = getattr(self._local, 'reader', None)
+        if holder is None:
+            conn = self._connect()
+            holder = self._local.reader = _ThreadReader(conn)
+            with self._readers_lock:
+                self._readers.add(conn)
+            # Thread beendet -> threading.local gibt den Holder frei -> Verbindung schließen
+            weakref.finalize(holder, self._close_reader, conn)
+        return holder.conn
+    
+    def release_reader(self):
+        """Close the calling thread's reader connection (a later reader() opens a new one)"""
+        holder = getattr(self._local, 'reader', None)
+        if holder is not None:
+            del self._local.reader
+            self._close_reader(holder.conn)
+    
+    def _close_reader(self, conn):
+        with self._readers_lock:
+            if conn not in self._readers:
+                # Schon geschlossen (release_reader oder close)
+                return
+            self._readers.discard(conn)
+        conn.close()
+    
+    @contextmanager
+    def writer(self):
+        """
+        Borrow the writer connection for one transaction.
+        Commits on success, rolls back and re-raises on error.
+        
+        Nested writer() blocks in the same thread join the outer transaction:
+        only the outermost block commits or rolls back (used by API.batch).
+        """
+        with self._write_lock:
+            if self._write_depth:
+                self._write_depth += 1
+                try:
+                    yield self.writer_conn
+                finally:
+                    self._write_depth -= 1
+                return
+            
+            self._write_depth = 1
+            changes_before = self.writer_conn.total_changes
+            try:
+                yield self.writer_conn
+                self.writer_conn.commit()
+            except BaseException:
+                self.writer_conn.rollback()
+                raise
+            finally:
+                self._write_depth = 0
+            if self.writer_conn.total_changes != changes_before:
+                with self._version_lock:
+                    self._version += 1
+                    # Eigenen Commit nicht nochmals als fremden zählen
+                    self._probe_version = self._probe_conn.execute('PRAGMA data_version').fetchone()[0]
+    
+    def data_version(self):
+        """
+        Counter that changes whenever the database content changed: bumped by
+        every writer() transaction that modified rows, and by commits of other
+        processes (bulk import scripts) detected via PRAGMA data_version.
+        Only meaningful within this process.
+        """
+        with self._version_lock:
+            probe = self._probe_conn.execute('PRAGMA data_version').fetchone()[0]
+            if probe != self._probe_version:
+                self._probe_version = probe
+                self._version += 1
+            return self._version
+    
+    def close(self):
+        """Close the writer and all reader connections"""
+        with self._readers_lock:
+            readers, self._readers = self._readers, set()
+        for conn in readers:
+            conn.close()
+        self._probe_conn.close()
+        self.writer_conn.close()
+
 
 class Database:
-    def __init__(self, db_path='data/inventory.db'):
-        """Initialize database connection"""
+    def __init__(self, db_path='data/inventory.db', profile=None):
+        """Initialize database connection pool
+        
+        Args:
+            profile: Connection profile dict (default: load_connection_profile())
+        """
         self.db_path = db_path
+        self.profile = profile if profile is not None else load_connection_profile()
         
         # Ensure data directory exists
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self.cursor = self.conn.cursor()
+        self.pool = ConnectionPool(db_path, self.profile)
+        # Writer connection (for single-threaded scripts; threads use reader()/writer())
+        self.conn = self.pool.writer_conn
+        self.fts_enabled = False
         self._create_tables()
     
+    def reader(self):
+        """Reader connection of the calling thread"""
+        return self.pool.reader()
+    
+    def release_reader(self):
+        """Close the calling thread's reader connection (see ConnectionPool.release_reader)"""
+        self.pool.release_reader()
+    
+    def writer(self):
+        """Context manager yielding the locked writer connection"""
+        return self.pool.writer()
+    
+    def data_version(self):
+        """Current data version (see ConnectionPool.data_version)"""
+        return self.pool.data_version()
+    
     def _create_tables(self):
-        """Create necessary tables if they don't exist"""
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE,
-                item_type TEXT,
-                image_url TEXT,
-                image_path TEXT,
-                count INTEGER DEFAULT 1,
-                notes TEXT,
-                damage_reduction TEXT,
-                min_temp REAL,
-                max_temp REAL,
-                radiation_resistance REAL,
-                radiation_scrub_rate REAL,
-                capacity REAL,
-                volume REAL,
-                is_favorite INTEGER DEFAULT 0,  -- NEU: Favoriten-Status (0=false, 1=true)
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Create index on name for faster searching
-        self.cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_items_name ON items(name)
-        ''')
-        
-        # Create index on item_type for filtering
-        self.cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_items_type ON items(item_type)
-        ''')
-        
-        # Add new columns if they don't exist (for existing databases)
-        columns_to_add = [
-            ('damage_reduction', 'TEXT'),
-            ('min_temp', 'REAL'),
-            ('max_temp', 'REAL'),
-            ('radiation_resistance', 'REAL'),
-            ('radiation_scrub_rate', 'REAL'),
-            ('capacity', 'REAL'),
-            ('volume', 'REAL'),
-            ('added_to_inventory_at', 'TIMESTAMP'),  # NEU: Wann Item ins Inventar kam
-            ('is_favorite', 'INTEGER DEFAULT 0')  # NEU: Favoriten-Spalte hinzufügen
-        ]
-        
-        for column_name, column_type in columns_to_add:
-            try:
-                self.cursor.execute(f'ALTER TABLE items ADD COLUMN {column_name} {column_type}')
-            except sqlite3.OperationalError:
-                # Column already exists
-                pass
-        
-        self.conn.commit()
+        """Bring the schema up to date (versioned migrations, see database/migrations.py)"""
+        with self.writer() as conn:
+            run_migrations(conn)
+            self.fts_enabled = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items_fts'"
+            ).fetchone() is not None
     
     def close(self):
-        """Close database connection"""
-        self.conn.close()
\ No newline at end of file
+        """Close all database connections"""
+        self.pool.close()
\ No newline at end of file
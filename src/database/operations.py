@@ -1,8 +1,160 @@
 """
 Database operations (CRUD) for inventory items
 """
-from datetime import datetime
+from datetime import datetime, timezone
 import json
+import os
+import sqlite3
+
+from cache.image_urls import image_urls
+
+# RETURNING is available from SQLite 3.35 on
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Erlaubte Sortierspalten der Inventar-Ansicht ('date' ist der Frontend-Name)
+INVENTORY_SORT_COLUMNS = {
+    'name': 'name',
+    'count': 'count',
+    'date': 'added_to_inventory_at',
+    'added_to_inventory_at': 'added_to_inventory_at',
+    'item_type': 'item_type',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+
+# Benannte Spaltenauswahl der Listenabfragen. Listen liefern nur, was Grid und
+# Suche anzeigen; notes, properties_json, Schutzwerte und Zeitstempel holt das
+# Frontend bei Bedarf über get_item. None = alle Spalten.
+ITEM_PROJECTIONS = {
+    'grid': ('id', 'name', 'item_type', 'count', 'is_favorite', 'image_url', 'icon_url'),
+    # + notes: Suchschlüssel des Such-Katalogs im Browser (Fuse.js)
+    'search': ('id', 'name', 'item_type', 'count', 'is_favorite', 'image_url', 'icon_url', 'notes'),
+    'full': None,
+}
+
+# Berechnete Spalten: Icon ist das lokale Bild, sonst die CStone-URL
+_COMPUTED_COLUMNS = {
+    'icon_url': "CASE WHEN items.image_path <> '' THEN items.full_url ELSE items.image_url END AS icon_url",
+}
+
+_PROJECTION_SQL = {
+    name: 'items.*, ' + _COMPUTED_COLUMNS['icon_url'] if columns is None
+    else ', '.join(_COMPUTED_COLUMNS.get(column, f'items.{column}') for column in columns)
+    for name, columns in ITEM_PROJECTIONS.items()
+}
+
+# Max. Anzahl Parameter pro IN (...) Abfrage (SQLite-Limit ältere Versionen: 999)
+MAX_SQL_VARIABLES = 500
+
+# Tombstones gelöschter Items werden so lange für den Delta-Sync aufgehoben;
+# ein Client mit älterem Stand lädt den ganzen Katalog neu
+TOMBSTONE_RETENTION_DAYS = 30
+
+_INSERT_ITEM_SQL = '''
+    INSERT INTO items
+    (name, item_type, image_url, image_path, thumb_url, medium_url, full_url, count, notes,
+     properties_json, added_to_inventory_at, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Count erhöhen, added_to_inventory_at bei 0 -> >0 setzen, fehlenden item_type nachtragen,
+# Bild-URLs auffrischen, wenn dasselbe Bild erneut gespeichert wurde
+_UPSERT_ITEM_SQL = _INSERT_ITEM_SQL + '''
+    ON CONFLICT(name) DO UPDATE SET
+        thumb_url = CASE WHEN excluded.image_path = image_path THEN excluded.thumb_url ELSE thumb_url END,
+        medium_url = CASE WHEN excluded.image_path = image_path THEN excluded.medium_url ELSE medium_url END,
+        full_url = CASE WHEN excluded.image_path = image_path THEN excluded.full_url ELSE full_url END,
+        count = CASE WHEN excluded.count > 0
+                     THEN count + excluded.count ELSE count END,
+        added_to_inventory_at = CASE WHEN excluded.count > 0 AND count = 0
+                                     THEN excluded.added_to_inventory_at
+                                     ELSE added_to_inventory_at END,
+        item_type = COALESCE(item_type, NULLIF(excluded.item_type, '')),
+        updated_at = CASE WHEN excluded.count > 0
+                            OR (item_type IS NULL AND NULLIF(excluded.item_type, '') IS NOT NULL)
+                          THEN excluded.updated_at ELSE updated_at END
+'''
+
+_INSERT_ITEM_IGNORE_SQL = _INSERT_ITEM_SQL + '''
+    ON CONFLICT(name) DO NOTHING
+'''
+
+
+def item_projection(name):
+    """
+    Validate a projection name (key of ITEM_PROJECTIONS).
+
+    Raises:
+        ValueError: unknown projection
+    """
+    if name not in ITEM_PROJECTIONS:
+        raise ValueError(f"Unknown projection: {name!r} (expected one of {', '.join(ITEM_PROJECTIONS)})")
+    return name
+
+
+def _fetch_dicts(conn, sql, params=()):
+    """
+    Run a SELECT and return the rows as dicts.
+    Uses a tuple cursor and zip() with the column names: about twice as fast
+    as dict(sqlite3.Row), which goes through the mapping protocol per column.
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+    columns = [description[0] for description in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+def utc_timestamp():
+    """created_at/updated_at: UTC, same format as SQLite's CURRENT_TIMESTAMP (column default)"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def local_timestamp():
+    """added_to_inventory_at: local time as text (no implicit sqlite3 datetime adapter)"""
+    return datetime.now().isoformat(' ')
+
+
+def _write_times():
+    """(local, utc) timestamps of one write, see _item_params"""
+    return local_timestamp(), utc_timestamp()
+
+
+def _item_params(now, name, item_type=None, image_url=None, image_path=None, notes=None,
+                 initial_count=1, properties_json=None):
+    """
+    Parameter tuple for _INSERT_ITEM_SQL (image URLs are computed here, once per write)
+
+    Args:
+        now: (local, utc) from _write_times()
+    """
+    local_now, utc_now = now
+    # Set added_to_inventory_at only if count > 0
+    added_at = local_now if initial_count > 0 else None
+    urls = image_urls(image_path)
+    return (name, item_type, image_url, image_path, urls['thumb_url'], urls['medium_url'], urls['full_url'],
+            initial_count, notes, properties_json, added_at, utc_now, utc_now)
+
+
+def _prune_tombstones(conn):
+    """
+    Drop tombstones older than TOMBSTONE_RETENTION_DAYS. Only deletes add
+    tombstones, so the delete paths prune in their own transaction.
+    item_sync.oldest_version keeps the newest dropped row_version: a
+    client whose `since` is below it may have missed a delete and gets
+    the full catalog from get_changes.
+
+    Returns:
+        Number of tombstones dropped
+    """
+    pruned_version = conn.execute(
+        "SELECT MAX(row_version) FROM item_tombstones WHERE created_at < datetime('now', ?)",
+        (f'-{TOMBSTONE_RETENTION_DAYS} days',)
+    ).fetchone()[0]
+    if pruned_version is None:
+        return 0
+    conn.execute('UPDATE item_sync SET oldest_version = MAX(oldest_version, ?)', (pruned_version,))
+    return conn.execute('DELETE FROM item_tombstones WHERE row_version <= ?', (pruned_version,)).rowcount
 
 
 class ItemOperations:
@@ -13,90 +165,161 @@ class ItemOperations:
     def add_item(self, name, item_type=None, image_url=None, image_path=None, notes=None, initial_count=1, properties_json=None):
         """Add a new item or increment count if exists
         
+        Single UPSERT statement: the count increment, the added_to_inventory_at
+        stamp (0 -> >0) and the item_type backfill all happen in SQL. Whether
+        the row is new is looked up in the same transaction before the UPSERT.
+        
         Args:
             initial_count: Starting count for new items (default 1, use 0 for imports)
         """
         try:
-            # Check if item already exists
-            existing = self.get_item_by_name(name)
+            params = _item_params(_write_times(), name, item_type, image_url, image_path, notes,
+                                  initial_count, properties_json)
             
-            if existing:
-                # Item exists - only increment if initial_count > 0
-                if initial_count > 0:
-                    new_count = existing['count'] + initial_count
-                    
-                    # Setze added_to_inventory_at, wenn Item von 0 zu >0 wechselt
-                    if existing['count'] == 0 and new_count > 0:
-                        self.db.cursor.execute('''
-                            UPDATE items 
-                            SET count = ?, updated_at = ?, added_to_inventory_at = ?
-                            WHERE name = ?
-                        ''', (new_count, datetime.now(), datetime.now(), name))
-                    else:
-                        self.db.cursor.execute('''
-                            UPDATE items 
-                            SET count = ?, updated_at = ? 
-                            WHERE name = ?
-                        ''', (new_count, datetime.now(), name))
+            with self.db.writer() as conn:
+                # Schreibsperre vor dem Nachsehen: kein anderer Prozess legt die Zeile dazwischen an
+                # (in einer äußeren Transaktion, z.B. API.batch, ist sie schon offen)
+                if not conn.in_transaction:
+                    conn.execute('BEGIN IMMEDIATE')
+                exists = conn.execute('SELECT 1 FROM items WHERE name = ?', (name,)).fetchone() is not None
+                if SQLITE_HAS_RETURNING:
+                    row = conn.execute(_UPSERT_ITEM_SQL + ' RETURNING count', params).fetchone()
+                else:
+                    # SQLite < 3.35: UPSERT ohne RETURNING, Ergebnis nachlesen
+                    conn.execute(_UPSERT_ITEM_SQL, params)
+                    row = conn.execute('SELECT count FROM items WHERE name = ?', (name,)).fetchone()
+            
+            action = 'updated' if exists else 'added'
+            return {'success': True, 'action': action, 'count': row['count']}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    def add_items_bulk(self, items, chunk_size=500, skip_existing=False):
+        """
+        Add many items at once: executemany UPSERT, one transaction per chunk.
+        
+        Args:
+            items: Iterable of dicts with the add_item keyword arguments
+                   (name, item_type, image_url, image_path, notes, initial_count, properties_json).
+                   Consumed lazily, so generators work.
+            chunk_size: Rows per transaction
+            skip_existing: If True, items already in the DB are left untouched ('skipped')
+                           instead of having their count incremented ('updated')
+        
+        Returns:
+            {'success': bool, 'added': int, 'updated': int, 'skipped': int, 'failed': int,
+             'results': [{'name': str, 'action': 'added'|'updated'|'skipped'|'failed'}, ...]}
+            results are in input order.
+        """
+        sql = _INSERT_ITEM_IGNORE_SQL if skip_existing else _UPSERT_ITEM_SQL
+        results = []
+        chunk = []
+        
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                results.extend(self._add_items_chunk(chunk, sql, skip_existing))
+                chunk = []
+        if chunk:
+            results.extend(self._add_items_chunk(chunk, sql, skip_existing))
+        
+        summary = {'success': True, 'added': 0, 'updated': 0, 'skipped': 0, 'failed': 0}
+        for result in results:
+            summary[result['action']] += 1
+        summary['success'] = summary['failed'] == 0
+        summary['results'] = results
+        return summary
+    
+    def _add_items_chunk(self, chunk, sql, skip_existing):
+        """Write one chunk of add_items_bulk in a single transaction
+        
+        Parameters are built per row first: an item with bad fields (e.g. an
+        unexpected key) is reported as failed on its own, the rest is written.
+        """
+        now = _write_times()
+        results = [None] * len(chunk)
+        rows = []  # (index, name, params)
+        
+        for index, item in enumerate(chunk):
+            name = item.get('name')
+            if not name:
+                results[index] = {'name': '', 'action': 'skipped', 'error': 'No name provided'}
+                continue
+            try:
+                rows.append((index, name, _item_params(now, **item)))
+            except Exception as e:
+                results[index] = {'name': name, 'action': 'failed', 'error': str(e)}
+        
+        if not rows:
+            return results
+        
+        try:
+            with self.db.writer() as conn:
+                existing = self.get_existing_names([name for _, name, _ in rows], conn)
                 
-                # Check if item_type was missing and is now provided (important for imported items)
-                if existing['item_type'] is None and item_type:
-                    self.db.cursor.execute('''
-                        UPDATE items 
-                        SET item_type = ?, updated_at = ? 
-                        WHERE name = ?
-                    ''', (item_type, datetime.now(), name))
-                        
-                self.db.conn.commit()
-                return {'success': True, 'action': 'updated', 'count': new_count}
-            else:
-                # Item is new
-                # Set added_to_inventory_at only if count > 0
-                added_at = datetime.now() if initial_count > 0 else None
+                for index, name, _ in rows:
+                    if name in existing:
+                        results[index] = {'name': name, 'action': 'skipped' if skip_existing else 'updated'}
+                    else:
+                        results[index] = {'name': name, 'action': 'added'}
+                        # Doppelte Namen im selben Chunk: nur das erste ist neu
+                        existing.add(name)
                 
-                self.db.cursor.execute('''
-                    INSERT INTO items 
-                    (name, item_type, image_url, image_path, count, notes, properties_json, added_to_inventory_at) 
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (name, item_type, image_url, image_path, initial_count, notes, properties_json, added_at))
-                self.db.conn.commit()
-                return {'success': True, 'action': 'added', 'count': initial_count}
+                conn.executemany(sql, [params for _, _, params in rows])
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            for index, name, _ in rows:
+                results[index] = {'name': name, 'action': 'failed', 'error': str(e)}
+        
+        return results
+    
+    def get_existing_names(self, names, conn=None):
+        """Return the subset of names that already exist in the DB
+        
+        Args:
+            conn: Connection to query (default: reader of the calling thread)
+        """
+        conn = conn or self.db.reader()
+        existing = set()
+        for i in range(0, len(names), MAX_SQL_VARIABLES):
+            batch = names[i:i + MAX_SQL_VARIABLES]
+            placeholders = ', '.join('?' * len(batch))
+            rows = conn.execute(f'SELECT name FROM items WHERE name IN ({placeholders})', batch).fetchall()
+            existing.update(row['name'] for row in rows)
+        return existing
 
     def get_item_by_name(self, name):
         """Retrieve one item by name"""
-        self.db.cursor.execute('SELECT * FROM items WHERE name = ?', (name,))
-        result = self.db.cursor.fetchone()
+        result = self.db.reader().execute('SELECT * FROM items WHERE name = ?', (name,)).fetchone()
         return dict(result) if result else None
 
     def update_item_count(self, name, count):
         """Update the count of an existing item"""
         count = int(count)
-        now = datetime.now()
         
-        # Holen des aktuellen Counts, um zu prüfen, ob der added_to_inventory_at Zeitstempel aktualisiert werden muss
-        existing = self.get_item_by_name(name)
-        if not existing:
-             return {'success': False, 'error': f"Item '{name}' not found."}
-        
-        current_count = existing['count']
-        added_at = existing['added_to_inventory_at']
-        
-        if count > 0 and (current_count == 0 or added_at is None):
-            # Item wird neu ins Inventar aufgenommen oder hatte keinen Zeitstempel
-            added_at = now
-        elif count == 0:
-            # Item wird auf 0 gesetzt
-            added_at = None
-
         try:
-            self.db.cursor.execute('''
-                UPDATE items 
-                SET count = ?, updated_at = ?, added_to_inventory_at = ? 
-                WHERE name = ?
-            ''', (count, now, added_at, name))
-            self.db.conn.commit()
+            with self.db.writer() as conn:
+                # Holen des aktuellen Counts, um zu prüfen, ob der added_to_inventory_at Zeitstempel aktualisiert werden muss
+                existing = conn.execute(
+                    'SELECT count, added_to_inventory_at FROM items WHERE name = ?', (name,)
+                ).fetchone()
+                if not existing:
+                    return {'success': False, 'error': f"Item '{name}' not found."}
+                
+                current_count = existing['count']
+                added_at = existing['added_to_inventory_at']
+                
+                if count > 0 and (current_count == 0 or added_at is None):
+                    # Item wird neu ins Inventar aufgenommen oder hatte keinen Zeitstempel
+                    added_at = local_timestamp()
+                elif count == 0:
+                    # Item wird auf 0 gesetzt
+                    added_at = None
+                
+                conn.execute('''
+                    UPDATE items 
+                    SET count = ?, updated_at = ?, added_to_inventory_at = ? 
+                    WHERE name = ?
+                ''', (count, utc_timestamp(), added_at, name))
             return {'success': True}
         except Exception as e:
             return {'success': False, 'error': str(e)}
@@ -104,24 +327,73 @@ class ItemOperations:
     def toggle_favorite_status(self, name, status):
         """Toggle the favorite status (0 or 1) of an item."""
         try:
-            self.db.cursor.execute('''
-                UPDATE items 
-                SET is_favorite = ?, updated_at = ? 
-                WHERE name = ?
-            ''', (status, datetime.now(), name))
-            self.db.conn.commit()
+            with self.db.writer() as conn:
+                conn.execute('''
+                    UPDATE items 
+                    SET is_favorite = ?, updated_at = ? 
+                    WHERE name = ?
+                ''', (status, utc_timestamp(), name))
             return {'success': True, 'is_favorite': status}
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
-    def get_all_items(self, is_favorite=None, include_zero_count=False):
+    def update_item_image(self, name, image_url, image_path, item_type=None):
+        """
+        Set the image of an existing item together with its URL columns
+        (thumb_url/medium_url/full_url); item_type is only changed if given.
+        """
+        urls = image_urls(image_path)
+        try:
+            with self.db.writer() as conn:
+                conn.execute('''
+                    UPDATE items
+                    SET item_type = COALESCE(?, item_type), image_url = ?, image_path = ?,
+                        thumb_url = ?, medium_url = ?, full_url = ?, updated_at = ?
+                    WHERE name = ?
+                ''', (item_type, image_url, image_path, urls['thumb_url'], urls['medium_url'], urls['full_url'],
+                      utc_timestamp(), name))
+            return {'success': True, **urls}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    def refresh_image_urls(self, exists=os.path.isfile):
+        """
+        Recompute thumb_url/medium_url/full_url from image_path, e.g. after
+        image cache files were removed. Only rows whose URLs change are written.
+
+        Args:
+            exists: File existence check (ImageCache.has_file answers from its manifest)
+
+        Returns:
+            Number of updated rows
+        """
+        with self.db.writer() as conn:
+            rows = conn.execute('''
+                SELECT id, image_path, thumb_url, medium_url, full_url
+                FROM items WHERE image_path IS NOT NULL
+            ''').fetchall()
+            updates = []
+            for row in rows:
+                urls = image_urls(row['image_path'], exists)
+                current = (urls['thumb_url'], urls['medium_url'], urls['full_url'])
+                if current != (row['thumb_url'], row['medium_url'], row['full_url']):
+                    updates.append(current + (row['id'],))
+            if updates:
+                conn.executemany(
+                    'UPDATE items SET thumb_url = ?, medium_url = ?, full_url = ? WHERE id = ?', updates
+                )
+        return len(updates)
+
+    def get_all_items(self, is_favorite=None, include_zero_count=False, projection='full'):
         """
         Retrieve all items from the database.
         
         Args:
             is_favorite (int, optional): Filter by favorite status (1 or 0).
             include_zero_count (bool): If False, only return items with count > 0 (Inventory View).
+            projection: Columns per row, key of ITEM_PROJECTIONS
         """
+        columns = _PROJECTION_SQL[item_projection(projection)]
         where_clauses = []
         params = []
         
@@ -136,15 +408,128 @@ class ItemOperations:
             
         where_sql = ' WHERE ' + ' AND '.join(where_clauses) if where_clauses else ''
         
-        query = f'SELECT * FROM items {where_sql} ORDER BY name COLLATE NOCASE'
+        query = f'SELECT {columns} FROM items {where_sql} ORDER BY name COLLATE NOCASE'
         
-        self.db.cursor.execute(query, params)
-        return [dict(row) for row in self.db.cursor.fetchall()]
+        return _fetch_dicts(self.db.reader(), query, params)
 
-    def search_items(self, query, include_zero_count=True):
+    def get_inventory_page(self, category=None, is_favorite=None, query=None,
+                           sort_by='name', sort_order='asc', limit=None, offset=0, projection='full'):
+        """
+        One page of the inventory view (count > 0), filtered and sorted in SQL.
+        
+        Args:
+            category: item_type filter ('Favorites' = is_favorite filter)
+            is_favorite (int, optional): Filter by favorite status (1 or 0)
+            query: Name filter (FTS5 when available, LIKE otherwise)
+            sort_by: Key of INVENTORY_SORT_COLUMNS (unknown keys fall back to name)
+            sort_order: 'asc' or 'desc'
+            limit: Page size (None = all rows)
+            offset: Rows to skip
+            projection: Columns per row, key of ITEM_PROJECTIONS
+        
+        Returns:
+            (items, total) - total is the row count without limit/offset
+        """
+        columns = _PROJECTION_SQL[item_projection(projection)]
+        where_clauses = ['count > 0']
+        params = []
+        
+        if category == 'Favorites':
+            is_favorite = 1
+        elif category:
+            # NOCASE wie die Sortierung: beide nutzen idx_items_owned_type_sort
+            where_clauses.append('item_type = ? COLLATE NOCASE')
+            params.append(category)
+        
+        if is_favorite is not None:
+            where_clauses.append('is_favorite = ?')
+            params.append(is_favorite)
+        
+        if query:
+            if self.db.fts_enabled and len(query) >= 3:
+                where_clauses.append('id IN (SELECT rowid FROM items_fts WHERE items_fts MATCH ?)')
+                params.append('"' + query.replace('"', '""') + '"')
+            else:
+                where_clauses.append('name LIKE ?')
+                params.append(f'%{query}%')
+        
+        where_sql = ' WHERE ' + ' AND '.join(where_clauses)
+        
+        # Spaltenname nur aus der Whitelist; Text case-insensitive, NULL wie '' (zuerst bei asc)
+        column = INVENTORY_SORT_COLUMNS.get(sort_by, 'name')
+        direction = 'DESC' if str(sort_order).lower() == 'desc' else 'ASC'
+        if column == 'name':
+            order_sql = f'name COLLATE NOCASE {direction}'
+        elif column == 'item_type':
+            order_sql = f'item_type COLLATE NOCASE {direction}, name COLLATE NOCASE'
+        else:
+            order_sql = f'{column} {direction}, name COLLATE NOCASE'
+        
+        sql = f'SELECT {columns} FROM items {where_sql} ORDER BY {order_sql}'
+        page_params = list(params)
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            page_params += [int(limit), int(offset or 0)]
+        
+        conn = self.db.reader()
+        items = _fetch_dicts(conn, sql, page_params)
+        
+        # Ohne Limit ist die Seite bereits vollständig
+        if limit is None and not offset:
+            total = len(items)
+        else:
+            total = conn.execute(f'SELECT COUNT(*) FROM items {where_sql}', params).fetchone()[0]
+        
+        return items, total
+
+    def get_changes(self, since=0, sync_id=None, projection='full'):
+        """
+        Catalog rows changed since a row_version (delta sync of the frontend's search index).
+
+        Args:
+            since: Highest row_version the client already has (0: nothing)
+            sync_id: Database identity the client's versions belong to
+            projection: Columns per row, key of ITEM_PROJECTIONS
+
+        Returns:
+            {'sync_id': str, 'version': int, 'full': bool, 'items': [...], 'deleted': [names]}
+            full=True means items is the whole catalog (first load, other
+            database, a version from the future or one older than the retained
+            tombstones) and the client's copy is replaced.
+            Otherwise deleted names are applied first, then items (upsert by name).
+        """
+        columns = _PROJECTION_SQL[item_projection(projection)]
+        conn = self.db.reader()
+        # Version zuerst: alles bis dahin ist committet, spätere Zeilen kommen beim nächsten Mal erneut
+        current_id, version, oldest_version = conn.execute(
+            'SELECT sync_id, version, oldest_version FROM item_sync'
+        ).fetchone()
+
+        # Vor oldest_version gelöschte Namen sind nicht mehr bekannt
+        if since <= 0 or sync_id != current_id or since > version or since < oldest_version:
+            items = self.get_all_items(include_zero_count=True, projection=projection)
+            return {'sync_id': current_id, 'version': version, 'full': True, 'items': items, 'deleted': []}
+
+        items = _fetch_dicts(conn, f'SELECT {columns} FROM items WHERE row_version > ? ORDER BY row_version', (since,))
+        deleted = [row[0] for row in conn.execute(
+            'SELECT name FROM item_tombstones WHERE row_version > ? ORDER BY row_version', (since,)
+        )]
+        return {'sync_id': current_id, 'version': version, 'full': False, 'items': items, 'deleted': deleted}
+
+    def search_items(self, query, include_zero_count=True, projection='full'):
         """
         Search for items by name. Default behavior is to search ALL items (count >= 0).
+        Uses the FTS5 trigram index (ranked by bm25) when available, LIKE otherwise.
+        
+        Args:
+            projection: Columns per row, key of ITEM_PROJECTIONS
         """
+        columns = _PROJECTION_SQL[item_projection(projection)]
+        
+        # Trigram-Index braucht mindestens 3 Zeichen, kürzere Queries gehen über LIKE
+        if self.db.fts_enabled and len(query) >= 3:
+            return self._search_items_fts(query, include_zero_count, columns)
+        
         like_query = f'%{query}%'
         where_clauses = ['name LIKE ?']
         params = [like_query]
@@ -154,38 +539,73 @@ class ItemOperations:
         
         where_sql = ' WHERE ' + ' AND '.join(where_clauses) if where_clauses else ''
         
-        sql = f'SELECT * FROM items {where_sql} ORDER BY name COLLATE NOCASE'
+        sql = f'SELECT {columns} FROM items {where_sql} ORDER BY name COLLATE NOCASE'
+        
+        return _fetch_dicts(self.db.reader(), sql, params)
+    
+    def _search_items_fts(self, query, include_zero_count=True, columns='items.*'):
+        """Substring search over items_fts, best bm25 match first"""
+        # Query als FTS5-Phrase quoten, damit Sonderzeichen (-, ", *) keine Operatoren sind
+        match_query = '"' + query.replace('"', '""') + '"'
+        where_clauses = ['items_fts MATCH ?']
+        params = [match_query]
+        
+        if not include_zero_count:
+            where_clauses.append('items.count > 0')
+        
+        sql = f'''
+            SELECT {columns} FROM items_fts
+            JOIN items ON items.id = items_fts.rowid
+            WHERE {' AND '.join(where_clauses)}
+            ORDER BY bm25(items_fts), items.name COLLATE NOCASE
+        '''
         
-        self.db.cursor.execute(sql, params)
-        return [dict(row) for row in self.db.cursor.fetchall()]
+        return _fetch_dicts(self.db.reader(), sql, params)
         
     def get_category_stats(self):
-        """Get inventory stats by item category (shows all categories, even with count 0)"""
-        self.db.cursor.execute('''
-            SELECT item_type, SUM(count) as total_count
-            FROM items
-            WHERE item_type IS NOT NULL
-            GROUP BY item_type
-        ''')
-        stats = {row['item_type']: row['total_count'] for row in self.db.cursor.fetchall()}
-        
-        # Separate Abfrage für Favoriten (count > 0)
-        self.db.cursor.execute('SELECT SUM(count) as total_count FROM items WHERE is_favorite = 1 AND count > 0')
-        favorite_count = self.db.cursor.fetchone()['total_count']
-        if favorite_count and favorite_count > 0:
+        """Get inventory stats by item category (shows all categories, even with count 0)
+        
+        Reads the trigger-maintained item_stats table (one row per category).
+        """
+        conn = self.db.reader()
+        rows = conn.execute('''
+            SELECT item_type, total_count, favorite_total
+            FROM item_stats
+            WHERE item_count > 0
+        ''').fetchall()
+        stats = {row['item_type']: row['total_count'] for row in rows if row['item_type'] != ''}
+        
+        # Favoriten (count > 0) über alle Kategorien
+        favorite_count = sum(row['favorite_total'] for row in rows)
+        if favorite_count > 0:
             stats['Favorites'] = favorite_count
             
         return stats
+    
+    def get_inventory_totals(self):
+        """
+        Catalog and inventory totals from item_stats.
+        
+        Returns:
+            {'total_items_in_db': int, 'inventory_unique_items': int, 'total_item_count': int}
+        """
+        row = self.db.reader().execute('''
+            SELECT COALESCE(SUM(item_count), 0) AS total_items_in_db,
+                   COALESCE(SUM(owned_count), 0) AS inventory_unique_items,
+                   COALESCE(SUM(owned_total), 0) AS total_item_count
+            FROM item_stats
+        ''').fetchone()
+        return dict(row)
         
     def update_item_notes(self, name, notes):
         """Update item notes"""
         try:
-            self.db.cursor.execute('''
-                UPDATE items 
-                SET notes = ?, updated_at = ? 
-                WHERE name = ?
-            ''', (notes, datetime.now(), name))
-            self.db.conn.commit()
+            with self.db.writer() as conn:
+                conn.execute('''
+                    UPDATE items 
+                    SET notes = ?, updated_at = ? 
+                    WHERE name = ?
+                ''', (notes, utc_timestamp(), name))
             return {'success': True}
         except Exception as e:
             return {'success': False, 'error': str(e)}
@@ -193,8 +613,9 @@ class ItemOperations:
     def delete_item(self, name):
         """Delete an item (removes from DB)"""
         try:
-            self.db.cursor.execute('DELETE FROM items WHERE name = ?', (name,))
-            self.db.conn.commit()
+            with self.db.writer() as conn:
+                conn.execute('DELETE FROM items WHERE name = ?', (name,))
+                _prune_tombstones(conn)
             return {'success': True}
         except Exception as e:
             return {'success': False, 'error': str(e)}
@@ -202,9 +623,8 @@ class ItemOperations:
     def clear_inventory(self):
         """Set all item counts to 0 (empty inventory but keep items in database)"""
         try:
-            self.db.cursor.execute('UPDATE items SET count = 0, added_to_inventory_at = NULL')
-            self.db.conn.commit()
-            affected = self.db.cursor.rowcount
+            with self.db.writer() as conn:
+                affected = conn.execute('UPDATE items SET count = 0, added_to_inventory_at = NULL').rowcount
             return {'success': True, 'affected': affected}
         except Exception as e:
             return {'success': False, 'error': str(e)}
@@ -212,9 +632,9 @@ class ItemOperations:
     def delete_all_items(self):
         """Delete ALL items from database"""
         try:
-            self.db.cursor.execute('DELETE FROM items')
-            self.db.conn.commit()
-            affected = self.db.cursor.rowcount
+            with self.db.writer() as conn:
+                affected = conn.execute('DELETE FROM items').rowcount
+                _prune_tombstones(conn)
             return {'success': True, 'deleted': affected}
         except Exception as e:
             return {'success': False, 'error': str(e)}
\ No newline at end of file
@@ -0,0 +1,260 @@
+"""
+In-memory fuzzy search over item names (/api/search)
+
+Item names are split into lowercase word tokens. The index keeps a sorted
+vocabulary of all tokens (prefix lookups via bisect), trigram -> token
+postings (candidates for misspelled tokens) and token -> item postings.
+Every query token has to match some token of a name - exactly, as prefix,
+as substring or fuzzily (difflib ratio) - in any order; items are ranked by
+the average match quality.
+
+The index is loaded through ItemOperations.get_changes() and brought up to
+date before each search whenever Database.data_version() moved, so writes
+of every path (including other processes) arrive via the row versions of
+migration 8 without rebuilding the index.
+"""
+import bisect
+import heapq
+import re
+import threading
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_TOKEN_RE = re.compile(r'\w+')
+
+# Score eines Query-Tokens je nach Trefferart (1.0 = exakt gleiches Wort)
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.75   # + bis 0.2 je nach Anteil am Wort
+INFIX_SCORE = 0.6     # + bis 0.2 je nach Anteil am Wort
+FUZZY_WEIGHT = 0.7    # * difflib-Ratio
+
+# Tippfehler erst ab 3 Zeichen, und nur bei genügend Ähnlichkeit
+FUZZY_MIN_LENGTH = 3
+FUZZY_MIN_TRIGRAM_OVERLAP = 0.25
+FUZZY_MIN_RATIO = 0.75
+
+# Bonus, wenn der ganze Name der Query entspricht bzw. mit ihr beginnt
+NAME_EXACT_BONUS = 0.5
+NAME_PREFIX_BONUS = 0.25
+
+# Trefferzahl pro Suche: Standard und Obergrenze (kleinere Werte werden zu 1)
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 200
+
+
+def clamp_limit(limit):
+    """Search limit as int in 1..SEARCH_MAX_LIMIT (None -> SEARCH_DEFAULT_LIMIT)"""
+    if limit is None:
+        return SEARCH_DEFAULT_LIMIT
+    return min(max(int(limit), 1), SEARCH_MAX_LIMIT)
+
+
+def tokenize(text):
+    """Lowercase word tokens of a name or query"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _trigrams(token):
+    padded = f' {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ItemSearchIndex:
+    """Trigram/token index over item names, kept current via row versions"""
+
+    def __init__(self, operations):
+        self.operations = operations
+        self._lock = threading.Lock()
+        # Stand des Index (siehe ItemOperations.get_changes)
+        self._sync_id = None
+        self._version = 0
+        self._data_version = None
+
+        self._items = {}                   # name -> catalog row
+        self._item_tokens = {}             # name -> tokens of the name
+        self._postings = {}                # token -> names
+        self._vocabulary = []              # sorted tokens
+        self._trigrams = defaultdict(set)  # trigram -> tokens
+
+    def __len__(self):
+        return len(self._items)
+
+    def refresh(self):
+        """
+        Apply catalog changes since the last refresh (full load on first use).
+
+        Returns:
+            True if the index changed
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self):
+        # data_version vor get_changes: ein Commit dazwischen wird beim nächsten Mal nachgeholt
+        data_version = self.operations.db.data_version()
+        if data_version == self._data_version:
+            return False
+
+        # Nur die Listen-Spalten im Speicher halten (/api/search liefert diese Zeilen)
+        changes = self.operations.get_changes(self._version, self._sync_id, projection='search')
+        if changes['full']:
+            self._clear()
+        for name in changes['deleted']:
+            self._remove(name)
+        for item in changes['items']:
+            self._add(item)
+
+        if changes['full']:
+            logger.info(f"Search index built ({len(self._items)} items, {len(self._vocabulary)} tokens)",
+                        extra={'emoji': '🔍'})
+        self._sync_id = changes['sync_id']
+        self._version = changes['version']
+        self._data_version = data_version
+        return bool(changes['full'] or changes['items'] or changes['deleted'])
+
+    def _clear(self):
+        self._items.clear()
+        self._item_tokens.clear()
+        self._postings.clear()
+        self._vocabulary.clear()
+        self._trigrams.clear()
+
+    def _add(self, item):
+        name = item['name']
+        if name in self._items:
+            # Tokens hängen nur am Namen, nur die Zeile ersetzen
+            self._items[name] = item
+            return
+
+        tokens = tokenize(name)
+        self._items[name] = item
+        self._item_tokens[name] = tokens
+        for token in tokens:
+            names = self._postings.get(token)
+            if names is None:
+                names = self._postings[token] = set()
+                bisect.insort(self._vocabulary, token)
+                for trigram in _trigrams(token):
+                    self._trigrams[trigram].add(token)
+            names.add(name)
+
+    def _remove(self, name):
+        tokens = self._item_tokens.pop(name, None)
+        if tokens is None:
+            return
+        del self._items[name]
+        for token in set(tokens):
+            names = self._postings[token]
+            names.discard(name)
+            if names:
+                continue
+            del self._postings[token]
+            del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+            for trigram in _trigrams(token):
+                tokens_with_trigram = self._trigrams[trigram]
+                tokens_with_trigram.discard(token)
+                if not tokens_with_trigram:
+                    del self._trigrams[trigram]
+
+    def _match_token(self, query_token):
+        """Vocabulary tokens matching a query token -> score"""
+        matches = {}
+
+        # Exakt und Präfix: zusammenhängender Bereich im sortierten Vokabular
+        start = bisect.bisect_left(self._vocabulary, query_token)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(query_token):
+                break
+            if token == query_token:
+                matches[token] = EXACT_SCORE
+            else:
+                matches[token] = PREFIX_SCORE + 0.2 * len(query_token) / len(token)
+
+        if len(query_token) < FUZZY_MIN_LENGTH:
+            return matches
+
+        # Teilwort und Tippfehler: Kandidaten über gemeinsame Trigramme
+        query_trigrams = _trigrams(query_token)
+        shared = defaultdict(int)
+        for trigram in query_trigrams:
+            for token in self._trigrams.get(trigram, ()):
+                shared[token] += 1
+
+        for token, count in shared.items():
+            if token in matches:
+                continue
+            if query_token in token:
+                matches[token] = INFIX_SCORE + 0.2 * len(query_token) / len(token)
+                continue
+            # Dice-Koeffizient der Trigramme als billiger Vorfilter vor difflib
+            overlap = 2 * count / (len(query_trigrams) + len(_trigrams(token)))
+            if overlap < FUZZY_MIN_TRIGRAM_OVERLAP:
+                continue
+            ratio = SequenceMatcher(None, query_token, token).ratio()
+            if ratio >= FUZZY_MIN_RATIO:
+                matches[token] = FUZZY_WEIGHT * ratio
+
+        return matches
+
+    def search(self, query, limit=None):
+        """
+        Ranked, typo-tolerant search; the order of query words does not matter.
+
+        Args:
+            query: Search text
+            limit: Max. number of results, clamped to 1..SEARCH_MAX_LIMIT
+                   (None: all, for internal callers)
+
+        Returns:
+            (items, total) - catalog rows (copies) with a 'score' key, best
+            match first; total is the number of matches before the limit
+        """
+        if limit is not None:
+            limit = clamp_limit(limit)
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return [], 0
+
+        with self._lock:
+            self._refresh()
+
+            # Pro Query-Token: Name -> bester Score eines seiner Wörter
+            token_scores = []
+            for query_token in query_tokens:
+                scores = {}
+                for token, score in self._match_token(query_token).items():
+                    for name in self._postings[token]:
+                        if score > scores.get(name, 0):
+                            scores[name] = score
+                if not scores:
+                    return [], 0
+                token_scores.append(scores)
+
+            # Nur Namen, in denen jedes Query-Token vorkommt (kleinste Menge zuerst)
+            token_scores.sort(key=len)
+            normalized_query = ' '.join(query_tokens)
+            ranked = []
+            for name, score in token_scores[0].items():
+                total_score = score
+                for scores in token_scores[1:]:
+                    other = scores.get(name)
+                    if other is None:
+                        break
+                    total_score += other
+                else:
+                    total_score /= len(query_tokens)
+                    normalized_name = ' '.join(self._item_tokens[name])
+                    if normalized_name == normalized_query:
+                        total_score += NAME_EXACT_BONUS
+                    elif normalized_name.startswith(normalized_query):
+                        total_score += NAME_PREFIX_BONUS
+                    ranked.append((-total_score, len(name), name.lower(), name))
+
+            total = len(ranked)
+            ranked = sorted(ranked) if limit is None else heapq.nsmallest(limit, ranked)
+            return [dict(self._items[name], score=round(-negative_score, 3))
+                    for negative_score, _, _, name in ranked], total
@@ -46,6 +46,8 @@ def import_from_csv(filename='items.csv'):
     skipped = 0
     errors = 0
     
+    rows = []
+    
     with open(filename, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         
@@ -58,33 +60,31 @@ def import_from_csv(filename='items.csv'):
                 if not name:
                     continue
                 
-                # Check if exists
-                existing = operations.get_item_by_name(name)
-                if existing:
-                    print(f"⏭️  [Zeile {row_num}] '{name}' bereits vorhanden")
-                    skipped += 1
-                    continue
-                
-                # Import
-                result = operations.add_item(
-                    name=name,
-                    item_type=item_type,
-                    image_url=None,
-                    image_path=None,
-                    notes=notes
-                )
-                
-                if result['success']:
-                    print(f"✅ [Zeile {row_num}] '{name}' importiert")
-                    imported += 1
-                else:
-                    print(f"❌ [Zeile {row_num}] Fehler bei '{name}'")
-                    errors += 1
+                rows.append((row_num, {
+                    'name': name,
+                    'item_type': item_type,
+                    'notes': notes
+                }))
             
             except Exception as e:
                 print(f"❌ [Zeile {row_num}] Fehler: {e}")
                 errors += 1
     
+    # Import (eine Transaktion pro Chunk statt ein Commit pro Zeile)
+    result = operations.add_items_bulk((item for _, item in rows), skip_existing=True)
+    
+    for (row_num, item), outcome in zip(rows, result['results']):
+        name = item['name']
+        if outcome['action'] == 'skipped':
+            print(f"⏭️  [Zeile {row_num}] '{name}' bereits vorhanden")
+            skipped += 1
+        elif outcome['action'] == 'added':
+            print(f"✅ [Zeile {row_num}] '{name}' importiert")
+            imported += 1
+        else:
+            print(f"❌ [Zeile {row_num}] Fehler bei '{name}'")
+            errors += 1
+    
     print()
     print("=" * 60)
     print(f"Import abgeschlossen!")
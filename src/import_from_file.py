@@ -30,6 +30,8 @@ def import_from_file(filename='items_to_import.txt'):
     imported = 0
     skipped = 0
     
+    rows = []
+    
     with open(filename, 'r', encoding='utf-8') as f:
         for line_num, line in enumerate(f, 1):
             line = line.strip()
@@ -46,27 +48,25 @@ def import_from_file(filename='items_to_import.txt'):
             if not item_name:
                 continue
             
-            # Check if exists
-            existing = operations.get_item_by_name(item_name)
-            if existing:
-                print(f"⏭️  [{line_num}] '{item_name}' bereits vorhanden")
-                skipped += 1
-                continue
-            
-            # Import
-            result = operations.add_item(
-                name=item_name,
-                item_type=item_type,
-                image_url=None,
-                image_path=None,
-                notes="Manually imported"
-            )
-            
-            if result['success']:
-                print(f"✅ [{line_num}] '{item_name}' importiert")
-                imported += 1
-            else:
-                print(f"❌ [{line_num}] Fehler bei '{item_name}'")
+            rows.append((line_num, {
+                'name': item_name,
+                'item_type': item_type,
+                'notes': "Manually imported"
+            }))
+    
+    # Import (eine Transaktion pro Chunk statt ein Commit pro Zeile)
+    result = operations.add_items_bulk((item for _, item in rows), skip_existing=True)
+    
+    for (line_num, item), outcome in zip(rows, result['results']):
+        item_name = item['name']
+        if outcome['action'] == 'skipped':
+            print(f"⏭️  [{line_num}] '{item_name}' bereits vorhanden")
+            skipped += 1
+        elif outcome['action'] == 'added':
+            print(f"✅ [{line_num}] '{item_name}' importiert")
+            imported += 1
+        else:
+            print(f"❌ [{line_num}] Fehler bei '{item_name}'")
     
     print()
     print("=" * 60)
@@ -0,0 +1,72 @@
+"""
+GearCrate - Browser Mode Server (asyncio)
+- Same routes and web UI as main_browser.py
+- One event loop for all connections, API calls on executors
+  (see api/async_server.py)
+"""
+import asyncio
+import os
+import sys
+import webbrowser
+
+# Add src to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from api.backend import API
+from api.async_server import AsyncHTTPServer
+
+
+async def _serve(server, port):
+    await server.start('', port)
+
+    print("=" * 60)
+    print("📦 GearCrate - Star Citizen Inventory Manager (asyncio)")
+    print("=" * 60)
+    print(f"✅ Server running on http://localhost:{port}")
+    print(f"✅ Static image serving enabled")
+    print(f"✅ Cache directory: {server.cache_dir}")
+    print(f"✅ Executors: {server.workers} database, {server.long_running_workers} network")
+    print(f"✅ HTTP/1.1 keep-alive ({server.keep_alive_timeout} s idle timeout)")
+    print("=" * 60)
+    print("📂 Opening browser...")
+
+    # Open browser
+    webbrowser.open(f'http://localhost:{port}/index.html')
+
+    print("\n⌨️  Press Ctrl+C to stop server\n")
+
+    await server.serve_forever()
+
+
+def start_server():
+    """Start the asyncio HTTP server"""
+    port = 8080
+
+    # Initialize API
+    api = API()
+
+    server = AsyncHTTPServer(
+        api,
+        web_dir=os.path.join(project_root, 'web'),
+        # Set cache directory to images subfolder
+        cache_dir=os.path.join(project_root, 'data', 'images')
+    )
+
+    # JS/CSS/HTML einmalig komprimieren statt pro Request
+    server.precompress_static()
+
+    try:
+        asyncio.run(_serve(server, port))
+    except KeyboardInterrupt:
+        print("\n\n🛑 Server stopping...")
+        try:
+            api.close()
+        except:
+            pass
+        server.close()
+        print("✅ GearCrate stopped!")
+
+
+if __name__ == '__main__':
+    start_server()
@@ -7,235 +7,398 @@ GearCrate - Browser Mode Server (FIXED)
 import os
 import sys
 import webbrowser
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
+from http.server import SimpleHTTPRequestHandler
+from urllib.parse import urlparse
 import json
+import email.utils
+import select
+import socket
 
 # Add src to path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-from api.backend import API
+from api.backend import API, NON_API_METHODS
+from api.http_server import (PooledHTTPServer, KeepAliveMixin, IMAGE_CONTENT_TYPES, parse_byte_range,
+                             etag_matches, is_fresh)
+from api.routes import build_get_routes
+from api import serialization
+from api.events import format_event, SSE_KEEPALIVE, SSE_KEEPALIVE_SECONDS, SSE_CLIENT_CHECK_SECONDS, SSE_RETRY_MS
+from api.compression import StaticAssetCache, choose_encoding, compress, COMPRESSION_MIN_BYTES
 
+# ETag-Präfix pro Serverstart: die Datenversion beginnt bei jedem Start neu
+_ETAG_PREFIX = os.urandom(4).hex()
 
-class GearCrateAPIHandler(SimpleHTTPRequestHandler):
-    """HTTP Request Handler with API Support & Static Image Serving"""
+class GearCrateAPIHandler(KeepAliveMixin, SimpleHTTPRequestHandler):
+    """HTTP Request Handler with API Support & Static Image Serving (HTTP/1.1 keep-alive)"""
     api = None
     cache_dir = None
     
+    # GET-Routen (siehe api.routes.build_get_routes), POST: API-Methoden nach Name
+    get_routes = None
+    _post_methods = {}
+    _post_methods_api = None
+    
     def __init__(self, *args, **kwargs):
         # Set the web directory as base
         web_dir = os.path.join(project_root, 'web')
         os.chdir(web_dir)
         super().__init__(*args, **kwargs)
     
+    # Vorkomprimierte Dateien unter web/ (siehe precompress_static)
+    static_assets = None
+    
+    # ETag der aktuellen Antwort (nur für versionierte Routen gesetzt)
+    _etag = None
+    
+    def handle_one_request(self):
+        # Keep-Alive: dieselbe Instanz bedient alle Requests der Verbindung
+        self._etag = None
+        super().handle_one_request()
+    
+    @classmethod
+    def precompress_static(cls, web_dir):
+        """Compress the JS/CSS/HTML under web_dir once, before serving"""
+        cls.static_assets = StaticAssetCache(web_dir)
+        cls.static_assets.precompress()
+    
+    def _content_encoding(self):
+        """Negotiated content coding for this request ('br', 'gzip' or None)"""
+        return choose_encoding(self.headers.get('Accept-Encoding'))
+    
+    def _send_json(self, result):
+        """Send an API result as JSON (compressed if the client accepts it and it is large enough)"""
+        body = serialization.dumps(result)
+        encoding = self._content_encoding()
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Vary', 'Accept-Encoding')
+        if encoding and len(body) >= COMPRESSION_MIN_BYTES:
+            body = compress(body, encoding)
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', len(body))
+        if self._etag:
+            # no-cache: Browser darf cachen, muss aber per If-None-Match nachfragen
+            self.send_header('ETag', self._etag)
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _etag_matches(self, etag):
+        """True if If-None-Match lists `etag` (weak comparison, '*' matches anything)"""
+        return etag_matches(self.headers.get('If-None-Match'), etag)
+    
+    def _is_fresh(self, etag, mtime):
+        """
+        Conditional GET: does the client's copy match?
+        If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+        """
+        return is_fresh(self.headers.get('If-None-Match'), self.headers.get('If-Modified-Since'), etag, mtime)
+    
+    def _send_precompressed(self, path):
+        """
+        Serve a static file from the precompressed cache.
+        Returns False if the default file serving should handle the request.
+        """
+        if self.static_assets is None:
+            return False
+        encoding = self._content_encoding()
+        cached = self.static_assets.get(self.translate_path(path), encoding)
+        if cached is None:
+            return False
+        asset, body = cached
+        
+        if self._is_fresh(None, asset.mtime):
+            self.send_response(304)
+            self.send_header('Last-Modified', asset.last_modified)
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return True
+        
+        self.send_response(200)
+        self.send_header('Content-type', asset.content_type)
+        self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', len(body))
+        self.send_header('Last-Modified', asset.last_modified)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        self.wfile.write(body)
+        return True
+    
+    def _not_modified(self):
+        """
+        Check If-None-Match against the current data version.
+        Sends 304 and returns True if the client's copy is current; otherwise
+        remembers the tag for _send_json. The version is read before the
+        backend query, so a write during the query only causes a refetch.
+        """
+        # Pro Kodierung ein eigener Tag (starke ETags gelten für genau diese Bytes)
+        encoding = self._content_encoding()
+        version = GearCrateAPIHandler.api.db.data_version()
+        self._etag = f'"{_ETAG_PREFIX}-{version}-{encoding}"' if encoding else f'"{_ETAG_PREFIX}-{version}"'
+        if not self._etag_matches(self._etag):
+            return False
+        
+        self.send_response(304)
+        self.send_header('ETag', self._etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        return True
+    
     def do_GET(self):
         """Handle GET requests"""
         
-        # Parse URL and query parameters
-        parsed_url = urlparse(self.path)
-        path = parsed_url.path
-        query_params = parse_qs(parsed_url.query)
+        # Query-String nur parsen, wenn die Route Parameter erwartet
+        path, _, query = self.path.partition('?')
+        route, remainder = self.get_routes.resolve(path)
         
-        # Handle STATIC IMAGE FILES from images directory - CRITICAL!
-        if path.startswith('/images/'):
-            try:
-                cache_rel_path = path[8:]  # Remove '/images/' prefix
-                cache_rel_path = cache_rel_path.replace('/', os.sep)
-                image_path = os.path.join(GearCrateAPIHandler.cache_dir, cache_rel_path)
-                
-                # Security check
-                image_path = os.path.abspath(image_path)
-                cache_dir_abs = os.path.abspath(GearCrateAPIHandler.cache_dir)
-                if not image_path.startswith(cache_dir_abs):
-                    self.send_error(403, "Access denied")
-                    return
-                
-                if not os.path.exists(image_path):
-                    self.send_error(404, f"Image not found: {cache_rel_path}")
-                    return
-                
-                # Determine content type
-                ext = os.path.splitext(image_path)[1].lower()
-                content_types = {
-                    '.png': 'image/png',
-                    '.jpg': 'image/jpeg',
-                    '.jpeg': 'image/jpeg',
-                    '.webp': 'image/webp',
-                    '.gif': 'image/gif'
-                }
-                content_type = content_types.get(ext, 'image/png')
-                
-                # Read and send file
-                with open(image_path, 'rb') as f:
-                    image_data = f.read()
-                
-                self.send_response(200)
-                self.send_header('Content-type', content_type)
-                self.send_header('Content-Length', len(image_data))
-                self.send_header('Cache-Control', 'public, max-age=31536000')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(image_data)
-                return
-            
-            except Exception as e:
-                print(f"❌ Error serving image: {e}")
-                self.send_error(500, str(e))
+        if route is None:
+            # Default file serving (JS/CSS/HTML vorkomprimiert aus dem Speicher)
+            if not self._send_precompressed(path):
+                super().do_GET()
+            return
+        
+        try:
+            kwargs = route.coerce(query) if route.params else {}
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+        
+        try:
+            if route.versioned and self._not_modified():
                 return
+            route.handler(self, remainder, **kwargs)
+        except Exception as e:
+            print(f"❌ Error in {route.name}: {e}")
+            import traceback
+            traceback.print_exc()
+            self.send_error(500, str(e))
+    
+    # ---------------------------------------------------------
+    # GET-Routen
+    # ---------------------------------------------------------
+    
+    def _get_image(self, cache_rel_path):
+        """Handle STATIC IMAGE FILES from images directory - CRITICAL!"""
+        cache_rel_path = cache_rel_path.replace('/', os.sep)
+        image_path = os.path.join(GearCrateAPIHandler.cache_dir, cache_rel_path)
         
-        # Handle inventory API with query parameters
-        if path == '/api/get_inventory_items':
-            try:
-                # Extract query parameters
-                sort_by = query_params.get('sort_by', ['name'])[0]
-                sort_order = query_params.get('sort_order', ['asc'])[0]
-                
-                # Check for 'category' (new) OR 'category_filter' (old)
-                category = query_params.get('category', [None])[0]
-                if not category:
-                    category = query_params.get('category_filter', [None])[0]
-                
-                # NEU: is_favorite Parameter auslesen
-                is_favorite = query_params.get('is_favorite', [None])[0]
-                
-                # Rufe die inventory-Funktion im Backend auf
-                # Wir prüfen, ob die Methode 'inventory' existiert (neues Backend) oder 'get_inventory_items' (altes Backend)
-                if hasattr(GearCrateAPIHandler.api, 'inventory'):
-                    result = GearCrateAPIHandler.api.inventory(
-                        sort_by=sort_by,
-                        sort_order=sort_order,
-                        category=category,
-                        is_favorite=is_favorite
-                    )
-                else:
-                    # Fallback für Kompatibilität
-                    print("⚠️ Warning: Using legacy backend method 'get_inventory_items'")
-                    result = GearCrateAPIHandler.api.get_inventory_items(
-                        sort_by=sort_by,
-                        sort_order=sort_order,
-                        category_filter=category
-                    )
-                
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
+        # Security check
+        image_path = os.path.abspath(image_path)
+        cache_dir_abs = os.path.abspath(GearCrateAPIHandler.cache_dir)
+        if not image_path.startswith(cache_dir_abs):
+            self.send_error(403, "Access denied")
+            return
+        
+        try:
+            f = open(image_path, 'rb')
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            self.send_error(404, f"Image not found: {cache_rel_path}")
+            return
+        
+        with f:
+            # Validatoren aus stat(), ohne die Datei zu lesen
+            stat = os.fstat(f.fileno())
+            size = stat.st_size
+            etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+            last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+            
+            if self._is_fresh(etag, stat.st_mtime):
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', last_modified)
+                self.send_header('Cache-Control', 'public, max-age=31536000')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
-                self.wfile.write(json.dumps(result).encode())
                 return
             
-            except Exception as e:
-                print(f"❌ Error getting inventory: {e}")
-                import traceback
-                traceback.print_exc()
-                self.send_error(500, str(e))
-                return
-        
-        # NEU: Search Items Local (für Fuse.js Initialisierung)
-        if path == '/api/search_items_local':
-            try:
-                query = query_params.get('query', [''])[0]
-                result = GearCrateAPIHandler.api.search_items_local(query)
-                
+            # Range nur, wenn If-Range (falls gesendet) noch zur Datei passt
+            byte_range = None
+            range_header = self.headers.get('Range')
+            if_range = self.headers.get('If-Range')
+            if range_header and (not if_range or if_range.strip() in (etag, last_modified)):
+                byte_range = parse_byte_range(range_header, size)
+                if byte_range == 'unsatisfiable':
+                    self.send_response(416)
+                    self.send_header('Content-Range', f'bytes */{size}')
+                    self.send_header('Content-Length', 0)
+                    self.end_headers()
+                    return
+            
+            # Determine content type
+            ext = os.path.splitext(image_path)[1].lower()
+            content_type = IMAGE_CONTENT_TYPES.get(ext, 'image/png')
+            
+            if byte_range:
+                start, end = byte_range
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+            else:
+                start, end = 0, size - 1
                 self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(result).encode())
-                return
+            count = end - start + 1
             
-            except Exception as e:
-                print(f"❌ Error searching items: {e}")
-                import traceback
-                traceback.print_exc()
-                self.send_error(500, str(e))
-                return
+            self.send_header('Content-type', content_type)
+            self.send_header('Content-Length', count)
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            self.send_header('Cache-Control', 'public, max-age=31536000')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            
+            # socket.sendfile: os.sendfile (Kernel kopiert direkt), sonst send()-Schleife
+            if count > 0:
+                try:
+                    self.connection.sendfile(f, start, count)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client hat abgebrochen (z.B. Grid weggescrollt)
+                    self.close_connection = True
+    
+    def _get_inventory_items(self, _, sort_by, sort_order, category, is_favorite, limit, offset, projection):
+        """Handle inventory API with query parameters"""
+        # Wir prüfen, ob die Methode 'inventory' existiert (neues Backend) oder 'get_inventory_items' (altes Backend)
+        if hasattr(GearCrateAPIHandler.api, 'inventory'):
+            result = GearCrateAPIHandler.api.inventory(
+                sort_by=sort_by,
+                sort_order=sort_order,
+                category=category,
+                is_favorite=is_favorite,
+                limit=limit,
+                offset=offset,
+                projection=projection
+            )
+        else:
+            # Fallback für Kompatibilität
+            print("⚠️ Warning: Using legacy backend method 'get_inventory_items'")
+            result = GearCrateAPIHandler.api.get_inventory_items(
+                sort_by=sort_by,
+                sort_order=sort_order,
+                category_filter=category
+            )
+        self._send_json(result)
+    
+    def _get_search_items_local(self, _, query, projection):
+        """Search Items Local (für Fuse.js Initialisierung)"""
+        self._send_json(GearCrateAPIHandler.api.search_items_local(query, projection))
+    
+    def _get_search(self, _, q, limit):
+        """Ranked fuzzy search (Such-Tab)"""
+        self._send_json(GearCrateAPIHandler.api.search(q, limit))
+    
+    def _get_item_changes(self, _, since, sync_id, projection):
+        """Delta sync des Such-Katalogs (seit row_version `since`)"""
+        self._send_json(GearCrateAPIHandler.api.get_item_changes(since, sync_id, projection))
+    
+    def _get_all_gear_sets(self, _):
+        self._send_json(GearCrateAPIHandler.api.get_all_gear_sets())
+    
+    def _get_gear_set_details(self, _, set_name, variant):
+        self._send_json(GearCrateAPIHandler.api.get_gear_set_details(set_name, variant))
+    
+    def _get_gear_set_variants(self, _, set_name):
+        self._send_json(GearCrateAPIHandler.api.get_gear_set_variants(set_name))
+    
+    def _get_bulk_import(self, category_url):
+        """Handle bulk-import API"""
+        self._send_json(GearCrateAPIHandler.api.get_category_items(category_url))
+    
+    def _get_scan_results(self, _):
+        """Scanner: Get scan results"""
+        self._send_json(GearCrateAPIHandler.api.get_scan_results())
+    
+    def _get_events(self, _):
+        """
+        Server-Sent Events (text/event-stream) until the client disconnects:
+        'scan' (scanner progress), 'import' (import_scanned_items progress),
+        'db' (data version + changed counts) and 'reset' if events were missed.
+        """
+        events = GearCrateAPIHandler.api.events
+        # Reconnect: EventSource schickt die zuletzt empfangene ID mit
+        last_id, reset = events.resume_point(self.headers.get('Last-Event-ID'))
         
-        # GEAR SETS API
-        if path == '/api/get_all_gear_sets':
-            try:
-                result = GearCrateAPIHandler.api.get_all_gear_sets()
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(result).encode())
-                return
-            except Exception as e:
-                self.send_error(500, str(e))
-                return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        # Kein Content-Length: der Stream endet mit der Verbindung
+        self.send_header('Connection', 'close')
+        self.end_headers()
         
-        if path == '/api/get_gear_set_details':
-            try:
-                set_name = query_params.get('set_name', [''])[0]
-                variant = query_params.get('variant', [''])[0]
-                
-                result = GearCrateAPIHandler.api.get_gear_set_details(set_name, variant)
-                
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(result).encode())
-                return
-            except Exception as e:
-                self.send_error(500, str(e))
-                return
+        hello = {'version': GearCrateAPIHandler.api.db.data_version()}
+        chunks = [f"retry: {SSE_RETRY_MS}\n", format_event('hello', hello)]
+        if reset:
+            chunks.append(format_event('reset', {}))
         
-        if path == '/api/get_gear_set_variants':
-            try:
-                set_name = query_params.get('set_name', [''])[0]
+        events.subscribe()
+        try:
+            idle = 0
+            while True:
+                if chunks:
+                    self.wfile.write(''.join(chunks).encode('utf-8'))
+                    chunks = []
+                    idle = 0
                 
-                result = GearCrateAPIHandler.api.get_gear_set_variants(set_name)
+                result = events.wait(last_id, SSE_CLIENT_CHECK_SECONDS)
+                if result is None:
+                    # Server wird beendet
+                    return
+                batch, missed = result
+                if missed:
+                    chunks.append(format_event('reset', {}))
+                for event_id, name, data in batch:
+                    chunks.append(format_event(name, data, event_id))
+                    last_id = event_id
+                if chunks:
+                    continue
                 
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(result).encode())
-                return
-            except Exception as e:
-                self.send_error(500, str(e))
-                return
-        
-        # Handle bulk-import API
-        if path.startswith('/api/bulk-import/'):
-            try:
-                category_url = path.split('/api/bulk-import/')[1]
-                result = GearCrateAPIHandler.api.get_category_items(category_url)
-
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(result).encode())
-                return
-
-            except Exception as e:
-                self.send_error(500, str(e))
-                return
-
-        # Scanner: Get scan results
-        if path == '/api/get_scan_results':
-            try:
-                result = GearCrateAPIHandler.api.get_scan_results()
-
-                self.send_response(200)
-                self.send_header('Content-type', 'application/json')
-                self.send_header('Access-Control-Allow-Origin', '*')
-                self.end_headers()
-                self.wfile.write(json.dumps(result).encode())
-                return
-
-            except Exception as e:
-                print(f"❌ Error getting scan results: {e}")
-                import traceback
-                traceback.print_exc()
-                self.send_error(500, str(e))
-                return
-
-        # Default file serving
-        super().do_GET()
+                if self._client_disconnected():
+                    return
+                idle += SSE_CLIENT_CHECK_SECONDS
+                if idle >= SSE_KEEPALIVE_SECONDS:
+                    chunks.append(SSE_KEEPALIVE)
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            # Tab geschlossen / neu geladen
+            pass
+        finally:
+            events.unsubscribe()
+    
+    def _client_disconnected(self):
+        """True if the client closed the connection (EOF waiting on the socket)"""
+        readable, _, _ = select.select([self.connection], [], [], 0)
+        if not readable:
+            return False
+        try:
+            return self.connection.recv(1, socket.MSG_PEEK) == b''
+        except OSError:
+            return True
+    
+    # ---------------------------------------------------------
+    # POST: API-Methoden
+    # ---------------------------------------------------------
+    
+    @classmethod
+    def _resolve_api_method(cls, method):
+        """
+        Bound API method for a POST /api/<method> request, or None.
+        The name -> method table is built once per API instance; only public
+        methods are callable from HTTP.
+        """
+        api = cls.api
+        if cls._post_methods_api is not api:
+            table = {}
+            for name in dir(api):
+                if name.startswith('_') or name in NON_API_METHODS:
+                    continue
+                attr = getattr(api, name, None)
+                if callable(attr):
+                    table[name] = attr
+            cls._post_methods = table
+            cls._post_methods_api = api
+        return cls._post_methods.get(method)
     
     def do_POST(self):
         """Handle API POST requests"""
@@ -245,17 +408,16 @@ class GearCrateAPIHandler(SimpleHTTPRequestHandler):
                 post_data = self.rfile.read(content_length)
                 
                 data = json.loads(post_data.decode('utf-8'))
-                method = self.path.split('/api/')[1]
+                method = urlparse(self.path).path[len('/api/'):]
+                
+                # /api/batch akzeptiert auch ein nacktes Array von {method, args}
+                if method == 'batch' and isinstance(data, list):
+                    data = {'calls': data}
                 
                 # Call API method
-                if hasattr(GearCrateAPIHandler.api, method):
-                    result = getattr(GearCrateAPIHandler.api, method)(**data)
-                    
-                    self.send_response(200)
-                    self.send_header('Content-type', 'application/json')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.end_headers()
-                    self.wfile.write(json.dumps(result).encode())
+                api_method = self._resolve_api_method(method)
+                if api_method is not None:
+                    self._send_json(api_method(**data))
                 else:
                     print(f"❌ API method not found: {method}")
                     self.send_error(404, f"API method {method} not found")
@@ -273,6 +435,10 @@ class GearCrateAPIHandler(SimpleHTTPRequestHandler):
         pass
 
 
+# Route-Tabelle einmal beim Import aufbauen
+GearCrateAPIHandler.get_routes = build_get_routes(GearCrateAPIHandler)
+
+
 def start_server():
     """Start the HTTP server"""
     port = 8080
@@ -284,7 +450,11 @@ def start_server():
     # Set cache directory to images subfolder
     GearCrateAPIHandler.cache_dir = os.path.join(project_root, 'data', 'images')
     
-    httpd = HTTPServer(server_address, GearCrateAPIHandler)
+    # JS/CSS/HTML einmalig komprimieren statt pro Request
+    GearCrateAPIHandler.precompress_static(os.path.join(project_root, 'web'))
+    
+    # Thread-Pool: langsame API-Aufrufe (Scraping, Import) blockieren keine Bild-Requests
+    httpd = PooledHTTPServer(server_address, GearCrateAPIHandler)
     
     print("=" * 60)
     print("📦 GearCrate - Star Citizen Inventory Manager")
@@ -292,6 +462,8 @@ def start_server():
     print(f"✅ Server running on http://localhost:{port}")
     print(f"✅ Static image serving enabled")
     print(f"✅ Cache directory: {GearCrateAPIHandler.cache_dir}")
+    print(f"✅ Workers: {httpd.workers} (+{httpd.long_running_workers} for long-running API calls)")
+    print(f"✅ HTTP/1.1 keep-alive ({httpd.keep_alive_timeout} s idle timeout)")
     print("=" * 60)
     print("📂 Opening browser...")
     
@@ -309,7 +481,7 @@ def start_server():
                 GearCrateAPIHandler.api.close()
         except:
             pass
-        httpd.shutdown()
+        httpd.server_close()
         print("✅ GearCrate stopped!")
 
 
@@ -8,13 +8,13 @@ import os
 import sys
 import threading
 import time
-from http.server import HTTPServer
 
 # Add src to path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
 from main_browser import GearCrateAPIHandler
+from api.http_server import PooledHTTPServer
 from api.backend import API
 from utils.logger import setup_logger
 import pyautogui
@@ -52,9 +52,12 @@ class DesktopServer:
         web_dir = os.path.join(project_root, 'web')
         os.chdir(web_dir)
         
+        # JS/CSS/HTML einmalig komprimieren statt pro Request
+        GearCrateAPIHandler.precompress_static(web_dir)
+        
         # Create server
         server_address = ('', self.port)
-        self.httpd = HTTPServer(server_address, GearCrateAPIHandler)
+        self.httpd = PooledHTTPServer(server_address, GearCrateAPIHandler)
         
         # Start in background thread
         self.server_thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
@@ -306,6 +309,7 @@ class DesktopServer:
 
         if self.httpd:
             self.httpd.shutdown()
+            self.httpd.server_close()
 
         if self.api and hasattr(self.api, 'close'):
             self.api.close()
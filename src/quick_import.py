@@ -72,27 +72,6 @@ class QuickImporter:
             print(f"    Fehler: {e}")
             return []
     
-    def import_item_quick(self, item_name, item_type):
-        """Schneller Import ohne Bilder"""
-        try:
-            existing = self.operations.get_item_by_name(item_name)
-            if existing:
-                return False
-            
-            result = self.operations.add_item(
-                name=item_name,
-                item_type=item_type,
-                image_url=None,
-                image_path=None,
-                notes="Imported from CStone (no image)"
-            )
-            
-            return result['success']
-        
-        except Exception as e:
-            print(f"    Fehler bei '{item_name}': {e}")
-            return False
-    
     def run(self):
         """Startet den Quick-Import"""
         print("=" * 60)
@@ -110,10 +89,21 @@ class QuickImporter:
             items = self.get_all_item_names(category_url)
             total_items += len(items)
             
-            for item_name in items:
-                if self.import_item_quick(item_name, item_type):
-                    imported_items += 1
-                    print(f"    ✅ {item_name}")
+            result = self.operations.add_items_bulk(
+                ({
+                    'name': item_name,
+                    'item_type': item_type,
+                    'notes': "Imported from CStone (no image)"
+                } for item_name in items),
+                skip_existing=True
+            )
+            
+            for row in result['results']:
+                if row['action'] == 'added':
+                    print(f"    ✅ {row['name']}")
+                elif row['action'] == 'failed':
+                    print(f"    Fehler bei '{row['name']}': {row.get('error')}")
+            imported_items += result['added']
             
             time.sleep(1)
         
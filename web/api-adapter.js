@@ -32,6 +32,8 @@ async function apiCall(method, data = {}) {
 const api = {
     // Snake_case (Python style)
     search_items_local: (query) => apiCall('search_items_local', { query }),
+    search: (q, limit) => apiCall('search', { q, limit }),
+    get_item_changes: (since, sync_id) => apiCall('get_item_changes', { since, sync_id }),
     search_items_cstone: (query) => apiCall('search_items_cstone', { query }),
     add_item: (name, item_type, image_url, notes, initial_count) =>
         apiCall('add_item', { name, item_type, image_url, notes, initial_count }),
@@ -64,8 +66,12 @@ const api = {
     // DevTools
     open_devtools: () => apiCall('open_devtools', {}),
 
+    // Batch: mehrere Aufrufe in einem Request ([{ method, args }, ...])
+    batch: (calls, transaction = false) => apiCall('batch', { calls, transaction }),
+
     // camelCase (JavaScript style)
     searchItemsLocal: (query) => apiCall('search_items_local', { query }),
+    getItemChanges: (since, sync_id) => apiCall('get_item_changes', { since, sync_id }),
     searchItemsCstone: (query) => apiCall('search_items_cstone', { query }),
     addItem: (name, item_type, image_url, notes, initial_count) =>
         apiCall('add_item', { name, item_type, image_url, notes, initial_count }),
@@ -250,30 +250,50 @@ async function loadSingleSet(setName) {
     const grid = document.getElementById('gearsets-grid');
     grid.innerHTML = '<p style="text-align: center; color: #888;">Lade ' + setName + '...</p>';
     
-    // Finde das Set in der Liste
-    const setInfo = gearSetsCache.find(s => s.set_name === setName);
-    if (!setInfo) return;
-    
-    const variants = [];
+    await loadSets([setName]);
+}
+
+// LADE MEHRERE SETS - alle Farben aller Sets in EINEM Batch-Request
+async function loadSets(setNames) {
+    const calls = [];
+    const targets = [];
     
-    // Lade ALLE Farben von diesem Set
-    for (const variant of setInfo.variants) {
-        try {
-            const response = await fetch(`/api/get_gear_set_details?set_name=${encodeURIComponent(setName)}&variant=${encodeURIComponent(variant)}`);
-            const data = await response.json();
-            
-            if (data.success) {
-                variants.push(data.set);
-            }
-        } catch (error) {
-            console.error(`Fehler bei ${setName} ${variant}:`, error);
+    for (const setName of setNames) {
+        // Finde das Set in der Liste
+        const setInfo = gearSetsCache.find(s => s.set_name === setName);
+        if (!setInfo || loadedSets[setName]) continue;
+        
+        for (const variant of setInfo.variants) {
+            calls.push({ method: 'get_gear_set_details', args: { set_name: setName, variant } });
+            targets.push({ setName, variant });
         }
     }
+    if (calls.length === 0) return;
     
-    // Speichere die geladenen Varianten
-    loadedSets[setName] = variants;
+    let results = [];
+    try {
+        results = (await api.batch(calls)).results || [];
+    } catch (error) {
+        console.error('Fehler beim Laden der Sets:', error);
+        return;
+    }
     
-    console.log(`✅ ${setName} geladen: ${variants.length} Farben`);
+    const loaded = {};
+    results.forEach((data, index) => {
+        const { setName, variant } = targets[index];
+        loaded[setName] = loaded[setName] || [];
+        if (data && data.success) {
+            loaded[setName].push(data.set);
+        } else {
+            console.error(`Fehler bei ${setName} ${variant}:`, data && data.error);
+        }
+    });
+    
+    // Speichere die geladenen Varianten
+    for (const [setName, variants] of Object.entries(loaded)) {
+        loadedSets[setName] = variants;
+        console.log(`✅ ${setName} geladen: ${variants.length} Farben`);
+    }
 }
 
 // LADE ALLE SETS (für "Alle Sets" Button)
@@ -281,15 +301,8 @@ async function loadAllSets() {
     const grid = document.getElementById('gearsets-grid');
     grid.innerHTML = '<p style="text-align: center; color: #888;">Lade alle Sets... Das kann etwas dauern!</p>';
     
-    // Gehe durch alle Sets
-    for (const set of gearSetsCache) {
-        if (set.variant_count === 0) continue;
-        
-        // Lade nur wenn noch NICHT geladen
-        if (!loadedSets[set.set_name]) {
-            await loadSingleSet(set.set_name);
-        }
-    }
+    // Nur Sets, die noch NICHT geladen sind - ein Request für alle
+    await loadSets(gearSetsCache.filter(set => set.variant_count > 0).map(set => set.set_name));
     
     console.log('✅ Alle Sets geladen!');
 }
@@ -1011,14 +1024,98 @@ function setupKeyboardShortcuts() {
 // FUSE.JS SMART SEARCH
 // ==============================================
 
+// Such-Katalog im IndexedDB: { sync_id, version, items }. Beim Start werden nur
+// die seit `version` geänderten Zeilen geholt (/api/items/changes)
+const SEARCH_CATALOG_DB = 'gearcrate';
+const SEARCH_CATALOG_STORE = 'search_catalog';
+let searchCatalog = null;
+let searchCatalogSyncTimeout = null;
+
+function openSearchCatalogDb() {
+    return new Promise((resolve) => {
+        if (typeof indexedDB === 'undefined') {
+            resolve(null);
+            return;
+        }
+        const request = indexedDB.open(SEARCH_CATALOG_DB, 1);
+        request.onupgradeneeded = () => request.result.createObjectStore(SEARCH_CATALOG_STORE);
+        request.onsuccess = () => resolve(request.result);
+        // Kein IndexedDB (z.B. privater Modus): ohne Cache weiter, voller Abgleich
+        request.onerror = () => resolve(null);
+    });
+}
+
+async function loadSearchCatalog() {
+    const db = await openSearchCatalogDb();
+    if (!db) return null;
+    return new Promise((resolve) => {
+        const request = db.transaction(SEARCH_CATALOG_STORE).objectStore(SEARCH_CATALOG_STORE).get('catalog');
+        request.onsuccess = () => resolve(request.result || null);
+        request.onerror = () => resolve(null);
+    });
+}
+
+async function saveSearchCatalog(catalog) {
+    const db = await openSearchCatalogDb();
+    if (!db) return;
+    db.transaction(SEARCH_CATALOG_STORE, 'readwrite').objectStore(SEARCH_CATALOG_STORE).put(catalog, 'catalog');
+}
+
+// Delta seit der gespeicherten Version anwenden; true wenn sich etwas geändert hat
+async function syncSearchCatalog() {
+    if (!searchCatalog) {
+        searchCatalog = await loadSearchCatalog() || { sync_id: null, version: 0, items: [] };
+    }
+
+    const params = new URLSearchParams({ since: searchCatalog.version });
+    if (searchCatalog.sync_id) {
+        params.set('sync_id', searchCatalog.sync_id);
+    }
+    const response = await fetch(`/api/items/changes?${params}`);
+    const changes = await response.json();
+    if (!changes.success) {
+        throw new Error(changes.error);
+    }
+
+    if (!changes.full && changes.version === searchCatalog.version) {
+        return false;
+    }
+
+    let items = changes.items;
+    if (!changes.full) {
+        const byName = new Map(searchCatalog.items.map(item => [item.name, item]));
+        changes.deleted.forEach(name => byName.delete(name));
+        changes.items.forEach(item => byName.set(item.name, item));
+        // Gleiche Reihenfolge wie search_items_local (ORDER BY name COLLATE NOCASE)
+        items = [...byName.values()].sort((a, b) => {
+            const nameA = a.name.toLowerCase();
+            const nameB = b.name.toLowerCase();
+            return nameA < nameB ? -1 : nameA > nameB ? 1 : 0;
+        });
+    }
+
+    searchCatalog = { sync_id: changes.sync_id, version: changes.version, items };
+    saveSearchCatalog(searchCatalog);
+    return true;
+}
+
+// Nach DB-Änderungen (Live-Events) den Katalog gebündelt nachziehen
+function scheduleSearchCatalogSync() {
+    clearTimeout(searchCatalogSyncTimeout);
+    searchCatalogSyncTimeout = setTimeout(() => initializeFuseSearch(), 1000);
+}
+
 // Initialisiere Fuse.js mit allen Items aus der Datenbank
 async function initializeFuseSearch() {
     try {
         console.log('🔍 Initialisiere Fuse.js...');
         
-        // Hole alle Items aus der DB
-        const response = await fetch('/api/search_items_local?query=');
-        const items = await response.json();
+        // Katalog aus IndexedDB + Änderungen seit dem letzten Besuch
+        const changed = await syncSearchCatalog();
+        if (!changed && fuseInstance) {
+            return;
+        }
+        const items = searchCatalog.items;
         
         if (items && items.length > 0) {
             allItemsForSearch = items;
@@ -1103,30 +1200,24 @@ async function handleSearch(query) {
     }
 
     try {
-        console.time('Token Search');
-        
-        let results = [];
-        
-        // NEU: Token-Suche statt Fuse.js
-        if (allItemsForSearch && allItemsForSearch.length > 0) {
-            results = tokenSearch(query, allItemsForSearch);
-            console.log(`🎯 Token-Suche gefunden: ${results.length} Items`);
-        } else {
-            // Fallback: normale Suche
-            console.log('⚠️ Items nicht geladen, Fallback-Suche...');
-            results = await api.search_items_local(query);
-        }
+        console.time('Server Search');
         
+        // Ranking, Tippfehler und Wortreihenfolge erledigt der Such-Index im Backend (/api/search)
         const limit = getSearchLimit();
-        const limitedResults = results ? results.slice(0, limit) : [];
+        const response = await api.search(query, limit);
+        if (!response.success) {
+            throw new Error(response.error);
+        }
+        const limitedResults = response.items;
+        console.log(`🎯 Server-Suche gefunden: ${response.total} Items`);
         
         // NUR Search Results anzeigen (KEIN Autocomplete mehr!)
-        displaySearchResults(limitedResults, results ? results.length : 0);
+        displaySearchResults(limitedResults, response.total);
         
         // Autocomplete wird NICHT mehr angezeigt
         hideAutocomplete();
         
-        console.timeEnd('Token Search');
+        console.timeEnd('Server Search');
     } catch (error) {
         console.error('Search error:', error);
         const resultsDiv = document.getElementById('search-results');
@@ -1616,7 +1707,9 @@ async function loadInventory() {
         if (!response.ok) {
             throw new Error('Failed to load inventory');
         }
-        const items = await response.json();
+        // Backend liefert eine Seite: {items, total, limit, offset}
+        const page = await response.json();
+        const items = Array.isArray(page) ? page : page.items;
         
         console.log(`✅ Loaded ${items.length} inventory items (${currentSortBy} ${currentSortOrder}, Filter: ${currentCategoryFilter})`);
         displayInventory(items);
@@ -2562,4 +2655,129 @@ document.addEventListener('DOMContentLoaded', function() {
             }
         });
     }
-});
\ No newline at end of file
+});
+// ========================================
+// LIVE-UPDATES (Server-Sent Events /api/events)
+// ========================================
+// Scan-Fortschritt, Import-Fortschritt und DB-Änderungen kommen vom Server,
+// statt per Button/Reload nachzufragen.
+
+let liveEventSource = null;
+let liveReloadTimeout = null;
+let liveStatsTimeout = null;
+
+document.addEventListener('DOMContentLoaded', function() {
+    setupLiveEvents();
+});
+
+function setupLiveEvents() {
+    if (typeof EventSource === 'undefined') {
+        return;
+    }
+
+    liveEventSource = new EventSource('/api/events');
+    liveEventSource.addEventListener('db', (e) => handleDbEvent(JSON.parse(e.data)));
+    liveEventSource.addEventListener('scan', (e) => handleScanEvent(JSON.parse(e.data)));
+    liveEventSource.addEventListener('import', (e) => handleImportEvent(JSON.parse(e.data)));
+    // Events verpasst (Server neu gestartet / zu lange getrennt): alles neu laden
+    liveEventSource.addEventListener('reset', () => {
+        scheduleLiveReload();
+        scheduleSearchCatalogSync();
+    });
+}
+
+function scheduleLiveReload() {
+    clearTimeout(liveReloadTimeout);
+    liveReloadTimeout = setTimeout(() => {
+        loadInventory();
+        loadStats();
+    }, 300);
+}
+
+function scheduleLiveStats() {
+    clearTimeout(liveStatsTimeout);
+    liveStatsTimeout = setTimeout(() => loadStats(), 500);
+}
+
+function handleDbEvent(data) {
+    // Counts im Such-Cache sind jetzt veraltet
+    searchCache = {};
+    scheduleSearchCatalogSync();
+
+    if (data.truncated) {
+        scheduleLiveReload();
+        return;
+    }
+
+    let reload = false;
+    data.changes.forEach(change => {
+        // Item kommt ins Inventar, fällt heraus oder wurde gelöscht: Grid neu laden
+        if (change.count === null || (change.old_count === 0) !== (change.count === 0)) {
+            reload = true;
+            return;
+        }
+        updateVisibleCount(change.name, change.count);
+    });
+
+    if (reload) {
+        scheduleLiveReload();
+    } else {
+        scheduleLiveStats();
+    }
+}
+
+function updateVisibleCount(itemName, count) {
+    const inventoryItem = document.querySelector(`.inventory-item[data-name="${CSS.escape(itemName)}"]`);
+    if (inventoryItem) {
+        const countElement = inventoryItem.querySelector('.count');
+        if (countElement) {
+            countElement.textContent = `${count}x`;
+        }
+    }
+
+    document.querySelectorAll('.search-result-item').forEach(result => {
+        const nameSpan = result.querySelector('.search-item-name');
+        if (nameSpan && nameSpan.textContent === itemName) {
+            const countSpan = result.querySelector('.search-item-count');
+            if (countSpan) {
+                countSpan.textContent = `${count}x`;
+                countSpan.style.color = count > 0 ? '#00d9ff' : '#666';
+            }
+        }
+    });
+}
+
+function handleScanEvent(data) {
+    const progress = document.getElementById('scan-progress');
+    if (progress) {
+        if (data.state === 'started') {
+            progress.textContent = '';
+        } else {
+            progress.textContent = `📄 ${data.page} · ↕ ${data.row} · ↔ ${data.col} · ✅ ${data.items_found} (${data.unique_items}) · ❓ ${data.not_detected}`;
+        }
+    }
+
+    // Scan fertig: Ergebnisse direkt anzeigen, wenn die Scan-Ansicht offen ist
+    const duringScan = document.getElementById('import-during-scan');
+    if ((data.state === 'complete' || data.state === 'aborted') && duringScan && !duringScan.classList.contains('hidden')) {
+        loadScanResults();
+    }
+}
+
+function handleImportEvent(data) {
+    const importItemsBtn = document.getElementById('import-items-btn');
+    if (!importItemsBtn) {
+        return;
+    }
+
+    if (data.phase === 'started') {
+        importItemsBtn.dataset.label = importItemsBtn.textContent;
+        importItemsBtn.disabled = true;
+    } else if (data.phase === 'item') {
+        importItemsBtn.textContent = `⏳ ${data.done} / ${data.total}`;
+    } else if (importItemsBtn.dataset.label !== undefined) {
+        importItemsBtn.textContent = importItemsBtn.dataset.label;
+        delete importItemsBtn.dataset.label;
+        importItemsBtn.disabled = false;
+    }
+}